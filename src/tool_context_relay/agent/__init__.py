@@ -1,5 +1,13 @@
 from __future__ import annotations
 
-from tool_context_relay.agent.agent import build_agent
-
 __all__ = ["build_agent"]
+
+
+def __getattr__(name: str) -> object:
+    # Imported lazily: tool modules import `agent.pretty`, and `agent.agent` imports the tool modules,
+    # so an eager import here breaks importing a tool module first (as process pool workers do).
+    if name == "build_agent":
+        from tool_context_relay.agent.agent import build_agent
+
+        return build_agent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import Callable, Sequence
 from inspect import getdoc
 import re
 from textwrap import dedent
@@ -15,9 +16,19 @@ from tool_context_relay.tools.mcp_page import fun_get_page
 from tool_context_relay.tools.mcp_email import fun_send_email
 from tool_context_relay.tools.mcp_web_screenshot import fun_get_web_screenshot
 from tool_context_relay.tools.mcp_img_description import fun_get_img_description
-from tool_context_relay.boxing import BoxingMode
+from tool_context_relay.boxing import BoxingMode, extract_resource_uri
 from tool_context_relay.agent.boxing_modes import get_boxing_mode_spec
-from tool_context_relay.tools.tool_relay import tool_relay, unbox_value, is_resource_id
+from tool_context_relay.store import ResourceStore
+from tool_context_relay.store.aio import AsyncResourceStore, as_async_store
+from tool_context_relay.tokens import BoxingThreshold
+from tool_context_relay.tools import tool_relay as relay
+from tool_context_relay.tools.policy import DEFAULT_TOOL_POLICIES, ToolPolicy
+from tool_context_relay.tools.tool_relay import (
+    is_resource_id,
+    missing_resource_message_async,
+    tool_relay_async,
+    unbox_value_async,
+)
 
 
 ## ===================================================================================================
@@ -36,34 +47,104 @@ def _get_boxing_mode(ctx: RunContextWrapper[RelayContext] | None) -> BoxingMode:
     return "opaque"
 
 
-def yt_transcribe(ctx: RunContextWrapper[RelayContext], video_id: str) -> str:
-    return tool_relay(fun_get_transcript, [video_id], mode=_get_boxing_mode(ctx))
+def _get_store(ctx: RunContextWrapper[RelayContext] | None) -> ResourceStore:
+    if ctx is None:
+        return relay.store
+    context = getattr(ctx, "context", None)
+    store = getattr(context, "store", None)
+    if store is None:
+        return relay.store
+    return store
+
+
+def _get_async_store(ctx: RunContextWrapper[RelayContext] | None) -> AsyncResourceStore:
+    return as_async_store(_get_store(ctx))
+
+
+def _get_tool_ttl(ctx: RunContextWrapper[RelayContext] | None, tool_name: str) -> float | None:
+    context = getattr(ctx, "context", None)
+    tool_ttls = getattr(context, "tool_ttls", None) or {}
+    return tool_ttls.get(tool_name)
+
 
+def _get_tool_policy(ctx: RunContextWrapper[RelayContext] | None, tool_name: str) -> ToolPolicy | None:
+    context = getattr(ctx, "context", None)
+    tool_policies = getattr(context, "tool_policies", None)
+    if tool_policies is None:
+        tool_policies = DEFAULT_TOOL_POLICIES
+    return tool_policies.get(tool_name)
+
+
+def _get_lazy_unboxing(ctx: RunContextWrapper[RelayContext] | None) -> bool:
+    context = getattr(ctx, "context", None)
+    return getattr(context, "lazy_unboxing", False) is True
 
-def deep_check(ctx: RunContextWrapper[RelayContext], text: str) -> str:
-    return tool_relay(fun_deep_check, [text], mode=_get_boxing_mode(ctx))
 
+def _get_interpolate_references(ctx: RunContextWrapper[RelayContext] | None) -> bool:
+    context = getattr(ctx, "context", None)
+    return getattr(context, "interpolate_references", False) is True
+
+
+def _get_previews(ctx: RunContextWrapper[RelayContext] | None) -> bool:
+    context = getattr(ctx, "context", None)
+    return getattr(context, "previews", False) is True
 
-def google_drive_write_file(
+
+def _get_boxing_threshold(ctx: RunContextWrapper[RelayContext] | None) -> BoxingThreshold | None:
+    context = getattr(ctx, "context", None)
+    return getattr(context, "boxing_threshold", None)
+
+
+async def _relay(
+    ctx: RunContextWrapper[RelayContext] | None,
+    tool_name: str,
+    func: Callable[..., str],
+    args: Sequence[object],
+) -> str:
+    # Tools are coroutines, so store I/O and slow tools overlap with model calls and other sessions.
+    return await tool_relay_async(
+        func,
+        args,
+        mode=_get_boxing_mode(ctx),
+        store=_get_store(ctx),
+        ttl=_get_tool_ttl(ctx, tool_name),
+        lazy=_get_lazy_unboxing(ctx),
+        interpolate=_get_interpolate_references(ctx),
+        threshold=_get_boxing_threshold(ctx),
+        policy=_get_tool_policy(ctx, tool_name),
+        preview=_get_previews(ctx),
+        tool=tool_name,
+    )
+
+
+async def yt_transcribe(ctx: RunContextWrapper[RelayContext], video_id: str) -> str:
+    return await _relay(ctx, "yt_transcribe", fun_get_transcript, [video_id])
+
+
+async def deep_check(ctx: RunContextWrapper[RelayContext], text: str) -> str:
+    return await _relay(ctx, "deep_check", fun_deep_check, [text])
+
+
+async def google_drive_write_file(
         ctx: RunContextWrapper[RelayContext], file_content: str, file_name: str
 ) -> str:
-    return tool_relay(fun_write_file_to_google_drive, [file_content, file_name], mode=_get_boxing_mode(ctx))
+    return await _relay(ctx, "google_drive_write_file", fun_write_file_to_google_drive, [file_content, file_name])
 
 
-def get_page(ctx: RunContextWrapper[RelayContext], url: str) -> str:
-    return tool_relay(fun_get_page, [url], mode=_get_boxing_mode(ctx))
+async def get_page(ctx: RunContextWrapper[RelayContext], url: str) -> str:
+    return await _relay(ctx, "get_page", fun_get_page, [url])
 
 
-def send_email(ctx: RunContextWrapper[RelayContext], to: str, body: str) -> str:
-    return tool_relay(fun_send_email, [to, body], mode=_get_boxing_mode(ctx))
+async def send_email(ctx: RunContextWrapper[RelayContext], to: str, body: str) -> str:
+    return await _relay(ctx, "send_email", fun_send_email, [to, body])
 
 
-def get_web_screenshot(ctx: RunContextWrapper[RelayContext]) -> str:
-    return tool_relay(fun_get_web_screenshot, [], mode=_get_boxing_mode(ctx))
+async def get_web_screenshot(ctx: RunContextWrapper[RelayContext]) -> str:
+    return await _relay(ctx, "get_web_screenshot", fun_get_web_screenshot, [])
 
 
-def get_img_description(ctx: RunContextWrapper[RelayContext], img_url: str) -> str:
-    return tool_relay(fun_get_img_description, [img_url], mode=_get_boxing_mode(ctx))
+async def get_img_description(ctx: RunContextWrapper[RelayContext], img_url: str) -> str:
+    return await _relay(ctx, "get_img_description", fun_get_img_description, [img_url])
 
 # Technical trick: we copy docstrings from original functions to the wrapped versions
 # This will generate tool definitions with proper documentation
@@ -79,7 +160,7 @@ get_img_description.__doc__ = getdoc(fun_get_img_description)
 ## Internal tools to resolve opaque references
 ## ===================================================================================================
 
-def internal_resource_read(ctx: RunContextWrapper[RelayContext], opaque_reference: str) -> str:
+async def internal_resource_read(ctx: RunContextWrapper[RelayContext], opaque_reference: str) -> str:
     """Resolve an opaque reference and return its full value (or echo the input).
 
     Args:
@@ -89,10 +170,10 @@ def internal_resource_read(ctx: RunContextWrapper[RelayContext], opaque_referenc
     """
     if not is_resource_id(opaque_reference):
         return f"Value {opaque_reference!r} is not a valid opaque reference"
-    return unbox_value(opaque_reference)
+    return await unbox_value_async(opaque_reference, store=_get_async_store(ctx))
 
 
-def internal_resource_read_slice(
+async def internal_resource_read_slice(
     ctx: RunContextWrapper[RelayContext],
     opaque_reference: str,
     start_index: int,
@@ -104,23 +185,33 @@ def internal_resource_read_slice(
     """
     if not is_resource_id(opaque_reference):
         return f"Value {opaque_reference!r} is not a valid opaque reference"
-    value = unbox_value(opaque_reference)
+    store = _get_async_store(ctx)
+    resource_uri = extract_resource_uri(opaque_reference)
+    total = await store.length(resource_uri)
+    if total is None:
+        return await missing_resource_message_async(resource_uri, store=store)
     start = start_index
     if start_index < 0:
-        start = max(len(value) + start_index, 0)
-    end = start + length
-    return value[start:end]
+        start = max(total + start_index, 0)
+    end = min(start + length, total)
+    if end <= start:
+        return ""
+    return await store.read_slice(resource_uri, start, end) or ""
 
 
-def internal_resource_length(ctx: RunContextWrapper[RelayContext], opaque_reference: str) -> str:
+async def internal_resource_length(ctx: RunContextWrapper[RelayContext], opaque_reference: str) -> str:
     """Return the length of the value behind an opaque reference."""
     if not is_resource_id(opaque_reference):
         return f"Value {opaque_reference!r} is not a valid opaque reference"
-    value = unbox_value(opaque_reference)
-    return str(len(value))
+    store = _get_async_store(ctx)
+    resource_uri = extract_resource_uri(opaque_reference)
+    total = await store.length(resource_uri)
+    if total is None:
+        return await missing_resource_message_async(resource_uri, store=store)
+    return str(total)
 
 
-def internal_resource_read_lines(
+async def internal_resource_read_lines(
     ctx: RunContextWrapper[RelayContext],
     opaque_reference: str,
     start_line: int,
@@ -140,19 +231,24 @@ def internal_resource_read_lines(
     if line_count < 0:
         return "line_count must be a non-negative integer"
 
-    value = unbox_value(opaque_reference)
-    lines = value.splitlines()
-    if not lines or line_count == 0:
+    store = _get_async_store(ctx)
+    resource_uri = extract_resource_uri(opaque_reference)
+    total = await store.line_count(resource_uri)
+    if total is None:
+        return await missing_resource_message_async(resource_uri, store=store)
+    if not total or line_count == 0:
         return ""
 
     start = start_line
     if start_line < 0:
-        start = max(len(lines) + start_line, 0)
-    end = start + line_count
-    return "\n".join(lines[start:end])
+        start = max(total + start_line, 0)
+    end = min(start + line_count, total)
+    if end <= start:
+        return ""
+    return "\n".join(await store.read_lines(resource_uri, start, end) or [])
 
 
-def internal_resource_grep(
+async def internal_resource_grep(
     ctx: RunContextWrapper[RelayContext],
     opaque_reference: str,
     pattern: str,
@@ -179,19 +275,22 @@ def internal_resource_grep(
     except re.error as exc:
         return f"Invalid regex pattern: {exc}"
 
-    value = unbox_value(opaque_reference)
-    lines = value.splitlines()
-    if not lines:
+    store = _get_async_store(ctx)
+    resource_uri = extract_resource_uri(opaque_reference)
+    total = await store.line_count(resource_uri)
+    if total is None:
+        return await missing_resource_message_async(resource_uri, store=store)
+    if not total:
         return ""
 
-    match_indexes: list[int] = [idx for idx, line in enumerate(lines) if regex.search(line)]
+    match_indexes = await store.search_lines(resource_uri, regex) or []
     if not match_indexes:
         return "No matches found."
 
     ranges: list[tuple[int, int]] = []
     for idx in match_indexes:
         start = max(0, idx - window)
-        end = min(len(lines) - 1, idx + window)
+        end = min(total - 1, idx + window)
         ranges.append((start, end))
 
     ranges.sort()
@@ -209,8 +308,9 @@ def internal_resource_grep(
     chunks: list[str] = []
     for start, end in merged:
         header = f"Lines {start + 1}-{end + 1}:"
+        lines = await store.read_lines(resource_uri, start, end + 1) or []
         body = "\n".join(
-            f"{line_no + 1}: {lines[line_no]}" for line_no in range(start, end + 1)
+            f"{line_no + 1}: {line}" for line_no, line in enumerate(lines, start)
         )
         chunks.append(f"{header}\n{body}")
 
@@ -224,8 +324,8 @@ def build_agent(
     temperature: float | None = None,
     model_settings: ModelSettings | None = None,
     boxing_mode: BoxingMode = "opaque",
+    previews: bool = False,
 ) -> Agent:
-
     # Prepare tool definitions based on python functions (we use explicitly function_tool decorator)
     tool_yt_transcribe = function_tool(yt_transcribe)
     tool_deep_check = function_tool(deep_check)
@@ -277,6 +377,8 @@ def build_agent(
     ).strip()
 
     instruction_parts = [general_instructions, spec.instructions]
+    if previews:
+        instruction_parts.append(spec.preview_instructions)
     if fewshots:
         instruction_parts.append(spec.examples)
     instructions = "\n\n".join(instruction_parts)
@@ -8,3 +8,5 @@ class BoxingModeSpec:
     instructions: str
     examples: str
     internal_tool_docs: dict[str, str]
+    # Added to the instructions when boxed results carry previews.
+    preview_instructions: str = ""
@@ -138,4 +138,12 @@ SPEC = BoxingModeSpec(
             """
         ).strip(),
     },
+    preview_instructions=dedent(
+        """
+        - Resource links come with a preview: besides "type" and "uri" they carry "length", "lines", "mimeType", and the literal "head" and "tail" of the value.
+        - If the head or tail already answers the question (e.g. what appears at the end), answer from it without reading the reference.
+        - Use "length" and "lines" instead of calling `internal_resource_length`.
+        - When passing the value to a tool, pass the resource link unchanged (with or without the preview fields).
+        """
+    ).strip(),
 )
@@ -150,4 +150,12 @@ SPEC = BoxingModeSpec(
             """
         ).strip(),
     },
+    preview_instructions=dedent(
+        """
+        - Opaque references come with a preview: `internal://<id> [preview: <length> chars, <lines> lines, <content type>, head: "...", tail: "..."]`.
+        - The head and tail are the literal start and end of the value. If they already answer the question (e.g. what appears at the end), answer from them without reading the reference.
+        - Use the length and line count from the preview instead of calling `internal_resource_length`.
+        - When passing the value to a tool, pass only `internal://<id>`, without the preview.
+        """
+    ).strip(),
 )
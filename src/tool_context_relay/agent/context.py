@@ -1,9 +1,34 @@
+import uuid
+from collections.abc import Mapping
 from dataclasses import dataclass, field
 
 from tool_context_relay.boxing import BoxingMode
+from tool_context_relay.store import MemoryStore, ReachabilityTracker, ResourceStore, StoreReport
+from tool_context_relay.tokens import BoxingThreshold
+from tool_context_relay.tools.policy import DEFAULT_TOOL_POLICIES, ToolPolicy
 
 
 @dataclass
 class RelayContext:
     kv: dict[str, str] = field(default_factory=dict)
     boxing_mode: BoxingMode = "opaque"
+    # Tool results estimated above this token count are boxed (set from the profile).
+    boxing_threshold: BoxingThreshold = field(default_factory=BoxingThreshold)
+    # Boxed values are scoped to the session: every run gets its own store, released when the run ends.
+    store: ResourceStore = field(default_factory=MemoryStore)
+    # Per-tool TTL overrides (seconds) for references boxed by that tool; needs an expiring store.
+    tool_ttls: dict[str, float] = field(default_factory=dict)
+    # Boxing policy of each tool's results (the built-in ones, with any configured overrides).
+    tool_policies: Mapping[str, ToolPolicy] = field(default_factory=lambda: dict(DEFAULT_TOOL_POLICIES))
+    # Hand store-backed lazy values (instead of full strings) to tools that accept them.
+    lazy_unboxing: bool = False
+    # Splice the values of references embedded in larger string arguments into those arguments.
+    interpolate_references: bool = False
+    # Return boxed results together with a token-budgeted preview of the value.
+    previews: bool = False
+    session_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    # Reclaims references this session's conversation can no longer reach; share one tracker between the
+    # sessions of a process, and only over a session-local store (see StoreConfig.reachability_gc).
+    references: ReachabilityTracker | None = None
+    # Accounting report of the store, taken when the run ends (only for stores that keep one).
+    store_report: StoreReport | None = None
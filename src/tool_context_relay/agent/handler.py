@@ -14,6 +14,7 @@ from tool_context_relay.agent.pretty import (
     emit_system,
     emit_assistant,
 )
+from tool_context_relay.store import ReachabilityTracker
 from tool_context_relay.tools.tool_relay import is_resource_id
 
 
@@ -161,6 +162,15 @@ def _user_texts_from_input_items(input_items: Sequence[object]) -> list[str]:
     return texts
 
 
+def _reference_tracker(context: RunContextWrapper[object]) -> tuple[ReachabilityTracker, str] | None:
+    relay_context = getattr(context, "context", None)
+    tracker = getattr(relay_context, "references", None)
+    session_id = getattr(relay_context, "session_id", None)
+    if tracker is None or session_id is None:
+        return None
+    return tracker, session_id
+
+
 class RunHookHandler(RunHooksBase[TContext, TAgent]):
     def __init__(self, *, show_system_instruction: bool = True) -> None:
         super().__init__()
@@ -200,6 +210,10 @@ class RunHookHandler(RunHooksBase[TContext, TAgent]):
         tool_name = getattr(tool, "name", str(tool))
         if is_resource_id(result):
             self.tool_results_with_resource_id += 1
+        tracked = _reference_tracker(context)
+        if tracked is not None:
+            tracker, session_id = tracked
+            tracker.observe(session_id, result)
         emit_tool_response(f"{tool_name} -> {result}")
 
     async def on_llm_start(
@@ -209,6 +223,12 @@ class RunHookHandler(RunHooksBase[TContext, TAgent]):
         system_prompt: Optional[str],
         input_items: list[TResponseInputItem],
     ) -> None:
+        tracked = _reference_tracker(context)
+        if tracked is not None:
+            # The input is the whole conversation: whatever it no longer mentions, the model cannot cite.
+            tracker, session_id = tracked
+            tracker.observe_conversation(session_id, input_items)
+
         if self._show_system_instruction:
             prompt_source = system_prompt
             if prompt_source is None and agent is not None:
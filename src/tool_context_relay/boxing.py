@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import json
+import re
+from functools import lru_cache
 from typing import Literal
 
 
@@ -8,8 +10,47 @@ BoxingMode = Literal["opaque", "json"]
 
 RESOURCE_LINK_TYPE = "resource_link"
 RESOURCE_LINK_KEYS = frozenset({"type", "uri"})
+# Optional fields of a resource link carrying a preview of the value (see `tool_context_relay.preview`).
+PREVIEW_KEYS = frozenset({"length", "lines", "mimeType", "head", "tail"})
+RESOURCE_URI_PREFIX = "internal://"
+# Separates an opaque reference from its preview ("internal://<id> [preview: ...]").
+PREVIEW_MARKER = " [preview: "
+# Content-addressed ids are short and previews are token-budgeted: strings this long or longer are plain
+# values, never resource links.
+MAX_RESOURCE_LINK_CHARS = 2048
+# A JSON object may only start with "{" or insignificant whitespace.
+_LINK_FIRST_CHARS = frozenset("{ \t\n\r")
+_PARSE_CACHE_SIZE = 1024
 
 
+def format_resource_link(uri: str) -> str:
+    payload = {"type": RESOURCE_LINK_TYPE, "uri": uri}
+    return json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+
+
+# What `format_resource_link` writes around a URI that needs no escaping.
+_CANONICAL_LINK_HEAD, _, _CANONICAL_LINK_TAIL = format_resource_link(RESOURCE_URI_PREFIX).partition(
+    RESOURCE_URI_PREFIX
+)
+
+
+# References embedded in a larger string. Flat JSON objects with at most as many members as a resource link
+# can have come first, so a link (in any key order, with or without a preview) is matched as a whole; objects
+# that turn out not to be links are searched for bare references. A bare reference takes its preview along
+# (`_preview_end`). Strings and previews are bounded by the longest possible link, so no position of an argument
+# is scanned more than a bounded number of times.
+_JSON_STRING = rf'"(?:[^"\\]|\\.){{0,{MAX_RESOURCE_LINK_CHARS}}}"'
+_JSON_MEMBER = rf"{_JSON_STRING}\s*:\s*(?:{_JSON_STRING}|-?\d+|true|false|null)"
+_BARE_REFERENCE = r"(?P<uri>internal://[A-Za-z0-9_-]+)"
+_EMBEDDED_REFERENCE_PATTERN = re.compile(
+    rf"(?P<link>\{{\s*{_JSON_MEMBER}(?:\s*,\s*{_JSON_MEMBER}){{0,{len(RESOURCE_LINK_KEYS | PREVIEW_KEYS) - 1}}}\s*\}})"
+    rf"|{_BARE_REFERENCE}"
+)
+_BARE_REFERENCE_PATTERN = re.compile(_BARE_REFERENCE)
+_QUOTED_STRING_PATTERN = re.compile(r'"(?:[^"\\]|\\.)*"')
+
+
+@lru_cache(maxsize=_PARSE_CACHE_SIZE)
 def _parse_resource_link_json(value: str) -> str | None:
     try:
         payload = json.loads(value)
@@ -18,33 +59,93 @@ def _parse_resource_link_json(value: str) -> str | None:
 
     if not isinstance(payload, dict):
         return None
-    if set(payload.keys()) != RESOURCE_LINK_KEYS:
+    if not RESOURCE_LINK_KEYS <= payload.keys() <= RESOURCE_LINK_KEYS | PREVIEW_KEYS:
         return None
     if payload.get("type") != RESOURCE_LINK_TYPE:
         return None
     uri = payload.get("uri")
     if not isinstance(uri, str):
         return None
-    if not uri.startswith("internal://"):
+    if not uri.startswith(RESOURCE_URI_PREFIX):
         return None
     return uri
 
 
 def extract_resource_uri(value: str) -> str | None:
-    if value.startswith("internal://"):
-        return value
+    """Return the URI referenced by `value` (a bare URI or a JSON resource link, with or without a preview), or None.
+
+    Plain values are rejected in O(1) by length and first character, and canonical links are
+    sliced without parsing; only other short JSON objects reach `json.loads` (memoized, so one
+    tool call checking the same argument repeatedly parses it once).
+    """
+    if value.startswith(RESOURCE_URI_PREFIX):
+        # A reference passed on together with its preview still names only the URI.
+        end = value.find(PREVIEW_MARKER, 0, MAX_RESOURCE_LINK_CHARS)
+        return value if end < 0 else value[:end]
+    if len(value) >= MAX_RESOURCE_LINK_CHARS or value[:1] not in _LINK_FIRST_CHARS:
+        return None
+    if value.startswith(_CANONICAL_LINK_HEAD + RESOURCE_URI_PREFIX) and value.endswith(_CANONICAL_LINK_TAIL):
+        uri = value[len(_CANONICAL_LINK_HEAD) : -len(_CANONICAL_LINK_TAIL)]
+        if uri.isascii() and uri.isprintable() and '"' not in uri and "\\" not in uri:
+            return uri
     return _parse_resource_link_json(value)
 
 
-def format_resource_link(uri: str) -> str:
-    payload = {"type": RESOURCE_LINK_TYPE, "uri": uri}
-    return json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+def find_embedded_resource_uris(value: str) -> list[tuple[int, int, str]]:
+    """Return `(start, end, uri)` for every reference embedded in `value`, in order of appearance."""
+    if RESOURCE_URI_PREFIX not in value:
+        return []
+    references: list[tuple[int, int, str]] = []
+    position = 0
+    while (match := _EMBEDDED_REFERENCE_PATTERN.search(value, position)) is not None:
+        link = match.group("link")
+        if link is None:
+            # The preview is part of the reference, so references quoted in its head or tail are skipped.
+            position = _preview_end(value, match.end(), len(value))
+            references.append((match.start(), position, match.group("uri")))
+            continue
+        position = match.end()
+        uri = _parse_resource_link_json(link) if RESOURCE_URI_PREFIX in link else None
+        if uri is not None:
+            references.append((match.start(), position, uri))
+            continue
+        inner_position = match.start()
+        while (inner := _BARE_REFERENCE_PATTERN.search(value, inner_position, position)) is not None:
+            inner_position = _preview_end(value, inner.end(), position)
+            references.append((inner.start(), inner_position, inner.group("uri")))
+    return references
+
+
+def _preview_end(value: str, end: int, stop: int) -> int:
+    """Return where the bare reference ending at `end` stops, counting the preview that follows it (if any).
+
+    The closing bracket is searched with `str.find`, skipping quoted head and tail strings, and never more
+    than `MAX_RESOURCE_LINK_CHARS` past the reference, so unterminated previews cost a bounded amount each.
+    """
+    if not value.startswith(PREVIEW_MARKER, end, stop):
+        return end
+    position = end + len(PREVIEW_MARKER)
+    stop = min(stop, end + MAX_RESOURCE_LINK_CHARS)
+    while (close := value.find("]", position, stop)) >= 0:
+        quote = value.find('"', position, close)
+        if quote < 0:
+            return close + 1
+        quoted = _QUOTED_STRING_PATTERN.match(value, quote, stop)
+        if quoted is None:
+            break
+        position = quoted.end()
+    return end
 
 
 __all__ = [
     "BoxingMode",
     "RESOURCE_LINK_TYPE",
     "RESOURCE_LINK_KEYS",
+    "RESOURCE_URI_PREFIX",
+    "MAX_RESOURCE_LINK_CHARS",
+    "PREVIEW_KEYS",
+    "PREVIEW_MARKER",
     "extract_resource_uri",
+    "find_embedded_resource_uris",
     "format_resource_link",
 ]
@@ -2,10 +2,11 @@ from __future__ import annotations
 
 import argparse
 from collections import Counter
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 import json
 import os
 import sys
+import time
 from pathlib import Path
 from textwrap import dedent
 from typing import Any
@@ -26,7 +27,9 @@ from tool_context_relay.testing.integration_hooks import (
     assert_tool_not_called,
 )
 from tool_context_relay.boxing import BoxingMode
-from tool_context_relay.tools.tool_relay import is_resource_id
+from tool_context_relay.store import DEFAULT_MAX_BYTES, SESSION_LOCAL_KINDS, StoreConfig, format_report
+from tool_context_relay.tools.policy import load_tool_policies
+from tool_context_relay.tools.tool_relay import MAX_INTERPOLATED_CHARS, is_resource_id
 
 
 @dataclass(frozen=True)
@@ -71,6 +74,7 @@ def _format_startup_config_line(
     temperature: float | None,
     boxing_mode: BoxingMode,
     is_fewshot: bool,
+    store_config: StoreConfig | None = None,
 ) -> str:
     parts: list[str] = ["Config used:"]
 
@@ -88,6 +92,31 @@ def _format_startup_config_line(
     if temperature is not None:
         parts.append(f"* temperature={temperature}")
     parts.append(f"* boxing={boxing_mode}")
+    if store_config is not None:
+        store_line = f"* store={store_config.kind}"
+        if store_config.path:
+            store_line += f" (path={store_config.path})"
+        if store_config.cold_max_bytes is not None:
+            store_line += f" (cold_max_bytes={store_config.cold_max_bytes})"
+        if store_config.compression:
+            store_line += f" (compression={store_config.compression})"
+        if store_config.ttl is not None:
+            store_line += f" (ttl={store_config.ttl:g}s)"
+        if store_config.snapshot_path:
+            store_line += f" (snapshot={store_config.snapshot_path})"
+        if store_config.reachability_gc:
+            store_line += " (gc)"
+        if store_config.accounting:
+            store_line += " (stats)"
+        if store_config.lazy_unboxing:
+            store_line += " (lazy unboxing)"
+        if store_config.interpolate_references:
+            store_line += " (interpolation)"
+        if store_config.previews:
+            store_line += " (previews)"
+        if store_config.tool_policies:
+            store_line += f" (tool policies={','.join(sorted(store_config.tool_policies))})"
+        parts.append(store_line)
     parts.append(f"* few-shots={'enabled' if is_fewshot else 'disabled'}")
 
     return "\n".join(parts)
@@ -248,6 +277,7 @@ def _run_single_prompt(
     boxing_mode: BoxingMode,
     max_retries: int | None = None,
     capture_calls: bool = False,
+    store_config: StoreConfig | None = None,
 ) -> tuple[str, Any, CaptureToolCalls | None]:
     """Run a single prompt and optionally capture tool calls.
 
@@ -272,6 +302,7 @@ def _run_single_prompt(
         boxing_mode=boxing_mode,
         hooks=hooks,
         max_retries=max_retries,
+        store_config=store_config,
     )
 
     return output, context, hooks if capture_calls else None
@@ -365,6 +396,131 @@ def build_parser() -> argparse.ArgumentParser:
         choices=["opaque", "json"],
         help="Boxing strategy for large tool outputs (default: %(default)s).",
     )
+    parser.add_argument(
+        "--store",
+        default="memory",
+        choices=["memory", "disk", "sqlite", "tiered", "shared", "remote"],
+        help=(
+            "Resource store backend for boxed values (default: %(default)s). "
+            "'disk' spills large values to memory-mapped files; "
+            "'tiered' keeps recent values in memory and demotes colder or larger ones to disk; "
+            "'shared' keeps values in shared memory that process pool workers read in place; "
+            "'sqlite' persists references in a database shared across processes and restarts; "
+            "'remote' uses a store server (tool-context-relay-store) shared by several relay processes."
+        ),
+    )
+    parser.add_argument(
+        "--store-path",
+        default=None,
+        metavar="PATH",
+        help=(
+            "Directory used by the 'disk' and 'tiered' stores (default: a fresh temporary directory), "
+            "database file used by the 'sqlite' store (required), "
+            "or HOST:PORT / Unix socket path of the 'remote' store server (required)."
+        ),
+    )
+    parser.add_argument(
+        "--store-max-bytes",
+        default=None,
+        type=int,
+        metavar="BYTES",
+        help=(
+            "In-memory budget of the store: the whole 'memory' store, the memory tier of 'disk', "
+            "or the hot tier of 'tiered' (default: 256 MiB)."
+        ),
+    )
+    parser.add_argument(
+        "--store-cold-max-bytes",
+        default=None,
+        type=int,
+        metavar="BYTES",
+        help="Budget of the on-disk cold tier of the 'tiered' store (default: unbounded).",
+    )
+    parser.add_argument(
+        "--store-snapshot",
+        default=None,
+        metavar="PATH",
+        help=(
+            "Restore boxed values from the snapshot at PATH on startup (if it exists) and write a new "
+            "snapshot there when the run ends, so references survive a redeploy."
+        ),
+    )
+    parser.add_argument(
+        "--store-compression",
+        default=None,
+        choices=["zlib", "lzma"],
+        help=(
+            "Keep boxed values in the memory store as independently compressed blocks "
+            "(only blocks touched by slices/line reads/grep are decompressed)."
+        ),
+    )
+    parser.add_argument(
+        "--store-ttl",
+        default=None,
+        type=float,
+        metavar="SECONDS",
+        help=(
+            "Expire opaque references not accessed for SECONDS (refreshed on every read). "
+            "If omitted, references live until the session ends."
+        ),
+    )
+    parser.add_argument(
+        "--tool-ttl",
+        action="append",
+        default=[],
+        metavar="TOOL=SECONDS",
+        help="Per-tool TTL override for references boxed by TOOL (e.g. get_page=60). Repeatable.",
+    )
+    parser.add_argument(
+        "--tool-policies",
+        default=None,
+        metavar="PATH",
+        help=(
+            "YAML file of per-tool boxing policies (boxing: auto|always|never, max_tokens, ttl, "
+            "compression, indexes), layered over the built-in ones."
+        ),
+    )
+    parser.add_argument(
+        "--store-gc",
+        action="store_true",
+        help=(
+            "Delete a reference as soon as no live conversation mentions it any more "
+            "(tracked from model inputs and tool results), instead of waiting for TTL or eviction. "
+            "Only for session-local stores (memory, disk, tiered) without --store-snapshot."
+        ),
+    )
+    parser.add_argument(
+        "--store-stats",
+        action="store_true",
+        help=(
+            "Account boxed values (size, producing tool, age, reads) and print a store report after the run. "
+            "A running store server is queried with `tool-context-relay stats ADDRESS`."
+        ),
+    )
+    parser.add_argument(
+        "--lazy-unboxing",
+        action="store_true",
+        help=(
+            "Pass store-backed lazy values to tools that accept them (e.g. deep_check), "
+            "so they read only the parts of a reference they use."
+        ),
+    )
+    parser.add_argument(
+        "--interpolate-references",
+        action="store_true",
+        help=(
+            "Also resolve references embedded in larger string arguments (e.g. 'Summary: internal://<id>'); "
+            f"a resolved argument may hold at most {MAX_INTERPOLATED_CHARS} characters."
+        ),
+    )
+    parser.add_argument(
+        "--previews",
+        action="store_true",
+        help=(
+            "Return boxed results with their length, line count, content type and a short head/tail preview "
+            "(computed once when boxing), so the model often needs no read calls to orient itself."
+        ),
+    )
     parser.add_argument(
         "--profile",
         default=None,
@@ -386,6 +542,23 @@ def build_parser() -> argparse.ArgumentParser:
     return parser
 
 
+def _parse_tool_ttls(values: list[str]) -> dict[str, float]:
+    tool_ttls: dict[str, float] = {}
+    for value in values:
+        tool_name, sep, raw_seconds = value.partition("=")
+        tool_name = tool_name.strip()
+        if not sep or not tool_name:
+            raise ValueError(f"--tool-ttl must look like TOOL=SECONDS, got {value!r}.")
+        try:
+            seconds = float(raw_seconds)
+        except ValueError:
+            raise ValueError(f"--tool-ttl seconds must be a number, got {value!r}.")
+        if seconds <= 0:
+            raise ValueError(f"--tool-ttl seconds must be positive, got {value!r}.")
+        tool_ttls[tool_name] = seconds
+    return tool_ttls
+
+
 def _is_reasoning_model(*, model: str) -> bool:
     """Heuristic: treat 'gpt-5*' and 'o*' model IDs as reasoning models.
 
@@ -402,7 +575,62 @@ def _is_reasoning_model(*, model: str) -> bool:
     return False
 
 
+def build_stats_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="tool-context-relay stats",
+        description="Print the accounting report of a running store server (tool-context-relay-store).",
+    )
+    parser.add_argument("address", help="HOST:PORT or Unix socket path of the store server.")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    parser.add_argument(
+        "--watch",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help="Keep printing a fresh report every SECONDS until interrupted.",
+    )
+    return parser
+
+
+def _run_stats(argv: list[str]) -> int:
+    from tool_context_relay.store import RemoteStore
+
+    args = build_stats_parser().parse_args(argv)
+    if args.watch is not None and args.watch <= 0:
+        print("--watch must be positive.", file=sys.stderr)
+        return 2
+    store = RemoteStore(args.address, pool_size=1)
+    try:
+        while True:
+            try:
+                report = store.report()
+            except (ConnectionError, RuntimeError) as e:
+                print(f"Cannot read store stats from {args.address}: {e}", file=sys.stderr)
+                return 1
+            if args.json:
+                print(json.dumps(asdict(report), sort_keys=True), flush=True)
+            else:
+                print(format_report(report), end="\n\n" if args.watch is not None else "\n", flush=True)
+            if args.watch is None:
+                return 0
+            time.sleep(args.watch)
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        store.close()
+
+
+def _print_store_report(context: object) -> None:
+    report = getattr(context, "store_report", None)
+    if report is not None:
+        emit_info("Store report:\n" + format_report(report), stream=sys.stdout)
+
+
 def main(argv: list[str] | None = None) -> int:
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv[:1] == ["stats"]:
+        return _run_stats(argv[1:])
     args = build_parser().parse_args(argv)
 
     load_dotenv(verbose=True)
@@ -458,6 +686,56 @@ def main(argv: list[str] | None = None) -> int:
     if max_retries is not None and max_retries < 0:
         print("Max retries must be >= 0.", file=sys.stderr)
         return 2
+    if args.store_path is not None and args.store in ("memory", "shared"):
+        print("--store-path requires --store disk, sqlite, tiered or remote.", file=sys.stderr)
+        return 2
+    if args.store in ("sqlite", "remote") and not args.store_path:
+        print(f"--store {args.store} requires --store-path.", file=sys.stderr)
+        return 2
+    if args.store_compression is not None and args.store != "memory":
+        print("--store-compression requires --store memory.", file=sys.stderr)
+        return 2
+    if args.store_max_bytes is not None and args.store in ("sqlite", "shared", "remote"):
+        print(f"--store-max-bytes does not apply to --store {args.store}.", file=sys.stderr)
+        return 2
+    if args.store_max_bytes is not None and args.store_max_bytes <= 0:
+        print("--store-max-bytes must be positive.", file=sys.stderr)
+        return 2
+    if args.store_cold_max_bytes is not None and args.store != "tiered":
+        print("--store-cold-max-bytes requires --store tiered.", file=sys.stderr)
+        return 2
+    if args.store_cold_max_bytes is not None and args.store_cold_max_bytes <= 0:
+        print("--store-cold-max-bytes must be positive.", file=sys.stderr)
+        return 2
+    if args.store_ttl is not None and args.store_ttl <= 0:
+        print("--store-ttl must be positive.", file=sys.stderr)
+        return 2
+    if args.store_gc and (args.store not in SESSION_LOCAL_KINDS or args.store_snapshot):
+        # Other sessions and processes may still cite this store's references; only this session is tracked.
+        print("--store-gc requires --store memory, disk or tiered without --store-snapshot.", file=sys.stderr)
+        return 2
+    try:
+        tool_ttls = _parse_tool_ttls(args.tool_ttl)
+        tool_policies = load_tool_policies(args.tool_policies) if args.tool_policies else {}
+    except (OSError, ValueError) as e:
+        print(str(e), file=sys.stderr)
+        return 2
+    store_config = StoreConfig(
+        kind=args.store,
+        path=args.store_path,
+        compression=args.store_compression,
+        max_bytes=args.store_max_bytes if args.store_max_bytes is not None else DEFAULT_MAX_BYTES,
+        cold_max_bytes=args.store_cold_max_bytes,
+        ttl=args.store_ttl,
+        tool_ttls=tool_ttls,
+        lazy_unboxing=args.lazy_unboxing,
+        interpolate_references=args.interpolate_references,
+        previews=args.previews,
+        snapshot_path=args.store_snapshot,
+        reachability_gc=args.store_gc,
+        accounting=args.store_stats,
+        tool_policies=tool_policies,
+    )
     config_line = _format_startup_config_line(
         profile=profile,
         provider=profile_config.provider,
@@ -467,6 +745,7 @@ def main(argv: list[str] | None = None) -> int:
         temperature=temperature,
         boxing_mode=args.boxing,
         is_fewshot=args.fewshots,
+        store_config=store_config,
     )
     emit_info(config_line, stream=sys.stdout)
 
@@ -506,6 +785,7 @@ def main(argv: list[str] | None = None) -> int:
                 boxing_mode=args.boxing,
                 max_retries=max_retries,
                 dump_context=args.dump_context,
+                store_config=store_config,
             )
         else:
             # Running literal prompt
@@ -521,6 +801,7 @@ def main(argv: list[str] | None = None) -> int:
                 boxing_mode=args.boxing,
                 max_retries=max_retries,
                 dump_context=args.dump_context,
+                store_config=store_config,
             )
     except ModuleNotFoundError as e:
         if e.name == "agents":
@@ -545,6 +826,7 @@ def _run_literal_prompt(
     boxing_mode: BoxingMode,
     max_retries: int | None = None,
     dump_context: bool,
+    store_config: StoreConfig | None = None,
 ) -> int:
     """Run a literal prompt (no validation)."""
     from tool_context_relay.agent.handler import RunHookHandler
@@ -562,10 +844,12 @@ def _run_literal_prompt(
         boxing_mode=boxing_mode,
         hooks=hooks,
         max_retries=max_retries,
+        store_config=store_config,
     )
 
     if dump_context:
         print(json.dumps(context.kv, ensure_ascii=False, sort_keys=True), file=sys.stdout)
+    _print_store_report(context)
 
     emit_info(
         dedent(f"""
@@ -592,6 +876,7 @@ def _run_from_files(
     boxing_mode: BoxingMode,
     max_retries: int | None = None,
     dump_context: bool,
+    store_config: StoreConfig | None = None,
 ) -> int:
     """Run prompts from one or more files.
 
@@ -638,6 +923,7 @@ def _run_from_files(
                 boxing_mode=boxing_mode,
                 hooks=hooks,
                 max_retries=max_retries,
+                store_config=store_config,
             )
         except Exception as e:
             emit_error(f"Error running {file_path}: {e}", stream=sys.stderr)
@@ -654,6 +940,7 @@ def _run_from_files(
 
         if dump_context:
             print(json.dumps(context.kv, ensure_ascii=False, sort_keys=True), file=sys.stdout)
+        _print_store_report(context)
 
         # Validate if frontmatter exists
         if case is not None:
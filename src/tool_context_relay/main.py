@@ -16,6 +16,9 @@ from tool_context_relay.openai_env import (
 
 from tool_context_relay.agent.agent import build_agent
 from tool_context_relay.agent.context import RelayContext
+from tool_context_relay.store import ReachabilityTracker, StoreConfig, create_store, write_snapshot
+from tool_context_relay.tokens import BoxingThreshold
+from tool_context_relay.tools.policy import DEFAULT_TOOL_POLICIES
 
 
 def _build_model_settings(
@@ -63,6 +66,7 @@ def run_once(
     boxing_mode: BoxingMode = "opaque",
     hooks: object | None = None,
     max_retries: int | None = None,
+    store_config: StoreConfig | None = None,
 ) -> tuple[str, RelayContext]:
     from agents import OpenAIChatCompletionsModel, Runner, set_tracing_disabled
 
@@ -92,12 +96,25 @@ def run_once(
     client = AsyncOpenAI(**client_kwargs)
     model_obj = OpenAIChatCompletionsModel(model=model, openai_client=client)
 
-    context = RelayContext(boxing_mode=boxing_mode)
+    store = create_store(store_config)
+    context = RelayContext(
+        boxing_mode=boxing_mode,
+        boxing_threshold=BoxingThreshold.create(profile_config.max_result_tokens, profile_config.tokenizer),
+        store=store,
+        tool_ttls=dict(store_config.tool_ttls) if store_config is not None else {},
+        # Configured policies override the built-in ones tool by tool.
+        tool_policies={**DEFAULT_TOOL_POLICIES, **(store_config.tool_policies if store_config is not None else {})},
+        lazy_unboxing=store_config.lazy_unboxing if store_config is not None else False,
+        interpolate_references=store_config.interpolate_references if store_config is not None else False,
+        previews=store_config.previews if store_config is not None else False,
+        references=ReachabilityTracker(store) if store_config is not None and store_config.reachability_gc else None,
+    )
     agent = build_agent(
         model=model_obj,
         fewshots=fewshots,
         model_settings=model_settings,
         boxing_mode=boxing_mode,
+        previews=store_config.previews if store_config is not None else False,
     )
     if print_tools:
         from tool_context_relay.agent.tool_definitions import print_tool_definitions
@@ -105,5 +122,21 @@ def run_once(
         print_tool_definitions(agent.tools, stream=sys.stderr)
     if hooks is None:
         hooks = RunHookHandler()
-    result = Runner.run_sync(agent, prompt, max_turns=20, hooks=hooks, context=context)
+    try:
+        result = Runner.run_sync(agent, prompt, max_turns=20, hooks=hooks, context=context)
+    finally:
+        try:
+            if store_config is not None and store_config.accounting:
+                # Taken before session cleanup, so it describes what this run left in the store.
+                context.store_report = context.store.report()
+            if store_config is not None and store_config.snapshot_path is not None:
+                # Keep the references of this session resolvable after a restart.
+                write_snapshot(context.store, store_config.snapshot_path)
+            elif context.references is not None:
+                # The conversation is discarded: reclaim what only it could reach (matters for persistent stores).
+                context.references.end_session(context.session_id)
+        finally:
+            # References are session-scoped: release every payload boxed during this run in one step
+            # (persistent stores keep their data and only release the connection).
+            context.store.close()
     return result.final_output, context
@@ -56,6 +56,19 @@ def _load_profile_temperature(prefix: str) -> float | None:
     return parse_temperature_from_env(raw, label=f"{prefix}_TEMPERATURE")
 
 
+def _load_profile_max_result_tokens(prefix: str) -> int | None:
+    raw = _getenv_stripped(f"{prefix}_MAX_RESULT_TOKENS")
+    if raw is None:
+        return None
+    try:
+        value = int(raw)
+    except ValueError:
+        raise ValueError(f"{prefix}_MAX_RESULT_TOKENS must be an integer.")
+    if value <= 0:
+        raise ValueError(f"{prefix}_MAX_RESULT_TOKENS must be positive.")
+    return value
+
+
 @dataclass(frozen=True)
 class ProfileConfig:
     name: str
@@ -66,6 +79,9 @@ class ProfileConfig:
     default_model: str | None
     backend_provider: str | None
     temperature: float | None
+    # Boxing threshold for tool results (tokens) and the tokenizer estimating them ("heuristic" or a tiktoken encoding).
+    max_result_tokens: int | None = None
+    tokenizer: str | None = None
 
 
 def load_profile(profile: str) -> ProfileConfig:
@@ -93,6 +109,8 @@ def load_profile(profile: str) -> ProfileConfig:
     default_model = _getenv_stripped(f"{normalized}_MODEL")
     backend_provider = _getenv_stripped(f"{normalized}_BACKEND_PROVIDER")
     temperature = _load_profile_temperature(normalized)
+    max_result_tokens = _load_profile_max_result_tokens(normalized)
+    tokenizer = _getenv_stripped(f"{normalized}_TOKENIZER")
 
     return ProfileConfig(
         name=profile,
@@ -103,6 +121,8 @@ def load_profile(profile: str) -> ProfileConfig:
         default_model=default_model,
         backend_provider=backend_provider,
         temperature=temperature,
+        max_result_tokens=max_result_tokens,
+        tokenizer=tokenizer,
     )
 
 
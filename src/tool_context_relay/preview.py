@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+
+from tool_context_relay.boxing import PREVIEW_MARKER, RESOURCE_LINK_TYPE, BoxingMode
+from tool_context_relay.store.binary import BinaryPayload, base64_length
+from tool_context_relay.store.lines import LineCounter
+from tool_context_relay.tokens import TokenCounter
+
+# Token budget of the head and tail previews together; the counts and content type add a few more.
+PREVIEW_TOKENS = 48
+_SIDE_TOKENS = PREVIEW_TOKENS // 2
+# Characters collected per side before trimming to the budget (plain ASCII fits about four per token).
+_SIDE_CHARS = _SIDE_TOKENS * 4
+
+
+@dataclass(frozen=True)
+class ResourcePreview:
+    """What a model usually asks first about a boxed value: its size, kind, start and end."""
+
+    length: int
+    lines: int
+    content_type: str
+    head: str = ""
+    tail: str = ""
+
+
+def detect_content_type(sample: str) -> str:
+    """Guess a MIME type from the start of a value."""
+    text = sample.lstrip()[:256].lower()
+    if text.startswith(("{", "[")):
+        return "application/json"
+    if text.startswith(("<!doctype html", "<html")) or (text.startswith("<") and "<body" in text):
+        return "text/html"
+    if text.startswith("<"):
+        return "application/xml"
+    if text.startswith(("# ", "## ", "---\n")):
+        return "text/markdown"
+    return "text/plain"
+
+
+class PreviewBuilder:
+    """Collects a `ResourcePreview` from the chunks of a value while they are boxed."""
+
+    def __init__(self, counter: TokenCounter) -> None:
+        self._counter = counter
+        self._length = 0
+        self._lines = LineCounter()
+        self._head: list[str] = []
+        self._head_chars = 0
+        self._tail = ""
+
+    def feed(self, chunk: str) -> None:
+        self._length += len(chunk)
+        self._lines.feed(chunk)
+        if self._head_chars < _SIDE_CHARS:
+            part = chunk[: _SIDE_CHARS - self._head_chars]
+            self._head.append(part)
+            self._head_chars += len(part)
+        self._tail = (self._tail + chunk[-_SIDE_CHARS:])[-_SIDE_CHARS:]
+
+    def build(self) -> ResourcePreview:
+        head = "".join(self._head)
+        # The tail never repeats characters already in the head.
+        tail = self._tail[len(self._tail) - min(len(self._tail), self._length - len(head)) :]
+        return ResourcePreview(
+            length=self._length,
+            lines=self._lines.count,
+            content_type=detect_content_type(head),
+            head=self._fit(head, from_end=False),
+            tail=self._fit(tail, from_end=True),
+        )
+
+    def _fit(self, text: str, *, from_end: bool) -> str:
+        while text and (tokens := self._counter.count(text)) > _SIDE_TOKENS:
+            keep = len(text) * _SIDE_TOKENS // tokens
+            text = text[len(text) - keep :] if from_end else text[:keep]
+        return text
+
+
+def describe_value(value: str, counter: TokenCounter) -> ResourcePreview:
+    builder = PreviewBuilder(counter)
+    builder.feed(value)
+    return builder.build()
+
+
+def describe_binary(payload: BinaryPayload) -> ResourcePreview:
+    # Base64 text is not worth previewing; its length and MIME type are what a model can use.
+    return ResourcePreview(
+        length=base64_length(payload.size),
+        lines=1 if payload.size else 0,
+        content_type=payload.mime_type,
+    )
+
+
+def format_resource_preview(uri: str, preview: ResourcePreview, mode: BoxingMode = "opaque") -> str:
+    """Format a reference with its preview; both formats are still recognized as the bare reference."""
+    if mode == "json":
+        payload: dict[str, object] = {
+            "type": RESOURCE_LINK_TYPE,
+            "uri": uri,
+            "length": preview.length,
+            "lines": preview.lines,
+            "mimeType": preview.content_type,
+        }
+        if preview.head:
+            payload["head"] = preview.head
+        if preview.tail:
+            payload["tail"] = preview.tail
+        return json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    details = [f"{preview.length} chars", f"{preview.lines} lines", preview.content_type]
+    if preview.head:
+        details.append(f"head: {json.dumps(preview.head, ensure_ascii=False)}")
+    if preview.tail:
+        details.append(f"tail: {json.dumps(preview.tail, ensure_ascii=False)}")
+    return f"{uri}{PREVIEW_MARKER}{', '.join(details)}]"
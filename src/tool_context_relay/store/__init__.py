@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from tool_context_relay.store.accounting import AccountingStore, ResourceUsage, StoreReport, format_report
+from tool_context_relay.store.aio import AsyncResourceStore, AsyncStoreAdapter, AsyncStoreWriter, as_async_store
+from tool_context_relay.store.base import ResourceStore, StoreStats
+from tool_context_relay.store.binary import BinaryPayload
+from tool_context_relay.store.compressed import Codec, CompressedStore
+from tool_context_relay.store.config import SESSION_LOCAL_KINDS, StoreConfig, StoreKind, create_store
+from tool_context_relay.store.disk import DiskSpillStore
+from tool_context_relay.store.expiring import ExpiringStore
+from tool_context_relay.store.memory import DEFAULT_MAX_BYTES, MemoryStore
+from tool_context_relay.store.reachability import ReachabilityTracker
+from tool_context_relay.store.remote import RemoteStore
+from tool_context_relay.store.shared import SharedMemoryStore
+from tool_context_relay.store.snapshot import RestoredStore, SnapshotStore, write_snapshot
+from tool_context_relay.store.sqlite import SqliteStore
+from tool_context_relay.store.tiered import TieredStore, TierStats
+from tool_context_relay.store.writer import StoreWriter, open_writer
+
+__all__ = [
+    "AccountingStore",
+    "AsyncResourceStore",
+    "AsyncStoreAdapter",
+    "AsyncStoreWriter",
+    "BinaryPayload",
+    "Codec",
+    "CompressedStore",
+    "DEFAULT_MAX_BYTES",
+    "DiskSpillStore",
+    "ExpiringStore",
+    "MemoryStore",
+    "ReachabilityTracker",
+    "RemoteStore",
+    "ResourceStore",
+    "ResourceUsage",
+    "RestoredStore",
+    "SESSION_LOCAL_KINDS",
+    "SharedMemoryStore",
+    "SnapshotStore",
+    "SqliteStore",
+    "StoreConfig",
+    "StoreKind",
+    "StoreReport",
+    "StoreStats",
+    "StoreWriter",
+    "TierStats",
+    "TieredStore",
+    "as_async_store",
+    "create_store",
+    "format_report",
+    "open_writer",
+    "write_snapshot",
+]
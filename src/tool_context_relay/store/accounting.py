@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import heapq
+import re
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from typing import TypeVar
+
+from tool_context_relay.store import binary
+from tool_context_relay.store.base import ResourceStore, StoreStats
+from tool_context_relay.store.binary import BinaryPayload
+from tool_context_relay.store.writer import StoreWriter, open_writer
+
+UNKNOWN_TOOL = "(unknown)"
+# Upper bounds (seconds) of the age buckets of a report; older resources fall into the last bucket.
+AGE_BUCKETS: tuple[tuple[str, float], ...] = (("<1m", 60.0), ("<10m", 600.0), ("<1h", 3600.0), ("<1d", 86400.0))
+_OLDEST_BUCKET = ">=1d"
+_LARGEST_COUNT = 5
+# Records of values the wrapped store dropped on its own are pruned once the record count doubles (at least this many).
+_PRUNE_MIN_RECORDS = 1024
+_T = TypeVar("_T")
+
+
+def utf8_length(value: str) -> int:
+    if value.isascii():
+        return len(value)
+    return len(value.encode("utf-8", "surrogatepass"))
+
+
+@dataclass(slots=True)
+class ResourceUsage:
+    resource_id: str
+    tool: str
+    payload_bytes: int
+    created_at: float
+    last_access: float | None = None
+    accesses: int = 0
+
+
+@dataclass(frozen=True)
+class StoreReport:
+    """Point-in-time accounting of a store; payload sizes are UTF-8 (or raw binary) bytes."""
+
+    resources: int
+    total_bytes: int
+    max_bytes: int
+    bytes_by_tool: dict[str, int]
+    resources_by_tool: dict[str, int]
+    accesses_by_tool: dict[str, int]
+    age_buckets: dict[str, int]
+    accesses: int
+    unread: int
+    index_bytes: int
+    largest: list[ResourceUsage]
+    store: StoreStats
+
+    @classmethod
+    def from_dict(cls, data: dict) -> StoreReport:
+        """Rebuild a report from `dataclasses.asdict` output (e.g. received from a store server)."""
+        return cls(
+            **{
+                **data,
+                "largest": [ResourceUsage(**usage) for usage in data["largest"]],
+                "store": StoreStats(**data["store"]),
+            }
+        )
+
+
+class _AccountingWriter:
+    def __init__(self, store: AccountingStore, inner: StoreWriter) -> None:
+        self._store = store
+        self._inner = inner
+        self._bytes = 0
+
+    def write(self, chunk: str) -> None:
+        self._bytes += utf8_length(chunk)
+        self._inner.write(chunk)
+
+    def commit(self, resource_id: str) -> None:
+        self._inner.commit(resource_id)
+        self._store._stored(resource_id, self._bytes)
+
+    def abort(self) -> None:
+        self._inner.abort()
+
+
+class AccountingStore:
+    """Wrap a store with per-resource accounting: size, producing tool, age and read counts.
+
+    Bookkeeping is a dict update per call and `report()` never touches payloads, so it is cheap
+    enough to sample every few seconds. The producing tool is attached by the relay through
+    `record_producer`. Records of values the wrapped store drops on its own (eviction, expiry) are
+    pruned when a report is built and whenever the number of records doubles, so a long-running
+    server that never asks for a report stays bounded.
+    """
+
+    def __init__(self, inner: ResourceStore, *, clock: Callable[[], float] = time.time) -> None:
+        self._inner = inner
+        self._clock = clock
+        self._usage: dict[str, ResourceUsage] = {}
+        self._prune_at = _PRUNE_MIN_RECORDS
+        self._lock = threading.Lock()
+
+    @property
+    def inner(self) -> ResourceStore:
+        return self._inner
+
+    def __getattr__(self, name: str) -> object:
+        # Optional capabilities (`set_ttl`, `is_expired`, `resource_ids`, ...) of the wrapped store.
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self._inner, name)
+
+    def __contains__(self, resource_id: str) -> bool:
+        return resource_id in self._inner
+
+    def put(self, resource_id: str, value: str) -> None:
+        self._inner.put(resource_id, value)
+        self._stored(resource_id, utf8_length(value))
+
+    def put_binary(self, resource_id: str, payload: BinaryPayload) -> None:
+        binary.put_binary(self._inner, resource_id, payload)
+        self._stored(resource_id, payload.size)
+
+    def open_writer(self) -> _AccountingWriter:
+        return _AccountingWriter(self, open_writer(self._inner))
+
+    def record_producer(self, resource_id: str, tool: str) -> None:
+        with self._lock:
+            usage = self._usage.get(resource_id)
+            if usage is not None:
+                usage.tool = tool
+
+    def usage(self, resource_id: str) -> ResourceUsage | None:
+        with self._lock:
+            usage = self._usage.get(resource_id)
+            return None if usage is None else replace(usage)
+
+    def get(self, resource_id: str) -> str | None:
+        return self._accessed(resource_id, self._inner.get(resource_id))
+
+    def get_binary(self, resource_id: str) -> BinaryPayload | None:
+        return self._accessed(resource_id, binary.get_binary(self._inner, resource_id))
+
+    def length(self, resource_id: str) -> int | None:
+        return self._inner.length(resource_id)
+
+    def read_slice(self, resource_id: str, start: int, end: int) -> str | None:
+        return self._accessed(resource_id, self._inner.read_slice(resource_id, start, end))
+
+    def line_count(self, resource_id: str) -> int | None:
+        return self._inner.line_count(resource_id)
+
+    def read_lines(self, resource_id: str, start: int, end: int) -> list[str] | None:
+        return self._accessed(resource_id, self._inner.read_lines(resource_id, start, end))
+
+    def search_lines(self, resource_id: str, pattern: re.Pattern[str]) -> list[int] | None:
+        return self._accessed(resource_id, self._inner.search_lines(resource_id, pattern))
+
+    def delete(self, resource_id: str) -> bool:
+        with self._lock:
+            self._usage.pop(resource_id, None)
+        return self._inner.delete(resource_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._usage.clear()
+        self._inner.clear()
+
+    def close(self) -> None:
+        with self._lock:
+            self._usage.clear()
+        self._inner.close()
+
+    def stats(self) -> StoreStats:
+        return self._inner.stats()
+
+    def report(self) -> StoreReport:
+        self._prune()
+        now = self._clock()
+        stats = self._inner.stats()
+        with self._lock:
+            usages = list(self._usage.values())
+            bytes_by_tool: dict[str, int] = {}
+            resources_by_tool: dict[str, int] = {}
+            accesses_by_tool: dict[str, int] = {}
+            age_buckets = dict.fromkeys([name for name, _ in AGE_BUCKETS] + [_OLDEST_BUCKET], 0)
+            for usage in usages:
+                bytes_by_tool[usage.tool] = bytes_by_tool.get(usage.tool, 0) + usage.payload_bytes
+                resources_by_tool[usage.tool] = resources_by_tool.get(usage.tool, 0) + 1
+                accesses_by_tool[usage.tool] = accesses_by_tool.get(usage.tool, 0) + usage.accesses
+                age_buckets[_age_bucket(now - usage.created_at)] += 1
+            largest = heapq.nlargest(_LARGEST_COUNT, usages, key=lambda usage: usage.payload_bytes)
+            return StoreReport(
+                resources=len(usages),
+                total_bytes=sum(bytes_by_tool.values()),
+                max_bytes=largest[0].payload_bytes if largest else 0,
+                bytes_by_tool=bytes_by_tool,
+                resources_by_tool=resources_by_tool,
+                accesses_by_tool=accesses_by_tool,
+                age_buckets=age_buckets,
+                accesses=sum(accesses_by_tool.values()),
+                unread=sum(1 for usage in usages if not usage.accesses),
+                index_bytes=stats.index_bytes,
+                largest=[replace(usage) for usage in largest],
+                store=stats,
+            )
+
+    def _prune(self) -> None:
+        with self._lock:
+            tracked = list(self._usage)
+        # Only ids tracked before asking the inner store are dropped; values stored meanwhile keep their record.
+        resource_ids = getattr(self._inner, "resource_ids", None)
+        if resource_ids is not None:
+            live = set(resource_ids())
+            dropped = [resource_id for resource_id in tracked if resource_id not in live]
+        else:
+            dropped = [resource_id for resource_id in tracked if resource_id not in self._inner]
+        with self._lock:
+            for resource_id in dropped:
+                self._usage.pop(resource_id, None)
+            self._prune_at = max(_PRUNE_MIN_RECORDS, 2 * len(self._usage))
+
+    def _stored(self, resource_id: str, payload_bytes: int) -> None:
+        with self._lock:
+            previous = self._usage.get(resource_id)
+            if previous is not None and previous.payload_bytes == payload_bytes:
+                # Content-addressed ids: the same value stored again keeps its history.
+                return
+            self._usage[resource_id] = ResourceUsage(resource_id, UNKNOWN_TOOL, payload_bytes, self._clock())
+            prune = len(self._usage) >= self._prune_at
+        if prune:
+            self._prune()
+
+    def _accessed(self, resource_id: str, result: _T) -> _T:
+        if result is not None:
+            with self._lock:
+                usage = self._usage.get(resource_id)
+                if usage is not None:
+                    usage.accesses += 1
+                    usage.last_access = self._clock()
+        return result
+
+
+def _age_bucket(age: float) -> str:
+    for name, limit in AGE_BUCKETS:
+        if age < limit:
+            return name
+    return _OLDEST_BUCKET
+
+
+def format_report(report: StoreReport) -> str:
+    """Render a report as the plain-text table printed by `tool-context-relay stats`."""
+    lines = [
+        f"resources: {report.resources}",
+        f"payload bytes: {report.total_bytes} (largest {report.max_bytes})",
+        f"index bytes: {report.index_bytes}",
+        f"store bytes: {report.store.total_bytes} in memory, {report.store.disk_bytes} on disk",
+        f"reads: {report.accesses} ({report.unread} resources never read)",
+        "ages: " + ", ".join(f"{name} {count}" for name, count in report.age_buckets.items()),
+    ]
+    if report.bytes_by_tool:
+        lines.append("by tool:")
+        for tool, size in sorted(report.bytes_by_tool.items(), key=lambda item: item[1], reverse=True):
+            lines.append(
+                f"  {tool}: {size} bytes, {report.resources_by_tool[tool]} resources, "
+                f"{report.accesses_by_tool[tool]} reads"
+            )
+    if report.largest:
+        lines.append("largest:")
+        for usage in report.largest:
+            lines.append(f"  {usage.resource_id} {usage.payload_bytes} bytes from {usage.tool}, {usage.accesses} reads")
+    return "\n".join(lines)
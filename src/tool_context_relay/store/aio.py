@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+import re
+from collections.abc import Callable, Collection
+from typing import Protocol, TypeVar
+
+from tool_context_relay.store.base import ResourceStore, StoreStats
+from tool_context_relay.store.binary import BinaryPayload, get_binary, put_binary
+from tool_context_relay.store.memory import MemoryStore
+from tool_context_relay.store.writer import StoreWriter, open_writer
+
+_T = TypeVar("_T")
+
+# Largest value (in characters) an inline adapter copies, encodes or scans on the event loop.
+INLINE_MAX_CHARS = 64 * 1024
+
+
+class AsyncResourceStore(Protocol):
+    """Coroutine counterpart of `ResourceStore`, for backends whose I/O should overlap with other work.
+
+    Same semantics as the synchronous protocol; `contains` replaces `__contains__`.
+    Optional capabilities (`open_writer`, `put_binary`, `get_binary`, `set_ttl`, `is_expired`)
+    are detected the same way, and are coroutines too (`open_writer` returns an `AsyncStoreWriter`).
+    """
+
+    async def contains(self, resource_id: str) -> bool: ...
+
+    async def put(self, resource_id: str, value: str) -> None: ...
+
+    async def get(self, resource_id: str) -> str | None: ...
+
+    async def length(self, resource_id: str) -> int | None: ...
+
+    async def read_slice(self, resource_id: str, start: int, end: int) -> str | None: ...
+
+    async def line_count(self, resource_id: str) -> int | None: ...
+
+    async def read_lines(self, resource_id: str, start: int, end: int) -> list[str] | None: ...
+
+    async def search_lines(self, resource_id: str, pattern: re.Pattern[str]) -> list[int] | None: ...
+
+    async def delete(self, resource_id: str) -> bool: ...
+
+    async def clear(self) -> None: ...
+
+    async def close(self) -> None: ...
+
+    async def stats(self) -> StoreStats: ...
+
+
+class AsyncStoreWriter(Protocol):
+    """Coroutine counterpart of `StoreWriter`."""
+
+    async def write(self, chunk: str) -> None: ...
+
+    async def commit(self, resource_id: str) -> None: ...
+
+    async def abort(self) -> None: ...
+
+
+class AsyncStoreAdapter:
+    """Expose a synchronous `ResourceStore` through the async interface.
+
+    With `offload=True` every call runs in the default thread pool, so disk or SQLite I/O never
+    blocks the event loop. With `offload=False` (in-memory backends) lookups run inline, but calls
+    that copy, encode or scan more than `inline_max_chars` characters still go to the thread pool,
+    as do index builds, recompression and searches.
+    """
+
+    def __init__(
+        self, inner: ResourceStore, *, offload: bool = True, inline_max_chars: int = INLINE_MAX_CHARS
+    ) -> None:
+        self._inner = inner
+        self._offload = offload
+        self._inline_max_chars = inline_max_chars
+
+    @property
+    def inner(self) -> ResourceStore:
+        return self._inner
+
+    async def _call(self, func: Callable[..., _T], *args: object) -> _T:
+        if self._offload:
+            return await asyncio.to_thread(func, *args)
+        return func(*args)
+
+    async def _call_sized(self, chars: int | None, func: Callable[..., _T], *args: object) -> _T:
+        # `chars` is the work the call does; None means unbounded (scans, index builds, recompression).
+        if not self._offload and chars is not None and chars <= self._inline_max_chars:
+            return func(*args)
+        return await asyncio.to_thread(func, *args)
+
+    def _value_chars(self, resource_id: str) -> int | None:
+        # Only asked of inline backends, whose length lookup is cheap.
+        return None if self._offload else self._inner.length(resource_id)
+
+    async def contains(self, resource_id: str) -> bool:
+        return await self._call(self._inner.__contains__, resource_id)
+
+    async def put(self, resource_id: str, value: str) -> None:
+        await self._call_sized(len(value), self._inner.put, resource_id, value)
+
+    async def get(self, resource_id: str) -> str | None:
+        return await self._call_sized(self._value_chars(resource_id), self._inner.get, resource_id)
+
+    async def length(self, resource_id: str) -> int | None:
+        return await self._call(self._inner.length, resource_id)
+
+    async def read_slice(self, resource_id: str, start: int, end: int) -> str | None:
+        return await self._call_sized(max(end - start, 0), self._inner.read_slice, resource_id, start, end)
+
+    async def line_count(self, resource_id: str) -> int | None:
+        # The first line read of a value indexes all of it.
+        return await self._call_sized(self._value_chars(resource_id), self._inner.line_count, resource_id)
+
+    async def read_lines(self, resource_id: str, start: int, end: int) -> list[str] | None:
+        return await self._call_sized(self._value_chars(resource_id), self._inner.read_lines, resource_id, start, end)
+
+    async def search_lines(self, resource_id: str, pattern: re.Pattern[str]) -> list[int] | None:
+        return await self._call_sized(None, self._inner.search_lines, resource_id, pattern)
+
+    async def delete(self, resource_id: str) -> bool:
+        return await self._call(self._inner.delete, resource_id)
+
+    async def clear(self) -> None:
+        await self._call(self._inner.clear)
+
+    async def close(self) -> None:
+        await self._call(self._inner.close)
+
+    async def stats(self) -> StoreStats:
+        return await self._call(self._inner.stats)
+
+    async def put_binary(self, resource_id: str, payload: BinaryPayload) -> None:
+        await self._call_sized(payload.size, put_binary, self._inner, resource_id, payload)
+
+    async def get_binary(self, resource_id: str) -> BinaryPayload | None:
+        return await self._call_sized(self._value_chars(resource_id), get_binary, self._inner, resource_id)
+
+    async def touch(self, resource_id: str) -> bool:
+        touch = getattr(self._inner, "touch", None)
+        if touch is None:
+            return await self._call(self._inner.__contains__, resource_id)
+        return await self._call(touch, resource_id)
+
+    async def set_ttl(self, resource_id: str, ttl: float | None) -> None:
+        set_ttl = getattr(self._inner, "set_ttl", None)
+        if set_ttl is not None:
+            await self._call(set_ttl, resource_id, ttl)
+
+    async def record_producer(self, resource_id: str, tool: str) -> None:
+        record_producer = getattr(self._inner, "record_producer", None)
+        if record_producer is not None:
+            await self._call(record_producer, resource_id, tool)
+
+    async def set_compression(self, resource_id: str, codec: str) -> bool:
+        set_compression = getattr(self._inner, "set_compression", None)
+        return set_compression is not None and await self._call_sized(None, set_compression, resource_id, codec)
+
+    async def build_indexes(self, resource_id: str, kinds: Collection[str]) -> None:
+        build_indexes = getattr(self._inner, "build_indexes", None)
+        if build_indexes is not None:
+            await self._call_sized(None, build_indexes, resource_id, kinds)
+
+    async def is_expired(self, resource_id: str) -> bool:
+        is_expired = getattr(self._inner, "is_expired", None)
+        if is_expired is None:
+            return False
+        return await self._call(is_expired, resource_id)
+
+    def open_writer(self) -> AsyncStoreWriter:
+        return _AsyncWriterAdapter(open_writer(self._inner), self)
+
+
+class _AsyncWriterAdapter:
+    def __init__(self, writer: StoreWriter, store: AsyncStoreAdapter) -> None:
+        self._writer = writer
+        self._store = store
+        self._chars = 0
+
+    async def write(self, chunk: str) -> None:
+        self._chars += len(chunk)
+        await self._store._call_sized(len(chunk), self._writer.write, chunk)
+
+    async def commit(self, resource_id: str) -> None:
+        # Committing may join everything written so far.
+        await self._store._call_sized(self._chars, self._writer.commit, resource_id)
+
+    async def abort(self) -> None:
+        await self._store._call(self._writer.abort)
+
+
+class _AsyncBufferedWriter:
+    """Writer for async stores without native streaming support: buffers the chunks and calls `put` once."""
+
+    def __init__(self, store: AsyncResourceStore) -> None:
+        self._store = store
+        self._chunks: list[str] = []
+
+    async def write(self, chunk: str) -> None:
+        self._chunks.append(chunk)
+
+    async def commit(self, resource_id: str) -> None:
+        chunks, self._chunks = self._chunks, []
+        if not await self._store.contains(resource_id):
+            await self._store.put(resource_id, "".join(chunks))
+
+    async def abort(self) -> None:
+        self._chunks = []
+
+
+def is_async_store(store: object) -> bool:
+    return inspect.iscoroutinefunction(getattr(store, "get", None))
+
+
+def as_async_store(store: ResourceStore | AsyncResourceStore) -> AsyncResourceStore:
+    """Return `store` itself when it is already asynchronous, otherwise wrap it in an `AsyncStoreAdapter`."""
+    if is_async_store(store):
+        return store
+    return AsyncStoreAdapter(store, offload=not isinstance(store, MemoryStore))
+
+
+def open_async_writer(store: AsyncResourceStore) -> AsyncStoreWriter:
+    """Return a streaming writer for `store`, buffering in memory when the backend cannot stream."""
+    opener = getattr(store, "open_writer", None)
+    if opener is None:
+        return _AsyncBufferedWriter(store)
+    return opener()
+
+
+async def put_binary_async(store: AsyncResourceStore, resource_id: str, payload: BinaryPayload) -> None:
+    native = getattr(store, "put_binary", None)
+    if native is None:
+        await store.put(resource_id, payload.to_base64())
+        return
+    await native(resource_id, payload)
+
+
+async def get_binary_async(store: AsyncResourceStore, resource_id: str) -> BinaryPayload | None:
+    native = getattr(store, "get_binary", None)
+    if native is None:
+        return None
+    return await native(resource_id)
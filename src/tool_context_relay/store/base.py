@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Protocol
+
+
+@dataclass(frozen=True)
+class StoreStats:
+    entries: int
+    total_bytes: int
+    max_bytes: int | None
+    hits: int
+    misses: int
+    evictions: int
+    disk_bytes: int = 0
+    expirations: int = 0
+    # Memory held by line-offset and grep indexes (part of `total_bytes` where the store budgets them).
+    index_bytes: int = 0
+
+
+class ResourceStore(Protocol):
+    """Storage backend for boxed values, keyed by `internal://<id>` resource URIs.
+
+    Reads return `None` when the resource is unknown (never stored, deleted or evicted).
+    Slice indices are character offsets and line ranges are zero-based line numbers
+    (as produced by `str.splitlines()`); both are already normalized by the caller (0 <= start <= end).
+    """
+
+    def __contains__(self, resource_id: str) -> bool: ...
+
+    def put(self, resource_id: str, value: str) -> None: ...
+
+    def get(self, resource_id: str) -> str | None: ...
+
+    def length(self, resource_id: str) -> int | None: ...
+
+    def read_slice(self, resource_id: str, start: int, end: int) -> str | None: ...
+
+    def line_count(self, resource_id: str) -> int | None: ...
+
+    def read_lines(self, resource_id: str, start: int, end: int) -> list[str] | None: ...
+
+    def search_lines(self, resource_id: str, pattern: re.Pattern[str]) -> list[int] | None:
+        """Return the zero-based numbers of the lines matching `pattern`."""
+        ...
+
+    def delete(self, resource_id: str) -> bool: ...
+
+    def clear(self) -> None: ...
+
+    def close(self) -> None:
+        """Release this handle at the end of a session.
+
+        Session-local stores drop their values; persistent/shared stores only release connections.
+        """
+        ...
+
+    def stats(self) -> StoreStats: ...
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import base64
+import mmap
+from dataclasses import dataclass
+
+from tool_context_relay.store.base import ResourceStore
+
+DEFAULT_MIME_TYPE = "application/octet-stream"
+
+
+@dataclass(frozen=True)
+class BinaryPayload:
+    """Raw binary value (e.g. a screenshot) tagged with its MIME type."""
+
+    data: bytes | memoryview
+    mime_type: str = DEFAULT_MIME_TYPE
+
+    @property
+    def size(self) -> int:
+        return memoryview(self.data).nbytes
+
+    def to_base64(self) -> str:
+        return base64.b64encode(self.data).decode("ascii")
+
+
+def base64_length(size: int) -> int:
+    """Length of the padded base64 text of `size` bytes, computed without encoding."""
+    return 4 * -(-size // 3)
+
+
+def base64_slice(data: bytes | memoryview | mmap.mmap, start: int, end: int) -> str:
+    """Return `base64(data)[start:end]`, encoding only the 3-byte groups the slice covers."""
+    end = min(end, base64_length(len(data) if isinstance(data, mmap.mmap) else memoryview(data).nbytes))
+    if end <= start:
+        return ""
+    first_group = start // 4
+    last_group = -(-end // 4)
+    text = base64.b64encode(data[first_group * 3 : last_group * 3]).decode("ascii")
+    base = first_group * 4
+    return text[start - base : end - base]
+
+
+def put_binary(store: ResourceStore, resource_id: str, payload: BinaryPayload) -> None:
+    """Store `payload` raw when the backend supports binary values, otherwise as base64 text."""
+    native = getattr(store, "put_binary", None)
+    if native is None:
+        store.put(resource_id, payload.to_base64())
+        return
+    native(resource_id, payload)
+
+
+def get_binary(store: ResourceStore, resource_id: str) -> BinaryPayload | None:
+    """Return the raw payload of a binary value, or None for text values and non-binary backends."""
+    native = getattr(store, "get_binary", None)
+    if native is None:
+        return None
+    return native(resource_id)
@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+import lzma
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from collections.abc import Iterator
+from dataclasses import dataclass, replace
+from itertools import islice
+from typing import Literal
+
+from tool_context_relay.store.base import StoreStats
+from tool_context_relay.store.lines import LineCounter, count_lines, iter_lines, search_lines
+from tool_context_relay.store.memory import DEFAULT_MAX_BYTES
+
+Codec = Literal["zlib", "lzma"]
+CODECS: tuple[Codec, ...] = ("zlib", "lzma")
+
+DEFAULT_BLOCK_CHARS = 64 * 1024
+
+
+@dataclass(frozen=True)
+class _CompressedEntry:
+    codec: Codec
+    block_chars: int
+    char_length: int
+    line_count: int
+    # Block index: block N holds characters [N * block_chars, (N + 1) * block_chars), compressed on its own.
+    blocks: tuple[bytes, ...]
+
+    @property
+    def size(self) -> int:
+        return sum(len(block) for block in self.blocks)
+
+
+def _compress(codec: Codec, data: bytes) -> bytes:
+    if codec == "lzma":
+        return lzma.compress(data)
+    return zlib.compress(data)
+
+
+def _decompress(codec: Codec, data: bytes) -> bytes:
+    if codec == "lzma":
+        return lzma.decompress(data)
+    return zlib.decompress(data)
+
+
+class _CompressedWriter:
+    """Streaming writer that compresses each block as soon as it is full."""
+
+    def __init__(self, store: CompressedStore) -> None:
+        self._store = store
+        self._blocks: list[bytes] = []
+        self._pending: list[str] = []
+        self._pending_chars = 0
+        self._char_length = 0
+        self._lines = LineCounter()
+
+    def write(self, chunk: str) -> None:
+        self._lines.feed(chunk)
+        self._char_length += len(chunk)
+        self._pending.append(chunk)
+        self._pending_chars += len(chunk)
+        block_chars = self._store._block_chars
+        if self._pending_chars < block_chars:
+            return
+        pending = "".join(self._pending)
+        full = len(pending) - len(pending) % block_chars
+        for index in range(0, full, block_chars):
+            self._blocks.append(_compress(self._store._codec, pending[index : index + block_chars].encode("utf-8")))
+        rest = pending[full:]
+        self._pending = [rest] if rest else []
+        self._pending_chars = len(rest)
+
+    def commit(self, resource_id: str) -> None:
+        if self._pending:
+            self._blocks.append(_compress(self._store._codec, "".join(self._pending).encode("utf-8")))
+            self._pending = []
+        entry = _CompressedEntry(
+            codec=self._store._codec,
+            block_chars=self._store._block_chars,
+            char_length=self._char_length,
+            line_count=self._lines.count,
+            blocks=tuple(self._blocks),
+        )
+        self._blocks = []
+        if resource_id not in self._store:
+            self._store._insert(resource_id, entry)
+
+    def abort(self) -> None:
+        self._blocks = []
+        self._pending = []
+
+
+class CompressedStore:
+    """In-memory store that keeps values as independently compressed fixed-size blocks.
+
+    Blocks cover a fixed number of characters, so a slice maps straight to the blocks it
+    overlaps and only those are decompressed; line reads and searches stream block by block.
+    The byte budget and LRU eviction apply to the compressed size.
+    """
+
+    def __init__(
+        self,
+        *,
+        codec: Codec = "zlib",
+        block_chars: int = DEFAULT_BLOCK_CHARS,
+        max_bytes: int | None = DEFAULT_MAX_BYTES,
+    ) -> None:
+        if codec not in CODECS:
+            raise ValueError(f"unsupported codec: {codec!r}")
+        if block_chars <= 0:
+            raise ValueError("block_chars must be a positive integer")
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError("max_bytes must be a positive integer or None")
+        self._codec: Codec = codec
+        self._block_chars = block_chars
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[str, _CompressedEntry] = OrderedDict()
+        self._total_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def __contains__(self, resource_id: str) -> bool:
+        with self._lock:
+            return resource_id in self._entries
+
+    def touch(self, resource_id: str) -> bool:
+        with self._lock:
+            if resource_id not in self._entries:
+                return False
+            self._entries.move_to_end(resource_id)
+            return True
+
+    def put(self, resource_id: str, value: str) -> None:
+        blocks = tuple(
+            _compress(self._codec, value[index : index + self._block_chars].encode("utf-8"))
+            for index in range(0, len(value), self._block_chars)
+        )
+        entry = _CompressedEntry(
+            codec=self._codec,
+            block_chars=self._block_chars,
+            char_length=len(value),
+            line_count=count_lines(value),
+            blocks=blocks,
+        )
+        self._insert(resource_id, entry)
+
+    def open_writer(self) -> _CompressedWriter:
+        return _CompressedWriter(self)
+
+    def get(self, resource_id: str) -> str | None:
+        entry = self._lookup(resource_id)
+        if entry is None:
+            return None
+        return "".join(self._iter_blocks(entry))
+
+    def length(self, resource_id: str) -> int | None:
+        entry = self._lookup(resource_id)
+        return None if entry is None else entry.char_length
+
+    def read_slice(self, resource_id: str, start: int, end: int) -> str | None:
+        entry = self._lookup(resource_id)
+        if entry is None:
+            return None
+        end = min(end, entry.char_length)
+        if end <= start:
+            return ""
+        first_block = start // entry.block_chars
+        last_block = (end - 1) // entry.block_chars
+        text = "".join(self._iter_blocks(entry, first_block, last_block + 1))
+        base = first_block * entry.block_chars
+        return text[start - base : end - base]
+
+    def line_count(self, resource_id: str) -> int | None:
+        entry = self._lookup(resource_id)
+        return None if entry is None else entry.line_count
+
+    def read_lines(self, resource_id: str, start: int, end: int) -> list[str] | None:
+        entry = self._lookup(resource_id)
+        if entry is None:
+            return None
+        if end <= start:
+            return []
+        # Blocks after the last requested line are never decompressed.
+        return list(islice(iter_lines(self._iter_blocks(entry)), start, end))
+
+    def search_lines(self, resource_id: str, pattern: re.Pattern[str]) -> list[int] | None:
+        entry = self._lookup(resource_id)
+        if entry is None:
+            return None
+        return search_lines(iter_lines(self._iter_blocks(entry)), pattern)
+
+    def set_compression(self, resource_id: str, codec: Codec) -> bool:
+        """Re-encode a stored value with `codec`; False if the id is unknown."""
+        if codec not in CODECS:
+            raise ValueError(f"unsupported codec: {codec!r}")
+        with self._lock:
+            entry = self._entries.get(resource_id)
+        if entry is None:
+            return False
+        if entry.codec != codec:
+            blocks = tuple(_compress(codec, _decompress(entry.codec, block)) for block in entry.blocks)
+            self._insert(resource_id, replace(entry, codec=codec, blocks=blocks))
+        return True
+
+    def resource_ids(self) -> list[str]:
+        with self._lock:
+            return list(self._entries)
+
+    def delete(self, resource_id: str) -> bool:
+        with self._lock:
+            entry = self._entries.pop(resource_id, None)
+            if entry is None:
+                return False
+            self._total_bytes -= entry.size
+            return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def close(self) -> None:
+        self.clear()
+
+    def stats(self) -> StoreStats:
+        with self._lock:
+            return StoreStats(
+                entries=len(self._entries),
+                total_bytes=self._total_bytes,
+                max_bytes=self._max_bytes,
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+            )
+
+    def _insert(self, resource_id: str, entry: _CompressedEntry) -> None:
+        with self._lock:
+            previous = self._entries.pop(resource_id, None)
+            if previous is not None:
+                self._total_bytes -= previous.size
+            self._entries[resource_id] = entry
+            self._total_bytes += entry.size
+            self._evict_over_budget()
+
+    def _iter_blocks(self, entry: _CompressedEntry, first: int = 0, stop: int | None = None) -> Iterator[str]:
+        for block in entry.blocks[first:stop]:
+            yield _decompress(entry.codec, block).decode("utf-8")
+
+    def _lookup(self, resource_id: str) -> _CompressedEntry | None:
+        with self._lock:
+            entry = self._entries.get(resource_id)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._entries.move_to_end(resource_id)
+            return entry
+
+    def _evict_over_budget(self) -> None:
+        if self._max_bytes is None:
+            return
+        while self._total_bytes > self._max_bytes and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self._total_bytes -= evicted.size
+            self._evictions += 1
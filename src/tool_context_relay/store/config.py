@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Literal
+
+from tool_context_relay.store.accounting import AccountingStore
+from tool_context_relay.store.base import ResourceStore
+from tool_context_relay.store.compressed import Codec, CompressedStore
+from tool_context_relay.store.disk import DEFAULT_SPILL_THRESHOLD, DiskSpillStore
+from tool_context_relay.store.expiring import ExpiringStore
+from tool_context_relay.store.memory import DEFAULT_MAX_BYTES, MemoryStore
+from tool_context_relay.store.remote import RemoteStore
+from tool_context_relay.store.shared import SharedMemoryStore
+from tool_context_relay.store.snapshot import RestoredStore, SnapshotStore
+from tool_context_relay.store.sqlite import SqliteStore
+from tool_context_relay.store.tiered import TieredStore
+
+if TYPE_CHECKING:
+    from tool_context_relay.tools.policy import ToolPolicy
+
+StoreKind = Literal["memory", "disk", "sqlite", "tiered", "shared", "remote"]
+# Kinds whose values only this process's session can cite. The others are shared with other processes (and other
+# processes box the same content-addressed ids), which a per-process ReachabilityTracker cannot see.
+SESSION_LOCAL_KINDS: frozenset[StoreKind] = frozenset({"memory", "disk", "tiered"})
+
+
+@dataclass(frozen=True)
+class StoreConfig:
+    kind: StoreKind = "memory"
+    # Directory, database file, or (for "remote") the server address.
+    path: str | None = None
+    # Budget of the in-memory store (the hot tier of a tiered store); `cold_max_bytes` bounds the cold tier.
+    max_bytes: int | None = DEFAULT_MAX_BYTES
+    cold_max_bytes: int | None = None
+    spill_threshold: int = DEFAULT_SPILL_THRESHOLD
+    compression: Codec | None = None
+    # Default TTL (seconds) of every reference, and per-tool overrides; either one enables expiry.
+    ttl: float | None = None
+    tool_ttls: dict[str, float] = field(default_factory=dict)
+    # Pass store-backed lazy values to tools that declare support instead of reading whole values.
+    lazy_unboxing: bool = False
+    # Also resolve references embedded in larger string arguments ("Summary: internal://<id>").
+    interpolate_references: bool = False
+    # Return boxed results with a preview (length, line count, content type, head and tail).
+    previews: bool = False
+    # Snapshot file restored (if present) when the store is created and rewritten when a run ends.
+    snapshot_path: str | None = None
+    # Delete references as soon as no live session's conversation can reach them.
+    reachability_gc: bool = False
+    # Track per-resource size, producing tool, age and reads (`AccountingStore.report()`).
+    accounting: bool = False
+    # Per-tool boxing policies layered over the built-in ones (`tools.policy.DEFAULT_TOOL_POLICIES`).
+    tool_policies: Mapping[str, ToolPolicy] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        if self.reachability_gc and (self.kind not in SESSION_LOCAL_KINDS or self.snapshot_path is not None):
+            raise ValueError("reachability_gc requires a session-local store (memory, disk or tiered, no snapshot)")
+
+
+def create_store(config: StoreConfig | None = None) -> ResourceStore:
+    config = config or StoreConfig()
+    store = _create_backend(config)
+    snapshot = None
+    if config.snapshot_path is not None and Path(config.snapshot_path).exists():
+        snapshot = SnapshotStore(config.snapshot_path)
+        store = RestoredStore(store, snapshot)
+    policy_ttls = any(policy.ttl is not None for policy in config.tool_policies.values())
+    if config.ttl is not None or config.tool_ttls or policy_ttls:
+        store = ExpiringStore(store, default_ttl=config.ttl)
+        if snapshot is not None:
+            store.restore_ttls(snapshot.expiries())
+        store.start_sweeper()
+    if config.accounting:
+        # Outermost, so the relay can attribute values to tools and every read is counted.
+        store = AccountingStore(store)
+    return store
+
+
+def _create_backend(config: StoreConfig) -> ResourceStore:
+    if config.kind == "disk":
+        return DiskSpillStore(
+            config.path,
+            spill_threshold=config.spill_threshold,
+            memory=MemoryStore(max_bytes=config.max_bytes),
+        )
+    if config.kind == "tiered":
+        return TieredStore(
+            config.path,
+            hot_max_bytes=config.max_bytes,
+            cold_max_bytes=config.cold_max_bytes,
+            cold_threshold=config.spill_threshold,
+        )
+    if config.kind == "shared":
+        return SharedMemoryStore()
+    if config.kind == "remote":
+        if not config.path:
+            raise ValueError("remote store requires a server address")
+        return RemoteStore(config.path)
+    if config.kind == "sqlite":
+        if not config.path:
+            raise ValueError("sqlite store requires a database path")
+        return SqliteStore(config.path)
+    if config.compression is not None:
+        return CompressedStore(codec=config.compression, max_bytes=config.max_bytes)
+    return MemoryStore(max_bytes=config.max_bytes)
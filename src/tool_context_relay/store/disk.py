@@ -0,0 +1,447 @@
+from __future__ import annotations
+
+import mmap
+import os
+import re
+import shutil
+import tempfile
+import threading
+import uuid
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+
+from tool_context_relay.store.base import StoreStats
+from tool_context_relay.store.binary import BinaryPayload, base64_length, base64_slice
+from tool_context_relay.store.lines import LINE_BREAK_BYTES, indexed_lines, line_offsets
+from tool_context_relay.store.memory import MemoryStore, _index_size
+from tool_context_relay.store.trigram import DEFAULT_GREP_INDEX_MIN_CHARS, TrigramIndex, search_indexed
+
+DEFAULT_SPILL_THRESHOLD = 1024 * 1024
+DEFAULT_OFFSET_STRIDE = 4096
+
+_UNSAFE_FILE_CHARS = re.compile(r"[^A-Za-z0-9_-]+")
+
+
+@dataclass(frozen=True)
+class _SpilledEntry:
+    path: Path
+    char_length: int
+    byte_length: int
+    # Byte offset of every `stride`-th character; None when the payload is ASCII (offsets are identity).
+    offsets: array | None
+    # Set for raw binary payloads; text reads see their base64 encoding (a single line).
+    mime_type: str | None = None
+
+
+def _file_stem(resource_id: str) -> str:
+    return _UNSAFE_FILE_CHARS.sub("_", resource_id.removeprefix("internal://")) or "_"
+
+
+class _SpillFile:
+    """Append-only UTF-8 payload file that samples the byte offset of every `stride`-th character."""
+
+    def __init__(self, path: Path, stride: int) -> None:
+        self.path = path
+        self._stride = stride
+        self._fh = path.open("wb")
+        self._offsets = array("Q")
+        self._ascii = True
+        self.char_length = 0
+        self.byte_length = 0
+
+    def write(self, chunk: str) -> None:
+        self._ascii = self._ascii and chunk.isascii()
+        index = 0
+        # Encode stride by stride: no full-size bytes copy of the chunk is ever held in memory.
+        while index < len(chunk):
+            position = self.char_length % self._stride
+            if position == 0:
+                self._offsets.append(self.byte_length)
+            piece = chunk[index : index + self._stride - position]
+            data = piece.encode("utf-8")
+            self._fh.write(data)
+            index += len(piece)
+            self.char_length += len(piece)
+            self.byte_length += len(data)
+
+    def close(self) -> array | None:
+        """Close the file and return the offsets, or None when the payload is ASCII (offsets are identity)."""
+        self._fh.close()
+        return None if self._ascii else self._offsets
+
+    def discard(self) -> None:
+        self._fh.close()
+        self.path.unlink(missing_ok=True)
+
+
+class _SpillWriter:
+    """Streaming writer that buffers up to the spill threshold and then appends straight to a file."""
+
+    def __init__(self, store: DiskSpillStore) -> None:
+        self._store = store
+        self._buffer: list[str] = []
+        self._buffered = 0
+        self._file: _SpillFile | None = None
+
+    def write(self, chunk: str) -> None:
+        if self._file is None:
+            self._buffer.append(chunk)
+            self._buffered += len(chunk)
+            if self._buffered <= self._store._spill_threshold:
+                return
+            self._file = _SpillFile(self._store._directory / f".{uuid.uuid4().hex}.partial", self._store._stride)
+            chunks, self._buffer = self._buffer, []
+            for buffered in chunks:
+                self._file.write(buffered)
+            return
+        self._file.write(chunk)
+
+    def commit(self, resource_id: str) -> None:
+        if resource_id in self._store:
+            self.abort()
+            return
+        if self._file is None:
+            value = "".join(self._buffer)
+            self._buffer = []
+            self._store.put(resource_id, value)
+            return
+        self._store._commit_spill(resource_id, self._file)
+        self._file = None
+
+    def abort(self) -> None:
+        self._buffer = []
+        if self._file is not None:
+            self._file.discard()
+            self._file = None
+
+
+class DiskSpillStore:
+    """Store that keeps small values in memory and spills large ones to memory-mapped files.
+
+    Spilled values are written as UTF-8, with byte offsets sampled every `offset_stride` characters
+    kept in memory, so `read_slice` decodes only the pages around the requested
+    characters and `length` never touches the file at all. The first line-based read of a spilled
+    value builds a byte index of line starts, after which line paging reads only the requested lines;
+    the second search builds a trigram index, so later searches decode only candidate lines.
+    Binary payloads above the threshold are spilled raw and base64-encoded only for the range read.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path | None = None,
+        *,
+        spill_threshold: int = DEFAULT_SPILL_THRESHOLD,
+        offset_stride: int = DEFAULT_OFFSET_STRIDE,
+        memory: MemoryStore | None = None,
+        grep_index_min_chars: int | None = DEFAULT_GREP_INDEX_MIN_CHARS,
+    ) -> None:
+        if spill_threshold < 0:
+            raise ValueError("spill_threshold must be a non-negative integer")
+        if offset_stride <= 0:
+            raise ValueError("offset_stride must be a positive integer")
+        # A directory created here is private to this store and removed by `close()`.
+        self._owns_directory = directory is None
+        if directory is None:
+            directory = tempfile.mkdtemp(prefix="tool-context-relay-")
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._spill_threshold = spill_threshold
+        self._stride = offset_stride
+        self._grep_index_min_chars = grep_index_min_chars
+        self._memory = memory if memory is not None else MemoryStore()
+        self._spilled: dict[str, _SpilledEntry] = {}
+        self._line_offsets: dict[str, array] = {}
+        self._grep_indexes: dict[str, TrigramIndex] = {}
+        self._searched: set[str] = set()
+        self._hits = 0
+        self._lock = threading.Lock()
+
+    @property
+    def directory(self) -> Path:
+        return self._directory
+
+    def __contains__(self, resource_id: str) -> bool:
+        with self._lock:
+            if resource_id in self._spilled:
+                return True
+        return resource_id in self._memory
+
+    def touch(self, resource_id: str) -> bool:
+        # Spilled values are never evicted; only the memory tier keeps a recency order.
+        with self._lock:
+            if resource_id in self._spilled:
+                return True
+        return self._memory.touch(resource_id)
+
+    def put(self, resource_id: str, value: str) -> None:
+        if len(value) <= self._spill_threshold:
+            self._remove_spilled(resource_id)
+            self._memory.put(resource_id, value)
+            return
+        spill_file = _SpillFile(self._directory / f"{_file_stem(resource_id)}.txt", self._stride)
+        try:
+            spill_file.write(value)
+        except BaseException:
+            spill_file.discard()
+            raise
+        self._commit_spill(resource_id, spill_file)
+
+    def open_writer(self) -> _SpillWriter:
+        return _SpillWriter(self)
+
+    def put_binary(self, resource_id: str, payload: BinaryPayload) -> None:
+        if payload.size <= self._spill_threshold:
+            self._remove_spilled(resource_id)
+            self._memory.put_binary(resource_id, payload)
+            return
+        path = self._directory / f"{_file_stem(resource_id)}.bin"
+        partial = self._directory / f".{uuid.uuid4().hex}.partial"
+        try:
+            partial.write_bytes(payload.data)
+            os.replace(partial, path)
+        except BaseException:
+            partial.unlink(missing_ok=True)
+            raise
+        entry = _SpilledEntry(
+            path=path,
+            char_length=base64_length(payload.size),
+            byte_length=payload.size,
+            offsets=None,
+            mime_type=payload.mime_type,
+        )
+        self._register(resource_id, entry)
+
+    def get_binary(self, resource_id: str) -> BinaryPayload | None:
+        entry = self._spilled_entry(resource_id)
+        if entry is None:
+            return self._memory.get_binary(resource_id)
+        if entry.mime_type is None:
+            return None
+        return BinaryPayload(entry.path.read_bytes(), entry.mime_type)
+
+    def get(self, resource_id: str) -> str | None:
+        entry = self._spilled_entry(resource_id)
+        if entry is None:
+            return self._memory.get(resource_id)
+        if entry.mime_type is not None:
+            return BinaryPayload(entry.path.read_bytes(), entry.mime_type).to_base64()
+        return entry.path.read_bytes().decode("utf-8")
+
+    def length(self, resource_id: str) -> int | None:
+        entry = self._spilled_entry(resource_id)
+        if entry is None:
+            return self._memory.length(resource_id)
+        return entry.char_length
+
+    def read_slice(self, resource_id: str, start: int, end: int) -> str | None:
+        entry = self._spilled_entry(resource_id)
+        if entry is None:
+            return self._memory.read_slice(resource_id, start, end)
+        end = min(end, entry.char_length)
+        if end <= start:
+            return ""
+        if entry.mime_type is not None:
+            with self._map(entry) as mapped:
+                return base64_slice(mapped, start, end)
+        first_block = start // self._stride
+        last_block = -(-end // self._stride)
+        byte_start = self._block_offset(entry, first_block)
+        byte_end = self._block_offset(entry, last_block)
+        with self._map(entry) as mapped:
+            chunk = mapped[byte_start:byte_end].decode("utf-8")
+        block_base = first_block * self._stride
+        return chunk[start - block_base : end - block_base]
+
+    def line_count(self, resource_id: str) -> int | None:
+        entry = self._spilled_entry(resource_id)
+        if entry is None:
+            return self._memory.line_count(resource_id)
+        if entry.mime_type is not None:
+            return 1
+        return len(self._line_index(resource_id, entry)) - 1
+
+    def read_lines(self, resource_id: str, start: int, end: int) -> list[str] | None:
+        entry = self._spilled_entry(resource_id)
+        if entry is None:
+            return self._memory.read_lines(resource_id, start, end)
+        if entry.mime_type is not None:
+            return [self.get(resource_id)][start:end] if end > start else []
+        offsets = self._line_index(resource_id, entry)
+        if end <= start or entry.byte_length == 0:
+            return []
+        with self._map(entry) as mapped:
+            return indexed_lines(mapped, offsets, start, end)
+
+    def search_lines(self, resource_id: str, pattern: re.Pattern[str]) -> list[int] | None:
+        entry = self._spilled_entry(resource_id)
+        if entry is None:
+            return self._memory.search_lines(resource_id, pattern)
+        matches: list[int] = []
+        if entry.byte_length == 0:
+            return matches
+        if entry.mime_type is not None:
+            return [0] if pattern.search(self.get(resource_id)) else []
+        if self._wants_grep_index(resource_id, entry):
+            offsets = self._line_index(resource_id, entry)
+            with self._map(entry) as mapped:
+                indexed = search_indexed(
+                    self._grep_index(resource_id, entry, mapped, offsets),
+                    pattern,
+                    lambda line_no: indexed_lines(mapped, offsets, line_no, line_no + 1)[0],
+                )
+            if indexed is not None:
+                return indexed
+        with self._map(entry) as mapped:
+            line_no = 0
+            line_start = 0
+            for match in LINE_BREAK_BYTES.finditer(mapped):
+                if pattern.search(mapped[line_start : match.start()].decode("utf-8")):
+                    matches.append(line_no)
+                line_no += 1
+                line_start = match.end()
+            if line_start < entry.byte_length and pattern.search(mapped[line_start:].decode("utf-8")):
+                matches.append(line_no)
+        return matches
+
+    def resource_ids(self) -> list[str]:
+        with self._lock:
+            spilled = list(self._spilled)
+        return [*self._memory.resource_ids(), *spilled]
+
+    def delete(self, resource_id: str) -> bool:
+        removed = self._remove_spilled(resource_id)
+        return self._memory.delete(resource_id) or removed
+
+    def clear(self) -> None:
+        with self._lock:
+            entries = list(self._spilled.values())
+            self._spilled.clear()
+            self._line_offsets.clear()
+            self._grep_indexes.clear()
+            self._searched.clear()
+        for entry in entries:
+            self._unlink(entry)
+        self._memory.clear()
+
+    def close(self) -> None:
+        self.clear()
+        if self._owns_directory:
+            shutil.rmtree(self._directory, ignore_errors=True)
+
+    def stats(self) -> StoreStats:
+        memory_stats = self._memory.stats()
+        with self._lock:
+            spilled_count = len(self._spilled)
+            disk_bytes = sum(entry.byte_length for entry in self._spilled.values())
+            index_bytes = sum(_index_size(offsets) for offsets in self._line_offsets.values())
+            index_bytes += sum(grep_index.size for grep_index in self._grep_indexes.values())
+            index_bytes += sum(_index_size(entry.offsets) for entry in self._spilled.values() if entry.offsets)
+            hits = self._hits
+        return StoreStats(
+            entries=memory_stats.entries + spilled_count,
+            total_bytes=memory_stats.total_bytes,
+            max_bytes=memory_stats.max_bytes,
+            hits=memory_stats.hits + hits,
+            misses=memory_stats.misses,
+            evictions=memory_stats.evictions,
+            disk_bytes=disk_bytes,
+            index_bytes=memory_stats.index_bytes + index_bytes,
+        )
+
+    def _commit_spill(self, resource_id: str, spill_file: _SpillFile) -> None:
+        offsets = spill_file.close()
+        path = self._directory / f"{_file_stem(resource_id)}.txt"
+        if spill_file.path != path:
+            os.replace(spill_file.path, path)
+        entry = _SpilledEntry(
+            path=path,
+            char_length=spill_file.char_length,
+            byte_length=spill_file.byte_length,
+            offsets=offsets,
+        )
+        self._register(resource_id, entry)
+
+    def _register(self, resource_id: str, entry: _SpilledEntry) -> None:
+        self._memory.delete(resource_id)
+        with self._lock:
+            previous = self._spilled.get(resource_id)
+            self._spilled[resource_id] = entry
+            self._line_offsets.pop(resource_id, None)
+            self._grep_indexes.pop(resource_id, None)
+            self._searched.discard(resource_id)
+        # A text value replacing a binary one (or vice versa) lives under a different file name.
+        if previous is not None and previous.path != entry.path:
+            self._unlink(previous)
+
+    def _line_index(self, resource_id: str, entry: _SpilledEntry) -> array:
+        with self._lock:
+            offsets = self._line_offsets.get(resource_id)
+        if offsets is not None:
+            return offsets
+        if entry.byte_length == 0:
+            offsets = array("Q", [0])
+        else:
+            with self._map(entry) as mapped:
+                offsets = line_offsets(mapped)
+        with self._lock:
+            if self._spilled.get(resource_id) is entry:
+                self._line_offsets[resource_id] = offsets
+        return offsets
+
+    def _wants_grep_index(self, resource_id: str, entry: _SpilledEntry) -> bool:
+        if self._grep_index_min_chars is None or entry.char_length < self._grep_index_min_chars:
+            return False
+        with self._lock:
+            if resource_id in self._grep_indexes:
+                return True
+            # A value grepped only once is cheaper to scan than to index.
+            first_search = resource_id not in self._searched
+            self._searched.add(resource_id)
+        return not first_search
+
+    def _grep_index(self, resource_id: str, entry: _SpilledEntry, mapped: mmap.mmap, offsets: array) -> TrigramIndex:
+        with self._lock:
+            grep_index = self._grep_indexes.get(resource_id)
+        if grep_index is not None:
+            return grep_index
+        grep_index = TrigramIndex(
+            indexed_lines(mapped, offsets, line_no, line_no + 1)[0] for line_no in range(len(offsets) - 1)
+        )
+        with self._lock:
+            if self._spilled.get(resource_id) is entry:
+                self._grep_indexes[resource_id] = grep_index
+        return grep_index
+
+    def _block_offset(self, entry: _SpilledEntry, block: int) -> int:
+        if entry.offsets is None:
+            return min(block * self._stride, entry.byte_length)
+        if block >= len(entry.offsets):
+            return entry.byte_length
+        return entry.offsets[block]
+
+    def _map(self, entry: _SpilledEntry) -> mmap.mmap:
+        with entry.path.open("rb") as fh:
+            return mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _spilled_entry(self, resource_id: str) -> _SpilledEntry | None:
+        with self._lock:
+            entry = self._spilled.get(resource_id)
+            if entry is not None:
+                self._hits += 1
+            return entry
+
+    def _remove_spilled(self, resource_id: str) -> bool:
+        with self._lock:
+            entry = self._spilled.pop(resource_id, None)
+            self._line_offsets.pop(resource_id, None)
+            self._grep_indexes.pop(resource_id, None)
+            self._searched.discard(resource_id)
+        if entry is None:
+            return False
+        self._unlink(entry)
+        return True
+
+    @staticmethod
+    def _unlink(entry: _SpilledEntry) -> None:
+        entry.path.unlink(missing_ok=True)
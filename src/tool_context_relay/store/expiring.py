@@ -0,0 +1,325 @@
+from __future__ import annotations
+
+import heapq
+import re
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Collection, Mapping
+from dataclasses import replace
+
+from tool_context_relay.store import binary
+from tool_context_relay.store.base import ResourceStore, StoreStats
+from tool_context_relay.store.binary import BinaryPayload
+from tool_context_relay.store.writer import StoreWriter, open_writer
+
+DEFAULT_SWEEP_INTERVAL = 1.0
+DEFAULT_SWEEP_MAX_ENTRIES = 1000
+DEFAULT_SWEEP_MAX_SECONDS = 0.005
+_TOMBSTONE_LIMIT = 10_000
+
+
+class _ExpiringWriter:
+    def __init__(self, store: ExpiringStore, inner: StoreWriter) -> None:
+        self._store = store
+        self._inner = inner
+
+    def write(self, chunk: str) -> None:
+        self._inner.write(chunk)
+
+    def commit(self, resource_id: str) -> None:
+        self._inner.commit(resource_id)
+        self._store._stored(resource_id)
+
+    def abort(self) -> None:
+        self._inner.abort()
+
+
+class ExpiringStore:
+    """Wrap a store with per-reference time-to-live expiry.
+
+    Each reference gets a TTL when it is stored (the default TTL, or an explicit one via
+    `set_ttl`); any read refreshes it. Expired references are reclaimed lazily on access and by
+    `sweep()`, which works in bounded slices so it can run from a background thread without
+    pausing the relay. Recently expired ids are remembered so callers can tell "expired" apart
+    from "unknown".
+    """
+
+    def __init__(
+        self,
+        inner: ResourceStore,
+        *,
+        default_ttl: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if default_ttl is not None and default_ttl <= 0:
+            raise ValueError("default_ttl must be a positive number of seconds or None")
+        self._inner = inner
+        self._default_ttl = default_ttl
+        self._clock = clock
+        self._ttls: dict[str, float] = {}
+        self._deadlines: dict[str, float] = {}
+        # Min-heap of (deadline, resource_id) holding one live entry per id, whose deadline `_queued` records.
+        # A refreshed deadline only moves later, so sweep() re-queues it when the old entry surfaces; entries
+        # that no longer match `_queued` are leftovers of a deadline that moved earlier and are dropped.
+        self._queue: list[tuple[float, str]] = []
+        self._queued: dict[str, float] = {}
+        self._expired: OrderedDict[str, None] = OrderedDict()
+        self._expirations = 0
+        self._lock = threading.Lock()
+        self._sweeper: threading.Thread | None = None
+        self._stop_sweeper = threading.Event()
+
+    @property
+    def inner(self) -> ResourceStore:
+        return self._inner
+
+    def __contains__(self, resource_id: str) -> bool:
+        if self._is_past_deadline(resource_id):
+            return False
+        return resource_id in self._inner
+
+    def touch(self, resource_id: str) -> bool:
+        """Mark a reference as used again (it is re-boxed): restart its TTL, as a read would."""
+        if not self._touch(resource_id):
+            return False
+        touch = getattr(self._inner, "touch", None)
+        return touch(resource_id) if touch is not None else resource_id in self._inner
+
+    def put(self, resource_id: str, value: str) -> None:
+        self._inner.put(resource_id, value)
+        self._stored(resource_id)
+
+    def put_binary(self, resource_id: str, payload: BinaryPayload) -> None:
+        binary.put_binary(self._inner, resource_id, payload)
+        self._stored(resource_id)
+
+    def get_binary(self, resource_id: str) -> BinaryPayload | None:
+        if not self._touch(resource_id):
+            return None
+        return binary.get_binary(self._inner, resource_id)
+
+    def open_writer(self) -> _ExpiringWriter:
+        return _ExpiringWriter(self, open_writer(self._inner))
+
+    def set_ttl(self, resource_id: str, ttl: float | None) -> None:
+        """Override the TTL of one reference (`None` keeps it until deleted) and restart its clock."""
+        with self._lock:
+            if ttl is None:
+                self._ttls.pop(resource_id, None)
+                self._deadlines.pop(resource_id, None)
+                return
+            if ttl <= 0:
+                raise ValueError("ttl must be a positive number of seconds or None")
+            self._schedule(resource_id, ttl)
+
+    def expiry(self, resource_id: str) -> tuple[float, float] | None:
+        """Return the (TTL, seconds left) of a reference, or None when it does not expire."""
+        with self._lock:
+            deadline = self._deadlines.get(resource_id)
+            if deadline is None:
+                return None
+            return self._ttls[resource_id], deadline - self._clock()
+
+    def restore_ttls(self, expiries: Mapping[str, tuple[float, float] | None]) -> None:
+        """Schedule references restored from a snapshot (`SnapshotStore.expiries()`).
+
+        Each one keeps its saved TTL and the time it had left; references saved without a TTL get
+        the default TTL, so restored values do not outlive the ones boxed in this run.
+        """
+        with self._lock:
+            now = self._clock()
+            for resource_id, saved in expiries.items():
+                if saved is not None:
+                    ttl, left = saved
+                    self._schedule(resource_id, ttl, deadline=now + left)
+                elif self._default_ttl is not None:
+                    self._schedule(resource_id, self._default_ttl)
+
+    def set_compression(self, resource_id: str, codec: str) -> bool:
+        set_compression = getattr(self._inner, "set_compression", None)
+        return set_compression is not None and set_compression(resource_id, codec)
+
+    def build_indexes(self, resource_id: str, kinds: Collection[str]) -> None:
+        build_indexes = getattr(self._inner, "build_indexes", None)
+        if build_indexes is not None:
+            build_indexes(resource_id, kinds)
+
+    def is_expired(self, resource_id: str) -> bool:
+        self._is_past_deadline(resource_id)
+        with self._lock:
+            return resource_id in self._expired
+
+    def get(self, resource_id: str) -> str | None:
+        if not self._touch(resource_id):
+            return None
+        return self._inner.get(resource_id)
+
+    def length(self, resource_id: str) -> int | None:
+        if not self._touch(resource_id):
+            return None
+        return self._inner.length(resource_id)
+
+    def read_slice(self, resource_id: str, start: int, end: int) -> str | None:
+        if not self._touch(resource_id):
+            return None
+        return self._inner.read_slice(resource_id, start, end)
+
+    def line_count(self, resource_id: str) -> int | None:
+        if not self._touch(resource_id):
+            return None
+        return self._inner.line_count(resource_id)
+
+    def read_lines(self, resource_id: str, start: int, end: int) -> list[str] | None:
+        if not self._touch(resource_id):
+            return None
+        return self._inner.read_lines(resource_id, start, end)
+
+    def search_lines(self, resource_id: str, pattern: re.Pattern[str]) -> list[int] | None:
+        if not self._touch(resource_id):
+            return None
+        return self._inner.search_lines(resource_id, pattern)
+
+    def resource_ids(self) -> list[str]:
+        now = self._clock()
+        with self._lock:
+            deadlines = dict(self._deadlines)
+        return [
+            resource_id
+            for resource_id in self._inner.resource_ids()
+            if deadlines.get(resource_id, now + 1) > now
+        ]
+
+    def delete(self, resource_id: str) -> bool:
+        with self._lock:
+            self._ttls.pop(resource_id, None)
+            self._deadlines.pop(resource_id, None)
+        return self._inner.delete(resource_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._ttls.clear()
+            self._deadlines.clear()
+            self._queue.clear()
+            self._queued.clear()
+            self._expired.clear()
+        self._inner.clear()
+
+    def close(self) -> None:
+        self.stop_sweeper()
+        with self._lock:
+            self._ttls.clear()
+            self._deadlines.clear()
+            self._queue.clear()
+            self._queued.clear()
+        self._inner.close()
+
+    def stats(self) -> StoreStats:
+        with self._lock:
+            expirations = self._expirations
+        return replace(self._inner.stats(), expirations=expirations)
+
+    def sweep(
+        self,
+        *,
+        max_entries: int = DEFAULT_SWEEP_MAX_ENTRIES,
+        max_seconds: float = DEFAULT_SWEEP_MAX_SECONDS,
+    ) -> int:
+        """Reclaim expired references, examining at most `max_entries` queue items or `max_seconds`."""
+        started = time.perf_counter()
+        reclaimed = 0
+        for _ in range(max_entries):
+            with self._lock:
+                if not self._queue or self._queue[0][0] > self._clock():
+                    break
+                queued, resource_id = heapq.heappop(self._queue)
+                if self._queued.get(resource_id) != queued:
+                    continue
+                del self._queued[resource_id]
+                deadline = self._deadlines.get(resource_id)
+                if deadline is None:
+                    continue
+                if deadline > self._clock():
+                    self._enqueue(resource_id, deadline)
+                    continue
+                self._mark_expired(resource_id)
+            self._inner.delete(resource_id)
+            reclaimed += 1
+            if time.perf_counter() - started >= max_seconds:
+                break
+        return reclaimed
+
+    def start_sweeper(self, *, interval: float = DEFAULT_SWEEP_INTERVAL) -> None:
+        if self._sweeper is not None:
+            return
+        self._stop_sweeper.clear()
+
+        def run() -> None:
+            while not self._stop_sweeper.wait(interval):
+                self.sweep()
+
+        self._sweeper = threading.Thread(target=run, name="tool-context-relay-sweeper", daemon=True)
+        self._sweeper.start()
+
+    def stop_sweeper(self) -> None:
+        if self._sweeper is None:
+            return
+        self._stop_sweeper.set()
+        self._sweeper.join()
+        self._sweeper = None
+
+    def _stored(self, resource_id: str) -> None:
+        with self._lock:
+            self._expired.pop(resource_id, None)
+            ttl = self._ttls.get(resource_id, self._default_ttl)
+            if ttl is not None:
+                self._schedule(resource_id, ttl)
+
+    def _schedule(self, resource_id: str, ttl: float, *, deadline: float | None = None) -> None:
+        if deadline is None:
+            deadline = self._clock() + ttl
+        self._ttls[resource_id] = ttl
+        self._deadlines[resource_id] = deadline
+        queued = self._queued.get(resource_id)
+        if queued is None or deadline < queued:
+            self._enqueue(resource_id, deadline)
+
+    def _enqueue(self, resource_id: str, deadline: float) -> None:
+        self._queued[resource_id] = deadline
+        heapq.heappush(self._queue, (deadline, resource_id))
+        if len(self._queue) > 2 * len(self._queued):
+            # Too many leftovers of deadlines that moved earlier: rebuild from the live entries.
+            self._queue = [(queued, queued_id) for queued_id, queued in self._queued.items()]
+            heapq.heapify(self._queue)
+
+    def _touch(self, resource_id: str) -> bool:
+        """Refresh the TTL of a live reference; expire it (and return False) when its deadline has passed."""
+        with self._lock:
+            deadline = self._deadlines.get(resource_id)
+            if deadline is None:
+                return True
+            now = self._clock()
+            if deadline > now:
+                # The queued deadline is now stale; sweep() re-queues it when it surfaces.
+                self._deadlines[resource_id] = now + self._ttls[resource_id]
+                return True
+            self._mark_expired(resource_id)
+        self._inner.delete(resource_id)
+        return False
+
+    def _is_past_deadline(self, resource_id: str) -> bool:
+        with self._lock:
+            deadline = self._deadlines.get(resource_id)
+            if deadline is None or deadline > self._clock():
+                return False
+            self._mark_expired(resource_id)
+        self._inner.delete(resource_id)
+        return True
+
+    def _mark_expired(self, resource_id: str) -> None:
+        self._ttls.pop(resource_id, None)
+        self._deadlines.pop(resource_id, None)
+        self._expired[resource_id] = None
+        self._expirations += 1
+        while len(self._expired) > _TOMBSTONE_LIMIT:
+            self._expired.popitem(last=False)
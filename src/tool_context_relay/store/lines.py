@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import re
+from array import array
+from collections.abc import Iterable, Iterator
+
+# Line boundaries recognized by str.splitlines(), so stores that never materialize the
+# full value still agree with the in-memory behavior.
+LINE_BREAK = re.compile(r"\r\n|[\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]")
+# The same boundaries in UTF-8 encoded form (every multi-byte separator starts with a lead byte).
+LINE_BREAK_BYTES = re.compile(rb"\r\n|[\n\r\x0b\x0c\x1c\x1d\x1e]|\xc2\x85|\xe2\x80[\xa8\xa9]")
+
+
+def count_lines(value: str) -> int:
+    return len(value.splitlines())
+
+
+class LineCounter:
+    """Count lines of a value fed in chunks, matching `len("".join(chunks).splitlines())`."""
+
+    def __init__(self) -> None:
+        self._breaks = 0
+        self._empty = True
+        self._ends_with_break = False
+        self._ends_with_cr = False
+
+    def feed(self, chunk: str) -> None:
+        if not chunk:
+            return
+        self._breaks += len(LINE_BREAK.findall(chunk))
+        if self._ends_with_cr and chunk[0] == "\n":
+            # "\r" + "\n" split across chunks is a single line break.
+            self._breaks -= 1
+        self._empty = False
+        self._ends_with_break = _ends_with_line_break(chunk)
+        self._ends_with_cr = chunk[-1] == "\r"
+
+    @property
+    def count(self) -> int:
+        if self._empty or self._ends_with_break:
+            return self._breaks
+        return self._breaks + 1
+
+
+def line_offsets(value: str | bytes | memoryview) -> array:
+    """Return the start offset of every line plus a final end offset (`len(result) - 1` lines).
+
+    Offsets are character positions for `str` and byte positions for UTF-8 `bytes` (or an mmap / memoryview).
+    """
+    pattern = LINE_BREAK if isinstance(value, str) else LINE_BREAK_BYTES
+    offsets = array("Q", [0])
+    offsets.extend(match.end() for match in pattern.finditer(value))
+    if offsets[-1] != len(value):
+        offsets.append(len(value))
+    return offsets
+
+
+def indexed_lines(value: str | bytes | memoryview, offsets: array, start: int, end: int) -> list[str]:
+    """Return lines `[start, end)` using an index from `line_offsets`, touching only those lines."""
+    end = min(end, len(offsets) - 1)
+    lines: list[str] = []
+    for index in range(start, end):
+        piece = value[offsets[index] : offsets[index + 1]]
+        if not isinstance(piece, str):
+            piece = str(piece, "utf-8")
+        lines.append(strip_line_break(piece))
+    return lines
+
+
+def search_lines(lines: Iterable[str], pattern: re.Pattern[str]) -> list[int]:
+    return [index for index, line in enumerate(lines) if pattern.search(line)]
+
+
+def iter_lines(chunks: Iterable[str]) -> Iterator[str]:
+    """Yield the lines of a value delivered in chunks, exactly as `"".join(chunks).splitlines()` would."""
+    carry = ""
+    for chunk in chunks:
+        buffer = carry + chunk
+        # A trailing "\r" may be the first half of a "\r\n" split across chunks.
+        held_back = ""
+        if buffer.endswith("\r"):
+            buffer, held_back = buffer[:-1], "\r"
+        pieces = buffer.splitlines(keepends=True)
+        carry = ""
+        if pieces and not _ends_with_line_break(pieces[-1]):
+            carry = pieces.pop()
+        for piece in pieces:
+            yield strip_line_break(piece)
+        carry += held_back
+    if carry:
+        yield strip_line_break(carry)
+
+
+def strip_line_break(piece: str) -> str:
+    if piece.endswith("\r\n"):
+        return piece[:-2]
+    if _ends_with_line_break(piece):
+        return piece[:-1]
+    return piece
+
+
+def _ends_with_line_break(piece: str) -> bool:
+    return bool(piece) and LINE_BREAK.match(piece[-1]) is not None
@@ -0,0 +1,269 @@
+from __future__ import annotations
+
+import re
+import sys
+import threading
+from array import array
+from collections import OrderedDict
+from collections.abc import Callable, Collection
+
+from tool_context_relay.store.base import StoreStats
+from tool_context_relay.store.binary import BinaryPayload, base64_length, base64_slice
+from tool_context_relay.store.lines import indexed_lines, line_offsets, search_lines
+from tool_context_relay.store.trigram import DEFAULT_GREP_INDEX_MIN_CHARS, TrigramIndex, search_indexed
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def _payload_size(value: str | BinaryPayload) -> int:
+    # Real heap footprint of the str/bytes object (O(1)), which is what the budget protects.
+    if isinstance(value, BinaryPayload):
+        return sys.getsizeof(value.data)
+    return sys.getsizeof(value)
+
+
+def _index_size(offsets: array) -> int:
+    return offsets.itemsize * len(offsets)
+
+
+class MemoryStore:
+    """In-memory store with a total-byte budget and least-recently-used eviction.
+
+    The most recently stored value is always kept, even if it exceeds the budget on its own;
+    everything older is evicted first. Line-based reads build a line-offset index on first use,
+    so paging through a value costs O(requested lines). The second search of a value of at least
+    `grep_index_min_chars` characters builds a trigram index, so from then on searches only verify
+    the lines that contain the pattern's required literals. Both indexes count towards the budget.
+
+    Binary values (`put_binary`) are kept as raw bytes; text reads see their base64 encoding,
+    produced only for the requested range.
+
+    `on_evict` is called with every value evicted by the budget (never while holding the store lock),
+    which lets a tiered store demote values instead of losing them.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_bytes: int | None = DEFAULT_MAX_BYTES,
+        grep_index_min_chars: int | None = DEFAULT_GREP_INDEX_MIN_CHARS,
+        on_evict: Callable[[str, str | BinaryPayload], None] | None = None,
+    ) -> None:
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError("max_bytes must be a positive integer or None")
+        self._max_bytes = max_bytes
+        self._on_evict = on_evict
+        self._grep_index_min_chars = grep_index_min_chars
+        self._entries: OrderedDict[str, str | BinaryPayload] = OrderedDict()
+        self._line_offsets: dict[str, array] = {}
+        self._grep_indexes: dict[str, TrigramIndex] = {}
+        self._searched: set[str] = set()
+        self._total_bytes = 0
+        self._index_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def __contains__(self, resource_id: str) -> bool:
+        with self._lock:
+            return resource_id in self._entries
+
+    def touch(self, resource_id: str) -> bool:
+        """Mark a stored value as most recently used without reading it; False if the id is unknown."""
+        with self._lock:
+            if resource_id not in self._entries:
+                return False
+            self._entries.move_to_end(resource_id)
+            return True
+
+    def put(self, resource_id: str, value: str) -> None:
+        self._insert(resource_id, value)
+
+    def put_binary(self, resource_id: str, payload: BinaryPayload) -> None:
+        data = payload.data if isinstance(payload.data, bytes) else bytes(payload.data)
+        self._insert(resource_id, BinaryPayload(data, payload.mime_type))
+
+    def get_binary(self, resource_id: str) -> BinaryPayload | None:
+        with self._lock:
+            value = self._lookup(resource_id)
+        if not isinstance(value, BinaryPayload):
+            return None
+        # A read-only view of the stored bytes: handing it to a tool copies nothing.
+        return BinaryPayload(memoryview(value.data), value.mime_type)
+
+    def get(self, resource_id: str) -> str | None:
+        with self._lock:
+            value = self._lookup(resource_id)
+        if isinstance(value, BinaryPayload):
+            return value.to_base64()
+        return value
+
+    def length(self, resource_id: str) -> int | None:
+        with self._lock:
+            value = self._lookup(resource_id)
+        if isinstance(value, BinaryPayload):
+            return base64_length(len(value.data))
+        return None if value is None else len(value)
+
+    def read_slice(self, resource_id: str, start: int, end: int) -> str | None:
+        with self._lock:
+            value = self._lookup(resource_id)
+        if isinstance(value, BinaryPayload):
+            return base64_slice(value.data, start, end)
+        return None if value is None else value[start:end]
+
+    def line_count(self, resource_id: str) -> int | None:
+        indexed = self._indexed(resource_id)
+        return None if indexed is None else len(indexed[1]) - 1
+
+    def read_lines(self, resource_id: str, start: int, end: int) -> list[str] | None:
+        indexed = self._indexed(resource_id)
+        return None if indexed is None else indexed_lines(*indexed, start, end)
+
+    def search_lines(self, resource_id: str, pattern: re.Pattern[str]) -> list[int] | None:
+        indexed = self._indexed(resource_id)
+        if indexed is None:
+            return None
+        value, offsets = indexed
+        grep_index = self._grep_index(resource_id, value)
+        if grep_index is not None:
+            matches = search_indexed(
+                grep_index, pattern, lambda line_no: indexed_lines(value, offsets, line_no, line_no + 1)[0]
+            )
+            if matches is not None:
+                return matches
+        return search_lines(value.splitlines(), pattern)
+
+    def build_indexes(self, resource_id: str, kinds: Collection[str]) -> None:
+        """Build the "lines" and/or "grep" index of a value now rather than on first use."""
+        indexed = self._indexed(resource_id)
+        if indexed is not None and "grep" in kinds:
+            self._grep_index(resource_id, indexed[0], eager=True)
+
+    def resource_ids(self) -> list[str]:
+        with self._lock:
+            return list(self._entries)
+
+    def delete(self, resource_id: str) -> bool:
+        with self._lock:
+            return self._remove(resource_id) is not None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._line_offsets.clear()
+            self._grep_indexes.clear()
+            self._searched.clear()
+            self._total_bytes = 0
+            self._index_bytes = 0
+
+    def close(self) -> None:
+        self.clear()
+
+    def stats(self) -> StoreStats:
+        with self._lock:
+            return StoreStats(
+                entries=len(self._entries),
+                total_bytes=self._total_bytes,
+                max_bytes=self._max_bytes,
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                index_bytes=self._index_bytes,
+            )
+
+    def _indexed(self, resource_id: str) -> tuple[str, array] | None:
+        with self._lock:
+            value = self._lookup(resource_id)
+            if value is None:
+                return None
+            if isinstance(value, BinaryPayload):
+                # Base64 text has no line breaks; it is not worth caching an index for it.
+                text = value.to_base64()
+                return text, line_offsets(text)
+            offsets = self._line_offsets.get(resource_id)
+        if offsets is None:
+            # Built outside the lock; a concurrent reader may build the same index, which is harmless.
+            offsets = line_offsets(value)
+            evicted = []
+            with self._lock:
+                if self._entries.get(resource_id) is value and resource_id not in self._line_offsets:
+                    self._line_offsets[resource_id] = offsets
+                    self._total_bytes += _index_size(offsets)
+                    self._index_bytes += _index_size(offsets)
+                    evicted = self._evict_over_budget()
+            self._notify_evicted(evicted)
+        return value, offsets
+
+    def _grep_index(self, resource_id: str, value: str, *, eager: bool = False) -> TrigramIndex | None:
+        if self._grep_index_min_chars is None or len(value) < self._grep_index_min_chars:
+            return None
+        with self._lock:
+            grep_index = self._grep_indexes.get(resource_id)
+            if grep_index is None and self._entries.get(resource_id) is not value:
+                return None
+            if grep_index is None and not eager and resource_id not in self._searched:
+                # A value grepped only once is cheaper to scan than to index.
+                self._searched.add(resource_id)
+                return None
+        if grep_index is None:
+            grep_index = TrigramIndex(value.splitlines())
+            evicted = []
+            with self._lock:
+                if self._entries.get(resource_id) is value and resource_id not in self._grep_indexes:
+                    self._grep_indexes[resource_id] = grep_index
+                    self._total_bytes += grep_index.size
+                    self._index_bytes += grep_index.size
+                    evicted = self._evict_over_budget()
+            self._notify_evicted(evicted)
+        return grep_index
+
+    def _insert(self, resource_id: str, value: str | BinaryPayload) -> None:
+        with self._lock:
+            self._remove(resource_id)
+            self._entries[resource_id] = value
+            self._total_bytes += _payload_size(value)
+            evicted = self._evict_over_budget()
+        self._notify_evicted(evicted)
+
+    def _remove(self, resource_id: str) -> str | BinaryPayload | None:
+        value = self._entries.pop(resource_id, None)
+        if value is None:
+            return None
+        self._total_bytes -= _payload_size(value)
+        offsets = self._line_offsets.pop(resource_id, None)
+        if offsets is not None:
+            self._total_bytes -= _index_size(offsets)
+            self._index_bytes -= _index_size(offsets)
+        self._searched.discard(resource_id)
+        grep_index = self._grep_indexes.pop(resource_id, None)
+        if grep_index is not None:
+            self._total_bytes -= grep_index.size
+            self._index_bytes -= grep_index.size
+        return value
+
+    def _lookup(self, resource_id: str) -> str | None:
+        value = self._entries.get(resource_id)
+        if value is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        self._entries.move_to_end(resource_id)
+        return value
+
+    def _evict_over_budget(self) -> list[tuple[str, str | BinaryPayload]]:
+        evicted: list[tuple[str, str | BinaryPayload]] = []
+        if self._max_bytes is None:
+            return evicted
+        while self._total_bytes > self._max_bytes and len(self._entries) > 1:
+            resource_id = next(iter(self._entries))
+            evicted.append((resource_id, self._remove(resource_id)))
+            self._evictions += 1
+        return evicted
+
+    def _notify_evicted(self, evicted: list[tuple[str, str | BinaryPayload]]) -> None:
+        if self._on_evict is None:
+            return
+        for resource_id, value in evicted:
+            self._on_evict(resource_id, value)
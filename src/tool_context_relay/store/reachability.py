@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import re
+import threading
+from collections.abc import Iterable, Iterator
+
+from tool_context_relay.store.base import ResourceStore
+
+_RESOURCE_URI = re.compile(r"internal://[\w-]+")
+
+
+def find_references(value: object) -> set[str]:
+    """Collect every `internal://` URI mentioned anywhere in `value` (strings, dicts, sequences, SDK models)."""
+    return {match.group() for text in _iter_strings(value) for match in _RESOURCE_URI.finditer(text)}
+
+
+def _iter_strings(value: object) -> Iterator[str]:
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _iter_strings(item)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            yield from _iter_strings(item)
+    elif hasattr(value, "model_dump"):
+        # Typed SDK items (pydantic models).
+        yield from _iter_strings(value.model_dump())
+
+
+class ReachabilityTracker:
+    """Reclaim references as soon as no live session's conversation can reach them.
+
+    Each session reports what the model can still cite: the full conversation sent with every model
+    call (`observe_conversation`, which replaces the session's roots) and each tool result as it
+    is produced (`observe`, which adds to them). A reference that was reachable and no longer is
+    from any session is deleted from the store immediately. References never observed are left to
+    the store's own eviction and TTLs, so values boxed by an in-flight tool call are never reclaimed.
+    Reachability is tracked per process: share one tracker between all sessions using the store.
+    """
+
+    def __init__(self, store: ResourceStore) -> None:
+        self._store = store
+        self._roots: dict[str, set[str]] = {}
+        # Number of sessions that can reach each reference.
+        self._referrers: dict[str, int] = {}
+        self._reclaimed = 0
+        self._lock = threading.Lock()
+
+    @property
+    def reclaimed(self) -> int:
+        return self._reclaimed
+
+    def is_reachable(self, resource_id: str) -> bool:
+        with self._lock:
+            return resource_id in self._referrers
+
+    def observe_conversation(self, session_id: str, items: object) -> int:
+        """Make the references in `items` (the whole conversation) the session's roots; return the number reclaimed."""
+        return self._set_roots(session_id, find_references(items))
+
+    def observe(self, session_id: str, value: object) -> None:
+        """Add the references in `value` (e.g. a tool result) to the session's roots."""
+        references = find_references(value)
+        if not references:
+            return
+        with self._lock:
+            roots = self._roots.setdefault(session_id, set())
+            for resource_id in references - roots:
+                self._referrers[resource_id] = self._referrers.get(resource_id, 0) + 1
+            roots |= references
+
+    def end_session(self, session_id: str) -> int:
+        """Forget a discarded session; return the number of references reclaimed."""
+        return self._set_roots(session_id, set())
+
+    def _set_roots(self, session_id: str, references: set[str]) -> int:
+        with self._lock:
+            previous = self._roots.pop(session_id, set())
+            if references:
+                self._roots[session_id] = references
+            for resource_id in references - previous:
+                self._referrers[resource_id] = self._referrers.get(resource_id, 0) + 1
+            return self._release(previous - references)
+
+    def _release(self, references: Iterable[str]) -> int:
+        reclaimed = 0
+        for resource_id in references:
+            count = self._referrers[resource_id] - 1
+            if count:
+                self._referrers[resource_id] = count
+                continue
+            del self._referrers[resource_id]
+            if self._store.delete(resource_id):
+                reclaimed += 1
+        self._reclaimed += reclaimed
+        return reclaimed
@@ -0,0 +1,303 @@
+from __future__ import annotations
+
+import json
+import queue
+import re
+import socket
+import struct
+import threading
+
+from tool_context_relay.store.accounting import StoreReport
+from tool_context_relay.store.base import StoreStats
+from tool_context_relay.store.binary import BinaryPayload
+
+DEFAULT_POOL_SIZE = 4
+DEFAULT_TIMEOUT = 30.0
+
+# Every frame (request or response) is a header, a JSON `meta` part (arguments or small results)
+# and a raw `body` part (values, slices, binary payloads), so large payloads are never JSON-escaped.
+# Header: opcode (requests) or status (responses), meta length, body length.
+FRAME_HEADER = struct.Struct("<BII")
+# Largest meta plus body either side accepts; checked before anything is allocated for a frame.
+MAX_FRAME_BYTES = 1 << 30
+
+OP_CONTAINS = 1
+OP_PUT = 2
+OP_GET = 3
+OP_LENGTH = 4
+OP_READ_SLICE = 5
+OP_LINE_COUNT = 6
+OP_READ_LINES = 7
+OP_SEARCH_LINES = 8
+OP_DELETE = 9
+OP_CLEAR = 10
+OP_STATS = 11
+OP_PUT_BINARY = 12
+OP_GET_BINARY = 13
+OP_RESOURCE_IDS = 14
+OP_WRITE_CHUNK = 15
+OP_WRITE_COMMIT = 16
+OP_WRITE_ABORT = 17
+OP_RECORD_PRODUCER = 18
+OP_REPORT = 19
+
+STATUS_OK = 0
+STATUS_MISSING = 1
+STATUS_ERROR = 2
+
+
+def parse_address(address: str) -> tuple[str, int] | str:
+    """Parse `HOST:PORT` into a TCP address; anything else (e.g. `/run/relay.sock`) is a Unix socket path."""
+    host, sep, port = address.rpartition(":")
+    if sep and host and "/" not in address and port.isdigit():
+        return host.strip("[]"), int(port)
+    return address
+
+
+def encode_text(value: str) -> bytes:
+    return value.encode("utf-8", "surrogatepass")
+
+
+def decode_text(data: bytes | bytearray) -> str:
+    return data.decode("utf-8", "surrogatepass")
+
+
+def encode_frame(code: int, meta: object = None, body: bytes | memoryview = b"") -> list[bytes | memoryview]:
+    meta_bytes = b"" if meta is None else json.dumps(meta, separators=(",", ":")).encode("utf-8")
+    return [FRAME_HEADER.pack(code, len(meta_bytes), len(body)) + meta_bytes, body]
+
+
+def check_frame_length(meta_length: int, body_length: int) -> None:
+    if meta_length + body_length > MAX_FRAME_BYTES:
+        raise ValueError(f"frame of {meta_length + body_length} bytes exceeds the {MAX_FRAME_BYTES} byte limit")
+
+
+def decode_meta(data: bytes) -> object:
+    return json.loads(data) if data else None
+
+
+class _Connection:
+    def __init__(self, address: tuple[str, int] | str, timeout: float) -> None:
+        if isinstance(address, str):
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._socket.settimeout(timeout)
+            try:
+                self._socket.connect(address)
+            except BaseException:
+                self._socket.close()
+                raise
+        else:
+            self._socket = socket.create_connection(address, timeout=timeout)
+            # Requests are small and latency bound; never wait to coalesce them.
+            self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def request(
+        self,
+        opcode: int,
+        meta: object = None,
+        body: bytes | memoryview = b"",
+    ) -> tuple[int, object, bytearray]:
+        frame = encode_frame(opcode, meta, body)
+        check_frame_length(len(frame[0]) - FRAME_HEADER.size, len(body))
+        for part in frame:
+            if part:
+                self._socket.sendall(part)
+        status, meta_length, body_length = FRAME_HEADER.unpack(self._read_exactly(FRAME_HEADER.size))
+        check_frame_length(meta_length, body_length)
+        meta_bytes = self._read_exactly(meta_length)
+        return status, decode_meta(meta_bytes), self._read_exactly(body_length)
+
+    def _read_exactly(self, size: int) -> bytearray:
+        buffer = bytearray(size)
+        view = memoryview(buffer)
+        received = 0
+        while received < size:
+            count = self._socket.recv_into(view[received:])
+            if not count:
+                raise ConnectionError("store server closed the connection")
+            received += count
+        return buffer
+
+    def close(self) -> None:
+        self._socket.close()
+
+
+class _RemoteWriter:
+    """Streams chunks over one pinned connection; the server stages them in its backend's own writer."""
+
+    def __init__(self, store: RemoteStore) -> None:
+        self._store = store
+        self._connection: _Connection | None = None
+
+    def write(self, chunk: str) -> None:
+        if not chunk:
+            return
+        if self._connection is None:
+            self._connection = self._store._acquire()
+        self._call(OP_WRITE_CHUNK, None, encode_text(chunk))
+
+    def commit(self, resource_id: str) -> None:
+        if self._connection is None:
+            # Nothing was written: an empty value.
+            if resource_id not in self._store:
+                self._store.put(resource_id, "")
+            return
+        self._call(OP_WRITE_COMMIT, [resource_id])
+        self._finish(reuse=True)
+
+    def abort(self) -> None:
+        if self._connection is None:
+            return
+        try:
+            self._call(OP_WRITE_ABORT)
+        except (ConnectionError, RuntimeError):
+            # _call has already released the connection.
+            return
+        self._finish(reuse=True)
+
+    def _call(self, opcode: int, meta: object = None, body: bytes = b"") -> None:
+        assert self._connection is not None
+        try:
+            status, result, _ = self._connection.request(opcode, meta, body)
+        except (OSError, ValueError) as exc:
+            self._finish(reuse=False)
+            raise ConnectionError(f"store server request failed: {exc}") from exc
+        if status != STATUS_ERROR:
+            return
+        if opcode == OP_WRITE_ABORT:
+            self._finish(reuse=False)
+        else:
+            # Drop the server-side writer as well, so the pinned connection goes back to the pool clean.
+            self.abort()
+        raise RuntimeError(f"store server error: {result}")
+
+    def _finish(self, *, reuse: bool) -> None:
+        connection, self._connection = self._connection, None
+        if connection is not None:
+            self._store._release(connection, reuse=reuse)
+
+
+class RemoteStore:
+    """Client of a `StoreServer`, so several relay processes (or hosts) resolve the same references.
+
+    Connections are pooled (up to `pool_size`; extra callers wait up to `timeout` seconds for a free one) and
+    each carries one request at a time.
+    Slices, line reads and grep run on the server, so only the requested range crosses the wire.
+    `close` only releases the connections; `clear` and `delete` act on the shared server store.
+    """
+
+    def __init__(
+        self,
+        address: str | tuple[str, int],
+        *,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        timeout: float = DEFAULT_TIMEOUT,
+    ) -> None:
+        if pool_size < 1:
+            raise ValueError("pool_size must be positive")
+        self._address = parse_address(address) if isinstance(address, str) else address
+        self._timeout = timeout
+        self._idle: queue.LifoQueue[_Connection] = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(pool_size)
+        self._closed = False
+
+    def _acquire(self) -> _Connection:
+        if not self._slots.acquire(timeout=self._timeout):
+            raise ConnectionError(f"no connection to store server {self._address!r} became free in {self._timeout}s")
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            return _Connection(self._address, self._timeout)
+        except OSError as exc:
+            self._slots.release()
+            raise ConnectionError(f"cannot connect to store server {self._address!r}: {exc}") from exc
+
+    def _release(self, connection: _Connection, *, reuse: bool) -> None:
+        if reuse and not self._closed:
+            self._idle.put(connection)
+        else:
+            connection.close()
+        self._slots.release()
+
+    def _request(
+        self,
+        opcode: int,
+        meta: object = None,
+        body: bytes | memoryview = b"",
+    ) -> tuple[int, object, bytearray]:
+        connection = self._acquire()
+        try:
+            status, result, data = connection.request(opcode, meta, body)
+        except (OSError, ValueError) as exc:
+            # A broken or desynchronized connection is never reused.
+            self._release(connection, reuse=False)
+            raise ConnectionError(f"store server request failed: {exc}") from exc
+        self._release(connection, reuse=True)
+        if status == STATUS_ERROR:
+            raise RuntimeError(f"store server error: {result}")
+        return status, result, data
+
+    def __contains__(self, resource_id: str) -> bool:
+        return bool(self._request(OP_CONTAINS, [resource_id])[1])
+
+    def put(self, resource_id: str, value: str) -> None:
+        self._request(OP_PUT, [resource_id], encode_text(value))
+
+    def get(self, resource_id: str) -> str | None:
+        status, _, data = self._request(OP_GET, [resource_id])
+        return None if status == STATUS_MISSING else decode_text(data)
+
+    def length(self, resource_id: str) -> int | None:
+        return self._request(OP_LENGTH, [resource_id])[1]
+
+    def read_slice(self, resource_id: str, start: int, end: int) -> str | None:
+        status, _, data = self._request(OP_READ_SLICE, [resource_id, start, end])
+        return None if status == STATUS_MISSING else decode_text(data)
+
+    def line_count(self, resource_id: str) -> int | None:
+        return self._request(OP_LINE_COUNT, [resource_id])[1]
+
+    def read_lines(self, resource_id: str, start: int, end: int) -> list[str] | None:
+        return self._request(OP_READ_LINES, [resource_id, start, end])[1]
+
+    def search_lines(self, resource_id: str, pattern: re.Pattern[str]) -> list[int] | None:
+        return self._request(OP_SEARCH_LINES, [resource_id, pattern.pattern, pattern.flags])[1]
+
+    def delete(self, resource_id: str) -> bool:
+        return bool(self._request(OP_DELETE, [resource_id])[1])
+
+    def clear(self) -> None:
+        self._request(OP_CLEAR)
+
+    def resource_ids(self) -> list[str]:
+        return self._request(OP_RESOURCE_IDS)[1]
+
+    def put_binary(self, resource_id: str, payload: BinaryPayload) -> None:
+        self._request(OP_PUT_BINARY, [resource_id, payload.mime_type], memoryview(payload.data).cast("B"))
+
+    def get_binary(self, resource_id: str) -> BinaryPayload | None:
+        status, mime_type, data = self._request(OP_GET_BINARY, [resource_id])
+        return None if status == STATUS_MISSING else BinaryPayload(bytes(data), mime_type)
+
+    def open_writer(self) -> _RemoteWriter:
+        return _RemoteWriter(self)
+
+    def stats(self) -> StoreStats:
+        return StoreStats(**self._request(OP_STATS)[1])
+
+    def record_producer(self, resource_id: str, tool: str) -> None:
+        self._request(OP_RECORD_PRODUCER, [resource_id, tool])
+
+    def report(self) -> StoreReport:
+        """Accounting report of the server's store (servers started by `tool-context-relay-store` keep one)."""
+        return StoreReport.from_dict(self._request(OP_REPORT)[1])
+
+    def close(self) -> None:
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
@@ -0,0 +1,324 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import re
+import threading
+from collections.abc import Callable
+from dataclasses import asdict
+
+from tool_context_relay.store.base import ResourceStore
+from tool_context_relay.store.binary import BinaryPayload, get_binary, put_binary
+from tool_context_relay.store.remote import (
+    FRAME_HEADER,
+    OP_CLEAR,
+    OP_CONTAINS,
+    OP_DELETE,
+    OP_GET,
+    OP_GET_BINARY,
+    OP_LENGTH,
+    OP_LINE_COUNT,
+    OP_PUT,
+    OP_PUT_BINARY,
+    OP_READ_LINES,
+    OP_READ_SLICE,
+    OP_RECORD_PRODUCER,
+    OP_REPORT,
+    OP_RESOURCE_IDS,
+    OP_SEARCH_LINES,
+    OP_STATS,
+    OP_WRITE_ABORT,
+    OP_WRITE_CHUNK,
+    OP_WRITE_COMMIT,
+    STATUS_ERROR,
+    STATUS_MISSING,
+    STATUS_OK,
+    check_frame_length,
+    decode_meta,
+    decode_text,
+    encode_frame,
+    encode_text,
+    parse_address,
+)
+from tool_context_relay.store.writer import StoreWriter, open_writer
+
+_Response = tuple[int, object, bytes | memoryview]
+
+
+class _Session:
+    """Request dispatch for one client connection (which owns at most one streaming writer)."""
+
+    def __init__(self, store: ResourceStore) -> None:
+        self._store = store
+        self._writer: StoreWriter | None = None
+        self._handlers: dict[int, Callable[[list, bytes], _Response]] = {
+            OP_CONTAINS: lambda args, _: (STATUS_OK, args[0] in self._store, b""),
+            OP_PUT: self._put,
+            OP_GET: lambda args, _: _text(self._store.get(args[0])),
+            OP_LENGTH: lambda args, _: _number(self._store.length(args[0])),
+            OP_READ_SLICE: lambda args, _: _text(self._store.read_slice(*args)),
+            OP_LINE_COUNT: lambda args, _: _number(self._store.line_count(args[0])),
+            OP_READ_LINES: lambda args, _: _number(self._store.read_lines(*args)),
+            OP_SEARCH_LINES: self._search_lines,
+            OP_DELETE: lambda args, _: (STATUS_OK, self._store.delete(args[0]), b""),
+            OP_CLEAR: self._clear,
+            OP_STATS: lambda args, _: (STATUS_OK, asdict(self._store.stats()), b""),
+            OP_PUT_BINARY: self._put_binary,
+            OP_GET_BINARY: self._get_binary,
+            OP_RESOURCE_IDS: self._resource_ids,
+            OP_WRITE_CHUNK: self._write_chunk,
+            OP_WRITE_COMMIT: self._write_commit,
+            OP_WRITE_ABORT: self._write_abort,
+            OP_RECORD_PRODUCER: self._record_producer,
+            OP_REPORT: self._report,
+        }
+
+    def dispatch(self, opcode: int, meta: object, body: bytes) -> _Response:
+        handler = self._handlers.get(opcode)
+        if handler is None:
+            return STATUS_ERROR, f"unknown opcode {opcode}", b""
+        try:
+            return handler(meta or [], body)
+        except Exception as exc:
+            return STATUS_ERROR, f"{type(exc).__name__}: {exc}", b""
+
+    def _put(self, args: list, body: bytes) -> _Response:
+        self._store.put(args[0], decode_text(body))
+        return STATUS_OK, None, b""
+
+    def _search_lines(self, args: list, _: bytes) -> _Response:
+        resource_id, pattern, flags = args
+        return _number(self._store.search_lines(resource_id, re.compile(pattern, flags)))
+
+    def _clear(self, args: list, _: bytes) -> _Response:
+        self._store.clear()
+        return STATUS_OK, None, b""
+
+    def _put_binary(self, args: list, body: bytes) -> _Response:
+        resource_id, mime_type = args
+        put_binary(self._store, resource_id, BinaryPayload(bytes(body), mime_type))
+        return STATUS_OK, None, b""
+
+    def _get_binary(self, args: list, _: bytes) -> _Response:
+        payload = get_binary(self._store, args[0])
+        if payload is None:
+            return STATUS_MISSING, None, b""
+        return STATUS_OK, payload.mime_type, memoryview(payload.data).cast("B")
+
+    def _resource_ids(self, args: list, _: bytes) -> _Response:
+        resource_ids = getattr(self._store, "resource_ids", None)
+        if resource_ids is None:
+            return STATUS_ERROR, "the served store cannot list its resources", b""
+        return STATUS_OK, list(resource_ids()), b""
+
+    def _record_producer(self, args: list, _: bytes) -> _Response:
+        record_producer = getattr(self._store, "record_producer", None)
+        if record_producer is not None:
+            record_producer(*args)
+        return STATUS_OK, None, b""
+
+    def _report(self, args: list, _: bytes) -> _Response:
+        report = getattr(self._store, "report", None)
+        if report is None:
+            return STATUS_ERROR, "the served store keeps no accounting", b""
+        return STATUS_OK, asdict(report()), b""
+
+    def _write_chunk(self, args: list, body: bytes) -> _Response:
+        if self._writer is None:
+            self._writer = open_writer(self._store)
+        self._writer.write(decode_text(body))
+        return STATUS_OK, None, b""
+
+    def _write_commit(self, args: list, _: bytes) -> _Response:
+        writer, self._writer = self._writer, None
+        if writer is None:
+            return STATUS_ERROR, "no value is being written", b""
+        try:
+            writer.commit(args[0])
+        except BaseException:
+            writer.abort()
+            raise
+        return STATUS_OK, None, b""
+
+    def _write_abort(self, args: list, _: bytes) -> _Response:
+        self.abort()
+        return STATUS_OK, None, b""
+
+    def abort(self) -> None:
+        writer, self._writer = self._writer, None
+        if writer is not None:
+            writer.abort()
+
+
+def _text(value: str | None) -> _Response:
+    if value is None:
+        return STATUS_MISSING, None, b""
+    return STATUS_OK, None, encode_text(value)
+
+
+def _number(value: object) -> _Response:
+    if value is None:
+        return STATUS_MISSING, None, b""
+    return STATUS_OK, value, b""
+
+
+class StoreServer:
+    """Serve one `ResourceStore` to `RemoteStore` clients over TCP (`HOST:PORT`) or a Unix socket (a path).
+
+    Every request runs in a worker thread, so a slow disk read or grep never stalls other connections.
+    """
+
+    def __init__(self, store: ResourceStore, address: str) -> None:
+        self._store = store
+        self._address = parse_address(address)
+        self._server: asyncio.Server | None = None
+        self._connections: dict[asyncio.StreamWriter, asyncio.Task[None]] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def address(self) -> str:
+        """The bound address (with the actual port when started on port 0)."""
+        if isinstance(self._address, str):
+            return self._address
+        if self._server is None:
+            host, port = self._address
+        else:
+            host, port = self._server.sockets[0].getsockname()[:2]
+        return f"[{host}]:{port}" if ":" in host else f"{host}:{port}"
+
+    async def start(self) -> None:
+        if isinstance(self._address, str):
+            self._server = await asyncio.start_unix_server(self._handle, path=self._address)
+        else:
+            host, port = self._address
+            self._server = await asyncio.start_server(self._handle, host, port)
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        assert self._server is not None
+        await self._server.serve_forever()
+
+    async def aclose(self) -> None:
+        if self._server is None:
+            return
+        self._server.close()
+        handlers = list(self._connections.values())
+        for connection in list(self._connections):
+            connection.close()
+        await asyncio.gather(*handlers, return_exceptions=True)
+        await self._server.wait_closed()
+        self._server = None
+        if isinstance(self._address, str) and os.path.exists(self._address):
+            os.unlink(self._address)
+
+    def start_in_thread(self) -> None:
+        """Run the server on its own event loop in a daemon thread (returns once it is listening)."""
+        started = threading.Event()
+        failure: list[BaseException] = []
+
+        def run() -> None:
+            loop = asyncio.new_event_loop()
+            self._loop = loop
+            try:
+                loop.run_until_complete(self.start())
+            except BaseException as exc:
+                failure.append(exc)
+                started.set()
+                loop.close()
+                return
+            started.set()
+            loop.run_forever()
+            loop.close()
+
+        self._thread = threading.Thread(target=run, name="store-server", daemon=True)
+        self._thread.start()
+        started.wait()
+        if failure:
+            raise failure[0]
+
+    def stop(self) -> None:
+        """Stop a server started with `start_in_thread`."""
+        if self._loop is None or self._thread is None:
+            return
+        asyncio.run_coroutine_threadsafe(self.aclose(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop = self._thread = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        session = _Session(self._store)
+        task = asyncio.current_task()
+        assert task is not None
+        self._connections[writer] = task
+        try:
+            while True:
+                try:
+                    opcode, meta_length, body_length = FRAME_HEADER.unpack(
+                        await reader.readexactly(FRAME_HEADER.size)
+                    )
+                    try:
+                        check_frame_length(meta_length, body_length)
+                    except ValueError as exc:
+                        # The rest of the frame is never read, so the connection cannot be resynchronized.
+                        writer.writelines(part for part in encode_frame(STATUS_ERROR, str(exc)) if part)
+                        await writer.drain()
+                        return
+                    meta = decode_meta(await reader.readexactly(meta_length))
+                    body = await reader.readexactly(body_length)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    return
+                status, result, data = await asyncio.to_thread(session.dispatch, opcode, meta, body)
+                try:
+                    check_frame_length(0, len(data))
+                except ValueError as exc:
+                    status, result, data = STATUS_ERROR, str(exc), b""
+                writer.writelines(part for part in encode_frame(status, result, data) if part)
+                await writer.drain()
+        except ConnectionError:
+            return
+        finally:
+            self._connections.pop(writer, None)
+            # A client that disconnects mid-stream leaves nothing behind.
+            await asyncio.to_thread(session.abort)
+            writer.close()
+
+
+def main(argv: list[str] | None = None) -> int:
+    from tool_context_relay.store.config import StoreConfig, create_store
+
+    parser = argparse.ArgumentParser(
+        prog="tool-context-relay-store",
+        description="Serve a resource store to relay processes (`--store remote --store-path ADDRESS`).",
+    )
+    parser.add_argument("address", help="HOST:PORT to listen on, or a Unix socket path.")
+    parser.add_argument("--store", default="memory", choices=["memory", "disk", "tiered", "sqlite"])
+    parser.add_argument("--store-path", default=None, metavar="PATH")
+    args = parser.parse_args(argv)
+    if args.store == "sqlite" and not args.store_path:
+        parser.error("--store sqlite requires --store-path")
+
+    store = create_store(StoreConfig(kind=args.store, path=args.store_path, accounting=True))
+    server = StoreServer(store, args.address)
+
+    async def serve() -> None:
+        await server.start()
+        print(f"Serving {args.store} store on {server.address}", flush=True)
+        try:
+            await server.serve_forever()
+        finally:
+            await server.aclose()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,340 @@
+from __future__ import annotations
+
+import hashlib
+import re
+import secrets
+import struct
+import threading
+from array import array
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+
+from tool_context_relay.store.base import StoreStats
+from tool_context_relay.store.binary import BinaryPayload, base64_length, base64_slice
+from tool_context_relay.store.lines import indexed_lines, line_offsets
+
+DEFAULT_OFFSET_STRIDE = 4096
+
+# Segment header: magic, flags, char length, byte length, offset stride, number of offsets, MIME type length.
+# It is followed by the MIME type, the sampled byte offsets (`Q` each) and the payload.
+_HEADER = struct.Struct("<4sBQQIIH")
+_MAGIC = b"TCR1"
+# Written over the magic before a segment is unlinked, so attached readers drop their stale mapping.
+_DEAD = b"DEAD"
+_ASCII = 1
+_BINARY = 2
+_NAME_PREFIX = "tcr"
+
+
+@dataclass
+class _Segment:
+    shm: shared_memory.SharedMemory
+    char_length: int
+    byte_length: int
+    payload_start: int
+    # Byte offset of every `stride`-th character; None when offsets are identity (ASCII text, binary).
+    offsets: array | None
+    stride: int
+    mime_type: str | None
+    line_offsets: array | None = field(default=None)
+
+    @property
+    def alive(self) -> bool:
+        return bytes(self.shm.buf[: len(_MAGIC)]) == _MAGIC
+
+    def view(self, start: int = 0, end: int | None = None) -> memoryview:
+        end = self.byte_length if end is None else end
+        return self.shm.buf[self.payload_start + start : self.payload_start + end]
+
+
+def _segment_name(namespace: str, resource_id: str) -> str:
+    # Short, fixed-length names: some platforms cap shared memory names at 31 characters.
+    digest = hashlib.blake2b(resource_id.encode("utf-8"), digest_size=8).hexdigest()
+    return f"{_NAME_PREFIX}{namespace}{digest}"
+
+
+def _encode(value: str, stride: int) -> tuple[list[bytes], array | None]:
+    """Encode `value` stride by stride, sampling the byte offset of every `stride`-th character."""
+    if value.isascii():
+        return [value.encode("ascii")], None
+    pieces: list[bytes] = []
+    offsets = array("Q")
+    position = 0
+    for index in range(0, len(value), stride):
+        offsets.append(position)
+        piece = value[index : index + stride].encode("utf-8")
+        pieces.append(piece)
+        position += len(piece)
+    return pieces, offsets
+
+
+def _create_segment(
+    name: str,
+    pieces: list[bytes],
+    *,
+    char_length: int,
+    offsets: array | None,
+    stride: int,
+    mime_type: str | None,
+) -> _Segment:
+    mime = (mime_type or "").encode("utf-8")
+    byte_length = sum(len(piece) for piece in pieces)
+    offset_bytes = offsets.tobytes() if offsets is not None else b""
+    payload_start = _HEADER.size + len(mime) + len(offset_bytes)
+    flags = _BINARY if mime_type is not None else (_ASCII if offsets is None else 0)
+    shm = shared_memory.SharedMemory(name=name, create=True, size=max(payload_start + byte_length, 1))
+    buf = shm.buf
+    _HEADER.pack_into(buf, 0, _MAGIC, flags, char_length, byte_length, stride, len(offsets or ()), len(mime))
+    buf[_HEADER.size : _HEADER.size + len(mime)] = mime
+    buf[_HEADER.size + len(mime) : payload_start] = offset_bytes
+    position = payload_start
+    for piece in pieces:
+        buf[position : position + len(piece)] = piece
+        position += len(piece)
+    return _Segment(shm, char_length, byte_length, payload_start, offsets, stride, mime_type)
+
+
+def _attach_segment(name: str) -> _Segment | None:
+    try:
+        # Readers must not register the segment with the resource tracker, or it would be unlinked on their exit.
+        shm = shared_memory.SharedMemory(name=name, track=False)
+    except FileNotFoundError:
+        return None
+    magic, flags, char_length, byte_length, stride, offset_count, mime_length = _HEADER.unpack_from(shm.buf, 0)
+    if magic != _MAGIC:
+        shm.close()
+        return None
+    position = _HEADER.size
+    mime_type = bytes(shm.buf[position : position + mime_length]).decode("utf-8") if flags & _BINARY else None
+    position += mime_length
+    offsets = None
+    if offset_count:
+        offsets = array("Q")
+        offsets.frombytes(shm.buf[position : position + offset_count * offsets.itemsize])
+        position += offset_count * offsets.itemsize
+    return _Segment(shm, char_length, byte_length, position, offsets, stride, mime_type)
+
+
+class SharedMemoryStore:
+    """Store that keeps every value in its own `multiprocessing.shared_memory` segment.
+
+    Segment names are derived from the store namespace and the resource id, and each segment starts
+    with a small header (lengths, sampled byte offsets, MIME type), so a worker process that knows
+    the namespace (`SharedMemoryStore.attach(store.namespace)`) finds a value from its
+    `internal://` id alone and reads it in place: slices and lines decode only the bytes they
+    cover, and nothing is pickled across the process boundary. Attached stores are read-only;
+    the owning store unlinks its segments on `delete`, `clear` and `close`.
+    """
+
+    def __init__(self, *, namespace: str | None = None, offset_stride: int = DEFAULT_OFFSET_STRIDE) -> None:
+        if offset_stride <= 0:
+            raise ValueError("offset_stride must be a positive integer")
+        self._namespace = namespace or secrets.token_hex(4)
+        self._stride = offset_stride
+        self._owner = True
+        self._segments: dict[str, _Segment] = {}
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def attach(cls, namespace: str) -> SharedMemoryStore:
+        """Open a read-only view of the store with this namespace (typically from a pool worker)."""
+        store = cls(namespace=namespace)
+        store._owner = False
+        return store
+
+    @property
+    def namespace(self) -> str:
+        return self._namespace
+
+    def __contains__(self, resource_id: str) -> bool:
+        return self._segment(resource_id, count=False) is not None
+
+    def put(self, resource_id: str, value: str) -> None:
+        pieces, offsets = _encode(value, self._stride)
+        self._store(resource_id, pieces, char_length=len(value), offsets=offsets, mime_type=None)
+
+    def put_binary(self, resource_id: str, payload: BinaryPayload) -> None:
+        self._store(
+            resource_id,
+            [bytes(payload.data)],
+            char_length=base64_length(payload.size),
+            offsets=None,
+            mime_type=payload.mime_type,
+        )
+
+    def get_binary(self, resource_id: str) -> BinaryPayload | None:
+        segment = self._segment(resource_id)
+        if segment is None or segment.mime_type is None:
+            return None
+        with segment.view() as view:
+            return BinaryPayload(bytes(view), segment.mime_type)
+
+    def get(self, resource_id: str) -> str | None:
+        segment = self._segment(resource_id)
+        if segment is None:
+            return None
+        if segment.mime_type is not None:
+            with segment.view() as view:
+                return base64_slice(view, 0, segment.char_length)
+        with segment.view() as view:
+            return str(view, "utf-8")
+
+    def length(self, resource_id: str) -> int | None:
+        segment = self._segment(resource_id)
+        return None if segment is None else segment.char_length
+
+    def read_slice(self, resource_id: str, start: int, end: int) -> str | None:
+        segment = self._segment(resource_id)
+        if segment is None:
+            return None
+        end = min(end, segment.char_length)
+        if end <= start:
+            return ""
+        if segment.mime_type is not None:
+            with segment.view() as view:
+                return base64_slice(view, start, end)
+        if segment.offsets is None:
+            with segment.view(start, end) as view:
+                return str(view, "utf-8")
+        first_block = start // segment.stride
+        last_block = -(-end // segment.stride)
+        byte_start = segment.offsets[first_block]
+        byte_end = segment.offsets[last_block] if last_block < len(segment.offsets) else segment.byte_length
+        with segment.view(byte_start, byte_end) as view:
+            chunk = str(view, "utf-8")
+        block_base = first_block * segment.stride
+        return chunk[start - block_base : end - block_base]
+
+    def line_count(self, resource_id: str) -> int | None:
+        segment = self._segment(resource_id)
+        if segment is None:
+            return None
+        if segment.mime_type is not None:
+            return 1 if segment.byte_length else 0
+        return len(self._line_index(segment)) - 1
+
+    def read_lines(self, resource_id: str, start: int, end: int) -> list[str] | None:
+        segment = self._segment(resource_id)
+        if segment is None:
+            return None
+        if segment.mime_type is not None:
+            return [self.get(resource_id)][start:end] if segment.byte_length else []
+        offsets = self._line_index(segment)
+        with segment.view() as view:
+            return indexed_lines(view, offsets, start, end)
+
+    def search_lines(self, resource_id: str, pattern: re.Pattern[str]) -> list[int] | None:
+        segment = self._segment(resource_id)
+        if segment is None:
+            return None
+        if segment.mime_type is not None:
+            return [0] if segment.byte_length and pattern.search(self.get(resource_id)) else []
+        offsets = self._line_index(segment)
+        with segment.view() as view:
+            return [
+                line_no
+                for line_no in range(len(offsets) - 1)
+                if pattern.search(indexed_lines(view, offsets, line_no, line_no + 1)[0])
+            ]
+
+    def resource_ids(self) -> list[str]:
+        with self._lock:
+            return list(self._segments)
+
+    def delete(self, resource_id: str) -> bool:
+        self._require_owner()
+        with self._lock:
+            segment = self._segments.pop(resource_id, None)
+        if segment is None:
+            return False
+        self._release(segment)
+        return True
+
+    def clear(self) -> None:
+        with self._lock:
+            segments = list(self._segments.values())
+            self._segments.clear()
+        for segment in segments:
+            if self._owner:
+                self._release(segment)
+            else:
+                segment.shm.close()
+
+    def close(self) -> None:
+        self.clear()
+
+    def stats(self) -> StoreStats:
+        with self._lock:
+            return StoreStats(
+                entries=len(self._segments),
+                total_bytes=sum(segment.shm.size for segment in self._segments.values()),
+                max_bytes=None,
+                hits=self._hits,
+                misses=self._misses,
+                evictions=0,
+                index_bytes=sum(
+                    segment.line_offsets.itemsize * len(segment.line_offsets)
+                    for segment in self._segments.values()
+                    if segment.line_offsets is not None
+                ),
+            )
+
+    def _store(
+        self,
+        resource_id: str,
+        pieces: list[bytes],
+        *,
+        char_length: int,
+        offsets: array | None,
+        mime_type: str | None,
+    ) -> None:
+        self._require_owner()
+        with self._lock:
+            previous = self._segments.pop(resource_id, None)
+            if previous is not None:
+                self._release(previous)
+            self._segments[resource_id] = _create_segment(
+                _segment_name(self._namespace, resource_id),
+                pieces,
+                char_length=char_length,
+                offsets=offsets,
+                stride=self._stride,
+                mime_type=mime_type,
+            )
+
+    def _segment(self, resource_id: str, *, count: bool = True) -> _Segment | None:
+        with self._lock:
+            segment = self._segments.get(resource_id)
+            if segment is not None and not self._owner and not segment.alive:
+                # The owner replaced or deleted the value since we attached.
+                del self._segments[resource_id]
+                segment.shm.close()
+                segment = None
+            if segment is None and not self._owner:
+                segment = _attach_segment(_segment_name(self._namespace, resource_id))
+                if segment is not None:
+                    self._segments[resource_id] = segment
+            if count:
+                if segment is None:
+                    self._misses += 1
+                else:
+                    self._hits += 1
+            return segment
+
+    def _line_index(self, segment: _Segment) -> array:
+        if segment.line_offsets is None:
+            with segment.view() as view:
+                segment.line_offsets = line_offsets(view)
+        return segment.line_offsets
+
+    def _require_owner(self) -> None:
+        if not self._owner:
+            raise PermissionError("attached SharedMemoryStore is read-only")
+
+    @staticmethod
+    def _release(segment: _Segment) -> None:
+        segment.shm.buf[: len(_DEAD)] = _DEAD
+        segment.shm.close()
+        segment.shm.unlink()
@@ -0,0 +1,419 @@
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import re
+import struct
+import threading
+import time
+from array import array
+from collections.abc import Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO
+
+from tool_context_relay.store import binary
+from tool_context_relay.store.base import ResourceStore, StoreStats
+from tool_context_relay.store.binary import BinaryPayload, base64_length, base64_slice
+from tool_context_relay.store.lines import LINE_BREAK_BYTES, indexed_lines
+from tool_context_relay.store.writer import StoreWriter, open_writer
+
+DEFAULT_OFFSET_STRIDE = 4096
+_READ_CHUNK_CHARS = 256 * DEFAULT_OFFSET_STRIDE
+
+# File layout: header (magic, index offset, index length), the payloads with their offset arrays, then a
+# JSON index of the entries. Payloads are UTF-8 (raw bytes for binary values); offset arrays are `Q` items.
+_HEADER = struct.Struct("<8sQQ")
+_MAGIC = b"TCRSNAP1"
+
+
+@dataclass(frozen=True)
+class _SnapshotEntry:
+    offset: int
+    byte_length: int
+    char_length: int
+    mime_type: str | None
+    # (file position, item count) of the sampled character offsets (None for ASCII and binary values).
+    char_offsets: tuple[int, int] | None
+    # (file position, item count) of the line index; None for binary values.
+    line_offsets: tuple[int, int] | None
+    # TTL (seconds) and wall-clock deadline of references that expire; restored by `ExpiringStore.restore_ttls`.
+    ttl: float | None = None
+    expires_at: float | None = None
+
+
+def write_snapshot(store: ResourceStore, path: str | Path, *, offset_stride: int = DEFAULT_OFFSET_STRIDE) -> int:
+    """Serialize every value of `store` (with its slice and line indexes) to `path`; return the entry count.
+
+    The store must be able to enumerate its values (`resource_ids()`). Values are read in bounded
+    slices, and the file is replaced atomically, so a snapshot can be taken while the relay runs.
+    When the store expires references (`expiry()`), each entry keeps its TTL and deadline and
+    references that have already expired are left out.
+    """
+    list_ids = getattr(store, "resource_ids", None)
+    if list_ids is None:
+        raise TypeError(f"{type(store).__name__} cannot enumerate its resources")
+    if offset_stride <= 0 or _READ_CHUNK_CHARS % offset_stride:
+        raise ValueError("offset_stride must be a positive divisor of the read chunk size")
+    path = Path(path)
+    partial = path.with_name(f".{path.name}.partial")
+    expiry = getattr(store, "expiry", None)
+    index: dict[str, dict[str, object]] = {}
+    try:
+        with partial.open("wb") as fh:
+            fh.write(_HEADER.pack(_MAGIC, 0, 0))
+            for resource_id in list_ids():
+                # Taken before the value is read, since reads refresh the TTL.
+                remaining = expiry(resource_id) if expiry is not None else None
+                if remaining is not None and remaining[1] <= 0:
+                    continue
+                start = fh.tell()
+                entry = _write_entry(fh, store, resource_id, offset_stride)
+                if entry is None:
+                    # Removed while we were writing: drop the partial payload.
+                    fh.seek(start)
+                    fh.truncate()
+                    continue
+                if remaining is not None:
+                    ttl, left = remaining
+                    entry["ttl"] = ttl
+                    entry["expires"] = time.time() + left
+                index[resource_id] = entry
+            index_offset = fh.tell()
+            data = json.dumps({"stride": offset_stride, "entries": index}, separators=(",", ":")).encode("utf-8")
+            fh.write(data)
+            fh.seek(0)
+            fh.write(_HEADER.pack(_MAGIC, index_offset, len(data)))
+        os.replace(partial, path)
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
+    return len(index)
+
+
+def _write_entry(fh: BinaryIO, store: ResourceStore, resource_id: str, stride: int) -> dict[str, object] | None:
+    offset = fh.tell()
+    payload = binary.get_binary(store, resource_id)
+    if payload is not None:
+        fh.write(payload.data)
+        return {
+            "offset": offset,
+            "bytes": payload.size,
+            "chars": base64_length(payload.size),
+            "mime": payload.mime_type,
+        }
+    char_length = store.length(resource_id)
+    if char_length is None:
+        return None
+    char_offsets = array("Q")
+    line_offsets = array("Q", [0])
+    is_ascii = True
+    position = 0
+    after_cr = False
+    for chunk_start in range(0, char_length, _READ_CHUNK_CHARS):
+        chunk = store.read_slice(resource_id, chunk_start, min(chunk_start + _READ_CHUNK_CHARS, char_length))
+        if chunk is None:
+            return None
+        is_ascii = is_ascii and chunk.isascii()
+        for index in range(0, len(chunk), stride):
+            data = chunk[index : index + stride].encode("utf-8")
+            char_offsets.append(position)
+            matches = LINE_BREAK_BYTES.finditer(data)
+            if after_cr and data.startswith(b"\n"):
+                # "\r" + "\n" split across pieces is a single line break.
+                line_offsets[-1] += 1
+                next(matches)
+            line_offsets.extend(position + match.end() for match in matches)
+            after_cr = data.endswith(b"\r")
+            fh.write(data)
+            position += len(data)
+    if line_offsets[-1] != position:
+        line_offsets.append(position)
+    entry: dict[str, object] = {"offset": offset, "bytes": position, "chars": char_length}
+    if not is_ascii:
+        entry["char_offsets"] = [fh.tell(), len(char_offsets)]
+        char_offsets.tofile(fh)
+    entry["line_offsets"] = [fh.tell(), len(line_offsets)]
+    line_offsets.tofile(fh)
+    return entry
+
+
+class SnapshotStore:
+    """Read-only store over a snapshot file written by `write_snapshot`.
+
+    Opening a snapshot only maps the file and parses its index; payload pages and offset arrays are
+    faulted in when a value is first read, so a restart restores every reference in near-constant time.
+    Entries whose deadline passed while the relay was down are not restored. `delete` hides an entry;
+    the file itself is never modified.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self._path = Path(path)
+        with self._path.open("rb") as fh:
+            self._map = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < _HEADER.size or self._map[: len(_MAGIC)] != _MAGIC:
+            self._map.close()
+            raise ValueError(f"{self._path} is not a resource store snapshot")
+        _, index_offset, index_length = _HEADER.unpack_from(self._map, 0)
+        index = json.loads(self._map[index_offset : index_offset + index_length])
+        self._stride: int = index["stride"]
+        now = time.time()
+        self._entries = {
+            resource_id: _SnapshotEntry(
+                offset=entry["offset"],
+                byte_length=entry["bytes"],
+                char_length=entry["chars"],
+                mime_type=entry.get("mime"),
+                char_offsets=tuple(entry["char_offsets"]) if "char_offsets" in entry else None,
+                line_offsets=tuple(entry["line_offsets"]) if "line_offsets" in entry else None,
+                ttl=entry.get("ttl"),
+                expires_at=entry.get("expires"),
+            )
+            for resource_id, entry in index["entries"].items()
+            if entry.get("expires", now + 1) > now
+        }
+        self._arrays: dict[tuple[int, int], array] = {}
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def __contains__(self, resource_id: str) -> bool:
+        with self._lock:
+            return resource_id in self._entries
+
+    def get_binary(self, resource_id: str) -> BinaryPayload | None:
+        entry = self._lookup(resource_id)
+        if entry is None or entry.mime_type is None:
+            return None
+        return BinaryPayload(self._map[entry.offset : entry.offset + entry.byte_length], entry.mime_type)
+
+    def get(self, resource_id: str) -> str | None:
+        entry = self._lookup(resource_id)
+        if entry is None:
+            return None
+        return self._read(entry, 0, entry.char_length)
+
+    def length(self, resource_id: str) -> int | None:
+        entry = self._lookup(resource_id)
+        return None if entry is None else entry.char_length
+
+    def read_slice(self, resource_id: str, start: int, end: int) -> str | None:
+        entry = self._lookup(resource_id)
+        if entry is None:
+            return None
+        return self._read(entry, start, min(end, entry.char_length))
+
+    def line_count(self, resource_id: str) -> int | None:
+        entry = self._lookup(resource_id)
+        if entry is None:
+            return None
+        if entry.line_offsets is None:
+            return 1 if entry.byte_length else 0
+        return entry.line_offsets[1] - 1
+
+    def read_lines(self, resource_id: str, start: int, end: int) -> list[str] | None:
+        entry = self._lookup(resource_id)
+        if entry is None:
+            return None
+        if entry.line_offsets is None:
+            return [self._read(entry, 0, entry.char_length)][start:end] if entry.byte_length else []
+        with self._payload(entry) as payload:
+            return indexed_lines(payload, self._array(entry.line_offsets), start, end)
+
+    def search_lines(self, resource_id: str, pattern: re.Pattern[str]) -> list[int] | None:
+        entry = self._lookup(resource_id)
+        if entry is None:
+            return None
+        if entry.line_offsets is None:
+            return [0] if entry.byte_length and pattern.search(self._read(entry, 0, entry.char_length)) else []
+        offsets = self._array(entry.line_offsets)
+        with self._payload(entry) as payload:
+            return [
+                line_no
+                for line_no in range(len(offsets) - 1)
+                if pattern.search(indexed_lines(payload, offsets, line_no, line_no + 1)[0])
+            ]
+
+    def resource_ids(self) -> list[str]:
+        with self._lock:
+            return list(self._entries)
+
+    def expiries(self) -> Mapping[str, tuple[float, float] | None]:
+        """Map every entry to its (TTL, seconds left), or None when it was saved without a TTL."""
+        now = time.time()
+        with self._lock:
+            return {
+                resource_id: None if entry.ttl is None else (entry.ttl, entry.expires_at - now)
+                for resource_id, entry in self._entries.items()
+            }
+
+    def delete(self, resource_id: str) -> bool:
+        with self._lock:
+            return self._entries.pop(resource_id, None) is not None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._arrays.clear()
+
+    def close(self) -> None:
+        self.clear()
+        self._map.close()
+
+    def stats(self) -> StoreStats:
+        with self._lock:
+            # Only the offset arrays loaded so far live in memory; payloads stay in the mapping.
+            index_bytes = sum(offsets.itemsize * len(offsets) for offsets in self._arrays.values())
+            return StoreStats(
+                entries=len(self._entries),
+                total_bytes=index_bytes,
+                max_bytes=None,
+                hits=self._hits,
+                misses=self._misses,
+                evictions=0,
+                disk_bytes=sum(entry.byte_length for entry in self._entries.values()),
+                index_bytes=index_bytes,
+            )
+
+    def _read(self, entry: _SnapshotEntry, start: int, end: int) -> str:
+        if end <= start:
+            return ""
+        if entry.mime_type is not None:
+            with self._payload(entry) as payload:
+                return base64_slice(payload, start, end)
+        if entry.char_offsets is None:
+            return self._map[entry.offset + start : entry.offset + end].decode("ascii")
+        char_offsets = self._array(entry.char_offsets)
+        first_block = start // self._stride
+        last_block = -(-end // self._stride)
+        byte_start = char_offsets[first_block]
+        byte_end = char_offsets[last_block] if last_block < len(char_offsets) else entry.byte_length
+        chunk = self._map[entry.offset + byte_start : entry.offset + byte_end].decode("utf-8")
+        block_base = first_block * self._stride
+        return chunk[start - block_base : end - block_base]
+
+    def _payload(self, entry: _SnapshotEntry) -> memoryview:
+        return memoryview(self._map)[entry.offset : entry.offset + entry.byte_length]
+
+    def _array(self, location: tuple[int, int]) -> array:
+        with self._lock:
+            offsets = self._arrays.get(location)
+        if offsets is None:
+            position, count = location
+            offsets = array("Q")
+            offsets.frombytes(self._map[position : position + count * offsets.itemsize])
+            with self._lock:
+                self._arrays[location] = offsets
+        return offsets
+
+    def _lookup(self, resource_id: str) -> _SnapshotEntry | None:
+        with self._lock:
+            entry = self._entries.get(resource_id)
+            if entry is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+            return entry
+
+
+class RestoredStore:
+    """Serve references from a snapshot underneath a live store after a restart.
+
+    New values go to the live store; reads fall back to the snapshot for references boxed before
+    the restart, straight from its memory map. Deleting a reference removes it from both.
+    """
+
+    def __init__(self, inner: ResourceStore, snapshot: SnapshotStore) -> None:
+        self._inner = inner
+        self._snapshot = snapshot
+
+    @property
+    def inner(self) -> ResourceStore:
+        return self._inner
+
+    @property
+    def snapshot(self) -> SnapshotStore:
+        return self._snapshot
+
+    def __contains__(self, resource_id: str) -> bool:
+        return resource_id in self._inner or resource_id in self._snapshot
+
+    def touch(self, resource_id: str) -> bool:
+        touch = getattr(self._inner, "touch", None)
+        if touch is not None and touch(resource_id):
+            return True
+        return resource_id in self
+
+    def put(self, resource_id: str, value: str) -> None:
+        self._inner.put(resource_id, value)
+        self._snapshot.delete(resource_id)
+
+    def put_binary(self, resource_id: str, payload: BinaryPayload) -> None:
+        binary.put_binary(self._inner, resource_id, payload)
+        self._snapshot.delete(resource_id)
+
+    def open_writer(self) -> StoreWriter:
+        return open_writer(self._inner)
+
+    def get_binary(self, resource_id: str) -> BinaryPayload | None:
+        return binary.get_binary(self._source(resource_id), resource_id)
+
+    def get(self, resource_id: str) -> str | None:
+        return self._source(resource_id).get(resource_id)
+
+    def length(self, resource_id: str) -> int | None:
+        return self._source(resource_id).length(resource_id)
+
+    def read_slice(self, resource_id: str, start: int, end: int) -> str | None:
+        return self._source(resource_id).read_slice(resource_id, start, end)
+
+    def line_count(self, resource_id: str) -> int | None:
+        return self._source(resource_id).line_count(resource_id)
+
+    def read_lines(self, resource_id: str, start: int, end: int) -> list[str] | None:
+        return self._source(resource_id).read_lines(resource_id, start, end)
+
+    def search_lines(self, resource_id: str, pattern: re.Pattern[str]) -> list[int] | None:
+        return self._source(resource_id).search_lines(resource_id, pattern)
+
+    def resource_ids(self) -> list[str]:
+        live = getattr(self._inner, "resource_ids", None)
+        live_ids = live() if live is not None else []
+        return list(dict.fromkeys([*live_ids, *self._snapshot.resource_ids()]))
+
+    def delete(self, resource_id: str) -> bool:
+        removed = self._snapshot.delete(resource_id)
+        return self._inner.delete(resource_id) or removed
+
+    def clear(self) -> None:
+        self._snapshot.clear()
+        self._inner.clear()
+
+    def close(self) -> None:
+        self._snapshot.close()
+        self._inner.close()
+
+    def stats(self) -> StoreStats:
+        live = self._inner.stats()
+        restored = self._snapshot.stats()
+        return StoreStats(
+            entries=live.entries + restored.entries,
+            total_bytes=live.total_bytes + restored.total_bytes,
+            max_bytes=live.max_bytes,
+            hits=live.hits + restored.hits,
+            misses=live.misses,
+            evictions=live.evictions,
+            disk_bytes=live.disk_bytes + restored.disk_bytes,
+            expirations=live.expirations,
+            index_bytes=live.index_bytes + restored.index_bytes,
+        )
+
+    def _source(self, resource_id: str) -> ResourceStore:
+        if resource_id in self._inner:
+            return self._inner
+        return self._snapshot
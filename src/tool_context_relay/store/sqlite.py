@@ -0,0 +1,328 @@
+from __future__ import annotations
+
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+from itertools import islice
+from pathlib import Path
+
+from tool_context_relay.store.base import StoreStats
+from tool_context_relay.store.lines import LineCounter, count_lines, iter_lines, search_lines
+
+DEFAULT_CHUNK_CHARS = 64 * 1024
+_CHUNKS_PER_QUERY = 8
+# Staging chunks older than this belong to a writer that died before commit or abort; see SqliteStore.__init__.
+_STAGING_GRACE_SECONDS = 3600.0
+_STAGING_PREFIX = "staging://"
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS resources (
+        resource_id TEXT PRIMARY KEY,
+        char_length INTEGER NOT NULL,
+        byte_length INTEGER NOT NULL,
+        line_count INTEGER NOT NULL,
+        chunk_chars INTEGER NOT NULL,
+        created_at REAL NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS chunks (
+        resource_id TEXT NOT NULL,
+        chunk_no INTEGER NOT NULL,
+        data BLOB NOT NULL,
+        PRIMARY KEY (resource_id, chunk_no)
+    ) WITHOUT ROWID
+    """,
+)
+
+
+class _SqliteWriter:
+    """Streaming writer that inserts full chunks under a staging key and renames them on commit.
+
+    Every chunk is its own short transaction, so a slow producer never holds the write lock.
+    """
+
+    def __init__(self, store: SqliteStore) -> None:
+        self._store = store
+        self._staging_id = f"{_staging_key(time.time())}-{uuid.uuid4().hex}"
+        self._pending: list[str] = []
+        self._pending_chars = 0
+        self._chunk_no = 0
+        self._char_length = 0
+        self._byte_length = 0
+        self._lines = LineCounter()
+
+    def write(self, chunk: str) -> None:
+        self._lines.feed(chunk)
+        self._char_length += len(chunk)
+        self._pending.append(chunk)
+        self._pending_chars += len(chunk)
+        chunk_chars = self._store._chunk_chars
+        if self._pending_chars < chunk_chars:
+            return
+        pending = "".join(self._pending)
+        full = len(pending) - len(pending) % chunk_chars
+        for index in range(0, full, chunk_chars):
+            self._insert_chunk(pending[index : index + chunk_chars])
+        rest = pending[full:]
+        self._pending = [rest] if rest else []
+        self._pending_chars = len(rest)
+
+    def commit(self, resource_id: str) -> None:
+        if self._pending:
+            self._insert_chunk("".join(self._pending))
+            self._pending = []
+        connection = self._store._connection
+        with self._store._lock:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                exists = connection.execute(
+                    "SELECT 1 FROM resources WHERE resource_id = ?", (resource_id,)
+                ).fetchone()
+                if exists is None:
+                    renamed = connection.execute(
+                        "UPDATE chunks SET resource_id = ? WHERE resource_id = ?", (resource_id, self._staging_id)
+                    )
+                    if renamed.rowcount != self._chunk_no:
+                        raise RuntimeError(f"staged chunks of {resource_id} were reclaimed before commit")
+                    connection.execute(
+                        "INSERT INTO resources VALUES (?, ?, ?, ?, ?, ?)",
+                        (
+                            resource_id,
+                            self._char_length,
+                            self._byte_length,
+                            self._lines.count,
+                            self._store._chunk_chars,
+                            time.time(),
+                        ),
+                    )
+                else:
+                    connection.execute("DELETE FROM chunks WHERE resource_id = ?", (self._staging_id,))
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+    def abort(self) -> None:
+        self._pending = []
+        with self._store._lock:
+            self._store._connection.execute("DELETE FROM chunks WHERE resource_id = ?", (self._staging_id,))
+
+    def _insert_chunk(self, text: str) -> None:
+        data = text.encode("utf-8")
+        self._byte_length += len(data)
+        with self._store._lock:
+            self._store._connection.execute(
+                "INSERT INTO chunks VALUES (?, ?, ?)", (self._staging_id, self._chunk_no, data)
+            )
+        self._chunk_no += 1
+
+
+class SqliteStore:
+    """Persistent store backed by a SQLite database in WAL mode.
+
+    Values are split into chunks of `chunk_chars` characters stored as UTF-8 BLOBs, so a
+    character slice only reads the chunks it overlaps. The database file can be opened by
+    several relay processes at once, and references survive restarts.
+    """
+
+    def __init__(self, path: str | Path, *, chunk_chars: int = DEFAULT_CHUNK_CHARS, timeout: float = 30.0) -> None:
+        if chunk_chars <= 0:
+            raise ValueError("chunk_chars must be a positive integer")
+        self._path = Path(path)
+        self._chunk_chars = chunk_chars
+        self._connection = sqlite3.connect(self._path, timeout=timeout, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        for statement in _SCHEMA:
+            self._connection.execute(statement)
+        # Another process may be streaming a value right now, so only reclaim staging chunks past the grace period.
+        self._connection.execute(
+            "DELETE FROM chunks WHERE resource_id >= ? AND resource_id < ?",
+            (_STAGING_PREFIX, _staging_key(time.time() - _STAGING_GRACE_SECONDS)),
+        )
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def __contains__(self, resource_id: str) -> bool:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT 1 FROM resources WHERE resource_id = ?", (resource_id,)
+            ).fetchone()
+        return row is not None
+
+    def put(self, resource_id: str, value: str) -> None:
+        byte_length = 0
+
+        def encoded_chunks() -> Iterator[tuple[str, int, bytes]]:
+            nonlocal byte_length
+            for chunk_no, index in enumerate(range(0, len(value), self._chunk_chars)):
+                data = value[index : index + self._chunk_chars].encode("utf-8")
+                byte_length += len(data)
+                yield resource_id, chunk_no, data
+
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                self._connection.execute("DELETE FROM chunks WHERE resource_id = ?", (resource_id,))
+                self._connection.executemany("INSERT INTO chunks VALUES (?, ?, ?)", encoded_chunks())
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO resources VALUES (?, ?, ?, ?, ?, ?)",
+                    (resource_id, len(value), byte_length, count_lines(value), self._chunk_chars, time.time()),
+                )
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+            self._connection.execute("COMMIT")
+
+    def open_writer(self) -> _SqliteWriter:
+        return _SqliteWriter(self)
+
+    def get(self, resource_id: str) -> str | None:
+        with self._read_snapshot():
+            if self._resource_row(resource_id) is None:
+                return None
+            return "".join(self._iter_chunks(resource_id))
+
+    def length(self, resource_id: str) -> int | None:
+        with self._lock:
+            row = self._resource_row(resource_id)
+        return None if row is None else row[0]
+
+    def read_slice(self, resource_id: str, start: int, end: int) -> str | None:
+        with self._read_snapshot():
+            row = self._resource_row(resource_id)
+            if row is None:
+                return None
+            char_length, _, chunk_chars = row
+            end = min(end, char_length)
+            if end <= start:
+                return ""
+            first_chunk = start // chunk_chars
+            last_chunk = (end - 1) // chunk_chars
+            text = "".join(self._iter_chunks(resource_id, first_chunk, last_chunk))
+        base = first_chunk * chunk_chars
+        return text[start - base : end - base]
+
+    def line_count(self, resource_id: str) -> int | None:
+        with self._lock:
+            row = self._resource_row(resource_id)
+        return None if row is None else row[1]
+
+    def read_lines(self, resource_id: str, start: int, end: int) -> list[str] | None:
+        with self._read_snapshot():
+            if self._resource_row(resource_id) is None:
+                return None
+            if end <= start:
+                return []
+            return list(islice(iter_lines(self._iter_chunks(resource_id)), start, end))
+
+    def search_lines(self, resource_id: str, pattern: re.Pattern[str]) -> list[int] | None:
+        with self._read_snapshot():
+            if self._resource_row(resource_id) is None:
+                return None
+            return search_lines(iter_lines(self._iter_chunks(resource_id)), pattern)
+
+    def resource_ids(self) -> list[str]:
+        with self._lock:
+            rows = self._connection.execute("SELECT resource_id FROM resources ORDER BY created_at").fetchall()
+        return [resource_id for (resource_id,) in rows]
+
+    def delete(self, resource_id: str) -> bool:
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                self._connection.execute("DELETE FROM chunks WHERE resource_id = ?", (resource_id,))
+                deleted = self._connection.execute("DELETE FROM resources WHERE resource_id = ?", (resource_id,))
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+            self._connection.execute("COMMIT")
+        return deleted.rowcount > 0
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                self._connection.execute("DELETE FROM chunks")
+                self._connection.execute("DELETE FROM resources")
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+            self._connection.execute("COMMIT")
+
+    def close(self) -> None:
+        # References are shared with other processes and must outlive this session: only drop the connection.
+        with self._lock:
+            self._connection.close()
+
+    def stats(self) -> StoreStats:
+        with self._lock:
+            entries, disk_bytes = self._connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(byte_length), 0) FROM resources"
+            ).fetchone()
+            return StoreStats(
+                entries=entries,
+                total_bytes=0,
+                max_bytes=None,
+                hits=self._hits,
+                misses=self._misses,
+                evictions=0,
+                disk_bytes=disk_bytes,
+            )
+
+    @contextmanager
+    def _read_snapshot(self) -> Iterator[None]:
+        # The metadata row and the chunks are separate statements; one read transaction keeps a concurrent
+        # put from another process from slipping in between them.
+        with self._lock:
+            self._connection.execute("BEGIN")
+            try:
+                yield
+            finally:
+                self._connection.execute("COMMIT")
+
+    def _resource_row(self, resource_id: str) -> tuple[int, int, int] | None:
+        # Callers hold self._lock.
+        row = self._connection.execute(
+            "SELECT char_length, line_count, chunk_chars FROM resources WHERE resource_id = ?",
+            (resource_id,),
+        ).fetchone()
+        if row is None:
+            self._misses += 1
+        else:
+            self._hits += 1
+        return row
+
+    def _iter_chunks(self, resource_id: str, first: int = 0, last: int | None = None) -> Iterator[str]:
+        # Callers hold self._lock inside a read snapshot. Fetch a few chunks per query so a streaming reader
+        # (e.g. read_lines) never holds the whole value.
+        chunk_no = first
+        while last is None or chunk_no <= last:
+            batch_last = chunk_no + _CHUNKS_PER_QUERY - 1
+            if last is not None:
+                batch_last = min(batch_last, last)
+            rows = self._connection.execute(
+                "SELECT data FROM chunks WHERE resource_id = ? AND chunk_no BETWEEN ? AND ? ORDER BY chunk_no",
+                (resource_id, chunk_no, batch_last),
+            ).fetchall()
+            for (data,) in rows:
+                yield data.decode("utf-8")
+            if len(rows) < batch_last - chunk_no + 1:
+                return
+            chunk_no = batch_last + 1
+
+
+def _staging_key(created_at: float) -> str:
+    # Staging ids start with their zero-padded creation time, so stale ones form a single key range.
+    return f"{_STAGING_PREFIX}{int(created_at * 1000):016d}"
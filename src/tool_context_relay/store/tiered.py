@@ -0,0 +1,329 @@
+from __future__ import annotations
+
+import re
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TypeVar
+
+from tool_context_relay.store import binary
+from tool_context_relay.store.accounting import utf8_length
+from tool_context_relay.store.base import ResourceStore, StoreStats
+from tool_context_relay.store.binary import BinaryPayload
+from tool_context_relay.store.disk import DEFAULT_SPILL_THRESHOLD, DiskSpillStore
+from tool_context_relay.store.memory import DEFAULT_MAX_BYTES, MemoryStore
+from tool_context_relay.store.writer import StoreWriter, open_writer
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class TierStats:
+    name: str
+    entries: int
+    # Payload bytes held by the tier (UTF-8 bytes for cold text values).
+    total_bytes: int
+    max_bytes: int | None
+    hits: int
+    # Lookups that reached this tier and did not find the value there.
+    misses: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class _TieredWriter:
+    """Streaming writer that buffers small values for the hot tier and streams large ones to the cold tier."""
+
+    def __init__(self, store: TieredStore) -> None:
+        self._store = store
+        self._buffer: list[str] = []
+        self._buffered = 0
+        self._bytes = 0
+        self._cold: StoreWriter | None = None
+
+    def write(self, chunk: str) -> None:
+        self._bytes += utf8_length(chunk)
+        if self._cold is not None:
+            self._cold.write(chunk)
+            return
+        self._buffer.append(chunk)
+        self._buffered += len(chunk)
+        if self._store._is_large(self._buffered):
+            self._cold = open_writer(self._store._cold)
+            chunks, self._buffer = self._buffer, []
+            for buffered in chunks:
+                self._cold.write(buffered)
+
+    def commit(self, resource_id: str) -> None:
+        if resource_id in self._store:
+            self.abort()
+            return
+        if self._cold is None:
+            value = "".join(self._buffer)
+            self._buffer = []
+            self._store.put(resource_id, value)
+            return
+        with self._store._lock:
+            self._store._hot.delete(resource_id)
+            self._cold.commit(resource_id)
+            self._store._admit_cold(resource_id, self._bytes)
+        self._cold = None
+
+    def abort(self) -> None:
+        self._buffer = []
+        if self._cold is not None:
+            self._cold.abort()
+            self._cold = None
+
+
+class TieredStore:
+    """Two-tier store: a bounded in-memory hot tier in front of an on-disk cold tier.
+
+    New values land in the hot tier, so the usual box-then-slice sequence never touches the disk.
+    When the hot tier exceeds `hot_max_bytes`, its least recently used values are demoted to the
+    cold tier instead of being dropped; values larger than `cold_threshold` characters go straight
+    to the cold tier. A read that finds a value only in the cold tier promotes it back to the hot
+    tier, unless it is large. `cold_max_bytes` bounds the payload bytes of the cold tier (least recently
+    used values are evicted for good); `tier_stats()` reports per-tier hit rates.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path | None = None,
+        *,
+        hot_max_bytes: int | None = DEFAULT_MAX_BYTES,
+        cold_max_bytes: int | None = None,
+        cold_threshold: int = DEFAULT_SPILL_THRESHOLD,
+        cold: ResourceStore | None = None,
+    ) -> None:
+        if cold_max_bytes is not None and cold_max_bytes <= 0:
+            raise ValueError("cold_max_bytes must be a positive integer or None")
+        if cold_threshold < 0:
+            raise ValueError("cold_threshold must be a non-negative integer")
+        self._hot = MemoryStore(max_bytes=hot_max_bytes, on_evict=self._demote)
+        if cold is None:
+            cold = DiskSpillStore(directory, spill_threshold=0, memory=MemoryStore(max_bytes=None))
+        self._cold = cold
+        self._cold_max_bytes = cold_max_bytes
+        self._cold_threshold = cold_threshold
+        # Payload bytes of the values held by the cold tier (UTF-8 for text), least recently used first.
+        self._cold_sizes: OrderedDict[str, int] = OrderedDict()
+        self._cold_bytes = 0
+        self._hot_hits = 0
+        self._cold_hits = 0
+        self._misses = 0
+        self._promotions = 0
+        self._demotions = 0
+        self._evictions = 0
+        # Held by every operation that moves values between tiers, so a value is never seen in neither.
+        self._lock = threading.RLock()
+
+    @property
+    def hot(self) -> MemoryStore:
+        return self._hot
+
+    @property
+    def cold(self) -> ResourceStore:
+        return self._cold
+
+    def __contains__(self, resource_id: str) -> bool:
+        if resource_id in self._hot:
+            return True
+        with self._lock:
+            return resource_id in self._hot or resource_id in self._cold_sizes
+
+    def touch(self, resource_id: str) -> bool:
+        if self._hot.touch(resource_id):
+            return True
+        with self._lock:
+            if resource_id in self._cold_sizes:
+                self._cold_sizes.move_to_end(resource_id)
+                return True
+            return self._hot.touch(resource_id)
+
+    def put(self, resource_id: str, value: str) -> None:
+        with self._lock:
+            if self._is_large(len(value)):
+                self._hot.delete(resource_id)
+                self._cold.put(resource_id, value)
+                self._admit_cold(resource_id, utf8_length(value))
+                return
+            self._drop_cold(resource_id)
+            self._hot.put(resource_id, value)
+
+    def put_binary(self, resource_id: str, payload: BinaryPayload) -> None:
+        with self._lock:
+            if self._is_large(payload.size):
+                self._hot.delete(resource_id)
+                binary.put_binary(self._cold, resource_id, payload)
+                self._admit_cold(resource_id, payload.size)
+                return
+            self._drop_cold(resource_id)
+            self._hot.put_binary(resource_id, payload)
+
+    def get_binary(self, resource_id: str) -> BinaryPayload | None:
+        return self._read(resource_id, lambda store: binary.get_binary(store, resource_id))
+
+    def open_writer(self) -> _TieredWriter:
+        return _TieredWriter(self)
+
+    def get(self, resource_id: str) -> str | None:
+        return self._read(resource_id, lambda store: store.get(resource_id))
+
+    def length(self, resource_id: str) -> int | None:
+        return self._read(resource_id, lambda store: store.length(resource_id))
+
+    def read_slice(self, resource_id: str, start: int, end: int) -> str | None:
+        return self._read(resource_id, lambda store: store.read_slice(resource_id, start, end))
+
+    # Line operations may build (and charge) hot-tier indexes, which can demote values: keep them under the lock.
+
+    def line_count(self, resource_id: str) -> int | None:
+        return self._read(resource_id, lambda store: store.line_count(resource_id), locked=True)
+
+    def read_lines(self, resource_id: str, start: int, end: int) -> list[str] | None:
+        return self._read(resource_id, lambda store: store.read_lines(resource_id, start, end), locked=True)
+
+    def search_lines(self, resource_id: str, pattern: re.Pattern[str]) -> list[int] | None:
+        return self._read(resource_id, lambda store: store.search_lines(resource_id, pattern), locked=True)
+
+    def resource_ids(self) -> list[str]:
+        with self._lock:
+            return [*self._hot.resource_ids(), *self._cold_sizes]
+
+    def delete(self, resource_id: str) -> bool:
+        with self._lock:
+            removed = self._drop_cold(resource_id)
+            return self._hot.delete(resource_id) or removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._hot.clear()
+            self._cold.clear()
+            self._cold_sizes.clear()
+            self._cold_bytes = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._hot.close()
+            self._cold.close()
+            self._cold_sizes.clear()
+            self._cold_bytes = 0
+
+    def stats(self) -> StoreStats:
+        hot_stats = self._hot.stats()
+        cold_stats = self._cold.stats()
+        with self._lock:
+            return StoreStats(
+                entries=hot_stats.entries + len(self._cold_sizes),
+                total_bytes=hot_stats.total_bytes,
+                max_bytes=hot_stats.max_bytes,
+                hits=self._hot_hits + self._cold_hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                disk_bytes=cold_stats.disk_bytes,
+                index_bytes=hot_stats.index_bytes + cold_stats.index_bytes,
+            )
+
+    def tier_stats(self) -> tuple[TierStats, TierStats]:
+        """Return the hot and cold tier statistics; a cold lookup is counted only after a hot miss."""
+        hot_stats = self._hot.stats()
+        with self._lock:
+            return (
+                TierStats(
+                    name="hot",
+                    entries=hot_stats.entries,
+                    total_bytes=hot_stats.total_bytes,
+                    max_bytes=hot_stats.max_bytes,
+                    hits=self._hot_hits,
+                    misses=self._cold_hits + self._misses,
+                ),
+                TierStats(
+                    name="cold",
+                    entries=len(self._cold_sizes),
+                    total_bytes=self._cold_bytes,
+                    max_bytes=self._cold_max_bytes,
+                    hits=self._cold_hits,
+                    misses=self._misses,
+                ),
+            )
+
+    @property
+    def promotions(self) -> int:
+        return self._promotions
+
+    @property
+    def demotions(self) -> int:
+        return self._demotions
+
+    def _read(self, resource_id: str, read: Callable[[ResourceStore], T | None], *, locked: bool = False) -> T | None:
+        if not locked and resource_id in self._hot:
+            value = read(self._hot)
+            if value is not None:
+                with self._lock:
+                    self._hot_hits += 1
+                return value
+        with self._lock:
+            if resource_id in self._hot:
+                self._hot_hits += 1
+                return read(self._hot)
+            size = self._cold_sizes.get(resource_id)
+            if size is None:
+                self._misses += 1
+                return None
+            self._cold_hits += 1
+            if self._is_large(size) or not self._promote(resource_id):
+                self._cold_sizes.move_to_end(resource_id)
+                return read(self._cold)
+            return read(self._hot)
+
+    def _promote(self, resource_id: str) -> bool:
+        payload = binary.get_binary(self._cold, resource_id)
+        if payload is not None:
+            self._drop_cold(resource_id)
+            self._hot.put_binary(resource_id, payload)
+        else:
+            value = self._cold.get(resource_id)
+            if value is None:
+                return False
+            self._drop_cold(resource_id)
+            self._hot.put(resource_id, value)
+        self._promotions += 1
+        return True
+
+    def _demote(self, resource_id: str, value: str | BinaryPayload) -> None:
+        # Called by the hot tier for every value it evicts; evictions only happen under our lock.
+        with self._lock:
+            if isinstance(value, BinaryPayload):
+                binary.put_binary(self._cold, resource_id, value)
+                size = value.size
+            else:
+                self._cold.put(resource_id, value)
+                size = utf8_length(value)
+            self._demotions += 1
+            self._admit_cold(resource_id, size)
+
+    def _admit_cold(self, resource_id: str, size: int) -> None:
+        self._cold_bytes += size - self._cold_sizes.pop(resource_id, 0)
+        self._cold_sizes[resource_id] = size
+        if self._cold_max_bytes is None:
+            return
+        while self._cold_bytes > self._cold_max_bytes and len(self._cold_sizes) > 1:
+            self._drop_cold(next(iter(self._cold_sizes)))
+            self._evictions += 1
+
+    def _drop_cold(self, resource_id: str) -> bool:
+        size = self._cold_sizes.pop(resource_id, None)
+        if size is None:
+            return False
+        self._cold_bytes -= size
+        self._cold.delete(resource_id)
+        return True
+
+    def _is_large(self, size: int) -> bool:
+        return size > self._cold_threshold
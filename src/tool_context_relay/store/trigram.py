@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import re
+import sys
+from array import array
+from collections.abc import Callable, Iterable
+from functools import cache
+
+# Values shorter than this are grepped with a plain scan; building an index would cost more than it saves.
+DEFAULT_GREP_INDEX_MIN_CHARS = 256 * 1024
+
+_GRAM = 3
+
+try:  # Parser internals of `re`; without them every pattern falls back to a full scan.
+    from re import _casefix, _constants, _parser
+except ImportError:  # pragma: no cover - depends on the interpreter
+    _casefix = _constants = _parser = None
+
+
+@cache
+def _fold_table() -> dict[int, int]:
+    """Map every character to a representative of the class `re.IGNORECASE` treats as equal.
+
+    The index stores folded text, so one index serves case-sensitive and case-insensitive
+    patterns: folding is a per-character map, hence a literal found in a line is still
+    found after both are folded.
+    """
+    table: dict[int, int] = {}
+    for code in range(sys.maxunicode + 1):
+        lower = chr(code).lower()
+        if lower != chr(code):
+            # `re` compares the simple (single character) lowercase mapping.
+            table[code] = ord(lower[0])
+    extra_cases = getattr(_casefix, "_EXTRA_CASES", {})
+    for code, others in extra_cases.items():
+        canonical = min(code, *others)
+        for member in (code, *others):
+            table[member] = canonical
+    for code, target in table.items():
+        table[code] = table.get(target, target)
+    return table
+
+
+def fold(text: str) -> str:
+    return text.translate(_fold_table())
+
+
+def required_literals(pattern: re.Pattern[str]) -> list[str] | None:
+    """Return folded literal strings every match of `pattern` must contain, or None if none are usable."""
+    if _parser is None:
+        return None
+    try:
+        parsed = _parser.parse(pattern.pattern, pattern.flags)
+    except Exception:
+        return None
+    runs = [fold(run) for run in _literal_runs(parsed) if len(run) >= _GRAM]
+    return runs or None
+
+
+def _literal_runs(items: Iterable) -> list[str]:
+    runs: list[str] = []
+    current: list[str] = []
+
+    def flush() -> None:
+        if current:
+            runs.append("".join(current))
+            current.clear()
+
+    for op, av in items:
+        if op is _constants.LITERAL:
+            current.append(chr(av))
+        elif op is _constants.AT:
+            # Anchors consume nothing, so the literals around them stay adjacent.
+            continue
+        elif op is _constants.SUBPATTERN:
+            flush()
+            runs.extend(_literal_runs(av[-1]))
+        elif op is _constants.ATOMIC_GROUP:
+            flush()
+            runs.extend(_literal_runs(av))
+        elif op in (_constants.MAX_REPEAT, _constants.MIN_REPEAT, _constants.POSSESSIVE_REPEAT):
+            flush()
+            min_count, _, item = av
+            if min_count >= 1:
+                runs.extend(_literal_runs(item))
+        else:
+            flush()
+    flush()
+    return runs
+
+
+class TrigramIndex:
+    """Posting lists of line numbers for every 3-character substring of the (folded) lines of a value."""
+
+    def __init__(self, lines: Iterable[str]) -> None:
+        postings: dict[str, array] = {}
+        for line_no, line in enumerate(lines):
+            folded = fold(line)
+            for gram in {folded[index : index + _GRAM] for index in range(len(folded) - _GRAM + 1)}:
+                posting = postings.get(gram)
+                if posting is None:
+                    posting = postings[gram] = array("I")
+                posting.append(line_no)
+        self._postings = postings
+        # Every key string and posting array is an object of its own, charged with its header and buffer.
+        self._size = sys.getsizeof(postings) + sum(
+            sys.getsizeof(gram) + sys.getsizeof(posting) for gram, posting in postings.items()
+        )
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def candidates(self, pattern: re.Pattern[str]) -> list[int] | None:
+        """Return the sorted line numbers that may match `pattern`, or None when a full scan is needed."""
+        literals = required_literals(pattern)
+        if literals is None:
+            return None
+        grams = {literal[index : index + _GRAM] for literal in literals for index in range(len(literal) - _GRAM + 1)}
+        postings = []
+        for gram in grams:
+            posting = self._postings.get(gram)
+            if posting is None:
+                return []
+            postings.append(posting)
+        postings.sort(key=len)
+        lines = set(postings[0])
+        for posting in postings[1:]:
+            lines.intersection_update(posting)
+            if not lines:
+                break
+        return sorted(lines)
+
+
+def search_indexed(
+    index: TrigramIndex,
+    pattern: re.Pattern[str],
+    read_line: Callable[[int], str],
+) -> list[int] | None:
+    """Run `pattern` over the candidate lines only; None means the caller must scan every line."""
+    candidates = index.candidates(pattern)
+    if candidates is None:
+        return None
+    return [line_no for line_no in candidates if pattern.search(read_line(line_no))]
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from typing import Protocol
+
+from tool_context_relay.store.base import ResourceStore
+
+
+class StoreWriter(Protocol):
+    """Incremental writer for one value whose resource id is only known once the value is complete.
+
+    `commit` keeps an already stored value with the same id (ids are content addressed);
+    `abort` discards everything written so far. A writer is used once and by one thread.
+    """
+
+    def write(self, chunk: str) -> None: ...
+
+    def commit(self, resource_id: str) -> None: ...
+
+    def abort(self) -> None: ...
+
+
+class BufferedWriter:
+    """Writer for stores without native streaming support: buffers the chunks and calls `put` once.
+
+    The chunks and the joined value are both alive during the `put`, so peak memory is about twice the value.
+    """
+
+    def __init__(self, store: ResourceStore) -> None:
+        self._store = store
+        self._chunks: list[str] = []
+
+    def write(self, chunk: str) -> None:
+        self._chunks.append(chunk)
+
+    def commit(self, resource_id: str) -> None:
+        chunks, self._chunks = self._chunks, []
+        if resource_id not in self._store:
+            self._store.put(resource_id, "".join(chunks))
+
+    def abort(self) -> None:
+        self._chunks = []
+
+
+def open_writer(store: ResourceStore) -> StoreWriter:
+    """Return a streaming writer for `store`, buffering in memory when the backend cannot stream."""
+    opener = getattr(store, "open_writer", None)
+    if opener is None:
+        return BufferedWriter(store)
+    return opener()
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+# 64 tokens keep the inline limit of plain ASCII text at the historical 256 characters.
+DEFAULT_MAX_RESULT_TOKENS = 64
+# Generous upper bound of characters per token: longer values exceed a threshold without being counted.
+MAX_CHARS_PER_TOKEN = 8
+HEURISTIC_TOKENIZER = "heuristic"
+_CACHE_SIZE = 4096
+# Code points from here on (CJK, kana, hangul, emoji, ...) cost about one token each.
+_WIDE_CODE_POINT = 0x2E80
+
+TokenEstimator = Callable[[str], int]
+
+
+def estimate_tokens(value: str) -> int:
+    """Cheap token estimate: ~4 ASCII characters per token, ~2 for other alphabets, 1 per CJK character."""
+    if value.isascii():
+        return -(-len(value) // 4)
+    quarters = 0
+    for char in value:
+        code = ord(char)
+        quarters += 1 if code < 0x80 else 2 if code < _WIDE_CODE_POINT else 4
+    return -(-quarters // 4)
+
+
+def tiktoken_estimator(encoding_name: str) -> TokenEstimator:
+    """Exact counts from a `tiktoken` encoding (e.g. "o200k_base"); needs the optional `tiktoken` package."""
+    try:
+        import tiktoken
+    except ImportError as exc:
+        raise RuntimeError(f"tokenizer {encoding_name!r} requires the 'tiktoken' package") from exc
+    encoding = tiktoken.get_encoding(encoding_name)
+
+    def count(value: str) -> int:
+        return len(encoding.encode(value, disallowed_special=()))
+
+    return count
+
+
+def resolve_estimator(tokenizer: str | None) -> TokenEstimator:
+    """Map a tokenizer setting ("heuristic" or None, or a tiktoken encoding name) to an estimator."""
+    if tokenizer is None or tokenizer == HEURISTIC_TOKENIZER:
+        return estimate_tokens
+    return tiktoken_estimator(tokenizer)
+
+
+class TokenCounter:
+    """Count tokens with `estimator`, memoized per content digest (bounded LRU, thread-safe)."""
+
+    def __init__(self, estimator: TokenEstimator = estimate_tokens, *, cache_size: int = _CACHE_SIZE) -> None:
+        self._estimator = estimator
+        self._cache_size = cache_size
+        self._counts: OrderedDict[bytes, int] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def count(self, value: str) -> int:
+        key = hashlib.blake2b(value.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+        with self._lock:
+            tokens = self._counts.get(key)
+            if tokens is not None:
+                self._counts.move_to_end(key)
+                return tokens
+        tokens = self._estimator(value)
+        with self._lock:
+            self._counts[key] = tokens
+            if len(self._counts) > self._cache_size:
+                self._counts.popitem(last=False)
+        return tokens
+
+
+@dataclass(frozen=True)
+class BoxingThreshold:
+    """Tool results estimated above `max_tokens` tokens are boxed instead of returned inline.
+
+    `max_tokens=0` boxes every non-empty result and `max_tokens=None` never boxes.
+    """
+
+    max_tokens: int | None = DEFAULT_MAX_RESULT_TOKENS
+    counter: TokenCounter = field(default_factory=TokenCounter, compare=False, repr=False)
+
+    @property
+    def max_chars(self) -> int:
+        """Length beyond which a value exceeds the threshold whatever its content."""
+        if self.max_tokens is None:
+            return sys.maxsize
+        return self.max_tokens * MAX_CHARS_PER_TOKEN
+
+    def exceeds(self, value: str) -> bool:
+        return self.exceeds_parts([value], len(value))
+
+    def exceeds_parts(self, parts: list[str], size: int) -> bool:
+        """`exceeds("".join(parts))` for parts of `size` characters in total; only short parts are joined."""
+        if self.max_tokens is None:
+            return False
+        if size > self.max_chars:
+            return True
+        return self.counter.count("".join(parts)) > self.max_tokens
+
+    @classmethod
+    def create(cls, max_tokens: int | None = None, tokenizer: str | None = None) -> BoxingThreshold:
+        return cls(
+            max_tokens=DEFAULT_MAX_RESULT_TOKENS if max_tokens is None else max_tokens,
+            counter=TokenCounter(resolve_estimator(tokenizer)),
+        )
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import TypeVar
+
+_BINARY_ATTRIBUTE = "accepts_binary_values"
+
+F = TypeVar("F", bound=Callable[..., object])
+
+
+def accepts_binary_values(func: F) -> F:
+    """Declare that `func` can take `BinaryPayload` arguments.
+
+    Such tools receive binary references as raw bytes (a zero-copy view of the stored payload)
+    instead of base64 text.
+    """
+    setattr(func, _BINARY_ATTRIBUTE, True)
+    return func
+
+
+def supports_binary_values(func: Callable[..., object]) -> bool:
+    return getattr(func, _BINARY_ATTRIBUTE, False) is True
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import operator
+from collections.abc import Callable, Iterator
+from typing import TypeVar
+
+from tool_context_relay.store import ResourceStore
+
+DEFAULT_CHUNK_CHARS = 64 * 1024
+_LAZY_ATTRIBUTE = "accepts_lazy_values"
+
+F = TypeVar("F", bound=Callable[..., object])
+
+
+def accepts_lazy_values(func: F) -> F:
+    """Declare that `func` only needs `str`-like access to its arguments (length, slices, chunks).
+
+    In lazy unboxing mode such tools receive `LazyValue` proxies instead of fully materialized strings.
+    """
+    setattr(func, _LAZY_ATTRIBUTE, True)
+    return func
+
+
+def supports_lazy_values(func: Callable[..., object]) -> bool:
+    return getattr(func, _LAZY_ATTRIBUTE, False) is True
+
+
+class LazyValue:
+    """Read-only, `str`-compatible view of a boxed value that reads from the store only what is used.
+
+    `len()` is answered from the store's metadata, indexing and slicing become `read_slice` calls,
+    and `chunks()` streams the value; only `str()` (and operations that need the whole text, such as
+    hashing or concatenation) materialize it.
+    """
+
+    __slots__ = ("_store", "_resource_id", "_length")
+
+    def __init__(self, store: ResourceStore, resource_id: str, length: int) -> None:
+        self._store = store
+        self._resource_id = resource_id
+        self._length = length
+
+    @property
+    def resource_id(self) -> str:
+        return self._resource_id
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, key: int | slice) -> str:
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self._length)
+            if step > 0:
+                text = self._read(start, max(start, stop))
+                return text if step == 1 else text[::step]
+            # Negative step: read the covered range once, then walk it backwards.
+            low, high = stop + 1, start + 1
+            if high <= low:
+                return ""
+            return self._read(low, high)[::-1][::-step]
+        index = operator.index(key)
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("string index out of range")
+        return self._read(index, index + 1)
+
+    def chunks(self, size: int | None = None) -> Iterator[str]:
+        size = size or DEFAULT_CHUNK_CHARS
+        for start in range(0, self._length, size):
+            yield self._read(start, min(start + size, self._length))
+
+    def __iter__(self) -> Iterator[str]:
+        for chunk in self.chunks():
+            yield from chunk
+
+    def __contains__(self, needle: str) -> bool:
+        needle = str(needle)
+        if not needle:
+            return True
+        # Keep the last len(needle) - 1 characters so matches spanning two chunks are found.
+        carry = ""
+        for chunk in self.chunks():
+            window = carry + chunk
+            if needle in window:
+                return True
+            carry = window[len(window) - len(needle) + 1 :] if len(needle) > 1 else ""
+        return False
+
+    def startswith(self, prefix: str) -> bool:
+        return self[: len(prefix)] == prefix
+
+    def endswith(self, suffix: str) -> bool:
+        if not suffix:
+            return True
+        return len(suffix) <= self._length and self[-len(suffix) :] == suffix
+
+    def __str__(self) -> str:
+        value = self._store.get(self._resource_id)
+        if value is None:
+            raise LookupError(f"resource {self._resource_id} is no longer available")
+        return value
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, LazyValue):
+            if other._store is self._store and other._resource_id == self._resource_id:
+                return True
+            other = str(other)
+        if not isinstance(other, str):
+            return NotImplemented
+        if len(other) != self._length:
+            return False
+        position = 0
+        for chunk in self.chunks():
+            if other[position : position + len(chunk)] != chunk:
+                return False
+            position += len(chunk)
+        return True
+
+    def __hash__(self) -> int:
+        return hash(str(self))
+
+    def __add__(self, other: str) -> str:
+        return str(self) + other
+
+    def __radd__(self, other: str) -> str:
+        return other + str(self)
+
+    def __repr__(self) -> str:
+        return f"LazyValue({self._resource_id!r}, length={self._length})"
+
+    def _read(self, start: int, end: int) -> str:
+        text = self._store.read_slice(self._resource_id, start, end)
+        if text is None:
+            raise LookupError(f"resource {self._resource_id} is no longer available")
+        return text
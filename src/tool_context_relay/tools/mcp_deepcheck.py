@@ -1,8 +1,11 @@
 from tool_context_relay.agent.pretty import emit_default
+from tool_context_relay.tools.lazy import accepts_lazy_values
 
 
 # This function simulates performing a Deep Check analysis on the provided text.
 # It logs characteristics of the input text (length and prefix) to ensure the text is received correctly.
+# It only reads the length and a prefix, so with lazy unboxing it never fetches the whole value.
+@accepts_lazy_values
 def fun_deep_check(text: str) -> str:
     """
     Perform a Deep Check analysis on a provided text.
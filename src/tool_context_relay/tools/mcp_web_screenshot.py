@@ -1,4 +1,7 @@
+import base64
+
 from tool_context_relay.agent.pretty import emit_default
+from tool_context_relay.store import BinaryPayload
 
 _SCREENSHOT_BASE64 = (
     "iVBORw0KGgoAAAANSUhEUgAAABAAAAAQCAYAAAAf8/9hAAABgUlEQVQ4T6WTv0sD"
@@ -8,16 +11,18 @@ _SCREENSHOT_BASE64 = (
     "eKkqg8m7vZ8m2lOq4m0n4lW2uN8x6v9gqj0JrZQwH1rVJ5sQ7GQK5sZ2sQqH9q6iQ"
     "k6mQ4e7bD9f3tS7k8QAAAABJRU5ErkJggg=="
 )
+_SCREENSHOT_PNG = base64.b64decode(_SCREENSHOT_BASE64)
 
 
-def fun_get_web_screenshot() -> str:
+def fun_get_web_screenshot() -> BinaryPayload:
     """Return a simulated base64-encoded web screenshot.
 
     Returns:
-        str: The base64-encoded image data.
+        str: A PNG screenshot of the page, base64-encoded.
     """
     emit_default(
         f"Simulated web screenshot. length={len(_SCREENSHOT_BASE64)}",
         group=fun_get_web_screenshot.__name__,
     )
-    return _SCREENSHOT_BASE64
+    # The relay stores the raw bytes; text consumers (the model included) read them base64-encoded.
+    return BinaryPayload(_SCREENSHOT_PNG, "image/png")
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import TypeVar
+
+_NESTED_ATTRIBUTE = "accepts_nested_values"
+
+F = TypeVar("F", bound=Callable[..., object])
+
+
+def accepts_nested_values(func: F) -> F:
+    """Declare that `func` takes structured arguments (lists, tuples, dicts) that may contain references.
+
+    References anywhere inside such arguments are unboxed, not only top-level string arguments;
+    dict keys are left as they are.
+    """
+    setattr(func, _NESTED_ATTRIBUTE, True)
+    return func
+
+
+def supports_nested_values(func: Callable[..., object]) -> bool:
+    return getattr(func, _NESTED_ATTRIBUTE, False) is True
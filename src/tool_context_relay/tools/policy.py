@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass, fields, replace
+from pathlib import Path
+from typing import Literal
+
+import yaml
+
+from tool_context_relay.store.compressed import CODECS, Codec
+from tool_context_relay.tokens import BoxingThreshold
+
+BoxingRule = Literal["auto", "always", "never"]
+IndexKind = Literal["lines", "grep"]
+
+BOXING_RULES: tuple[BoxingRule, ...] = ("auto", "always", "never")
+INDEX_KINDS: tuple[IndexKind, ...] = ("lines", "grep")
+
+_ALWAYS = BoxingThreshold(max_tokens=0)
+_NEVER = BoxingThreshold(max_tokens=None)
+
+
+@dataclass(frozen=True)
+class ToolPolicy:
+    """How the relay boxes the results of one tool.
+
+    `boxing` forces ("always"/"never") or leaves to the threshold ("auto") whether a result is boxed;
+    `max_tokens` replaces the run's threshold for "auto". The storage hints apply to boxed results only:
+    `ttl` when the store expires references, `compression` when it compresses them, and `indexes`
+    ("lines", "grep") are built when the value is stored instead of on first read.
+    """
+
+    boxing: BoxingRule = "auto"
+    max_tokens: int | None = None
+    ttl: float | None = None
+    compression: Codec | None = None
+    indexes: tuple[IndexKind, ...] = ()
+
+    def __post_init__(self) -> None:
+        if self.boxing not in BOXING_RULES:
+            raise ValueError(f"boxing must be one of {', '.join(BOXING_RULES)}, got {self.boxing!r}")
+        if self.max_tokens is not None and (self.max_tokens < 0 or self.boxing != "auto"):
+            raise ValueError("max_tokens must be a non-negative integer and requires boxing 'auto'")
+        if self.ttl is not None and self.ttl <= 0:
+            raise ValueError("ttl must be a positive number of seconds")
+        if self.compression is not None and self.compression not in CODECS:
+            raise ValueError(f"unsupported codec: {self.compression!r}")
+        unknown = set(self.indexes) - set(INDEX_KINDS)
+        if unknown:
+            raise ValueError(f"unknown index kinds: {', '.join(sorted(unknown))}")
+
+    def threshold(self, base: BoxingThreshold) -> BoxingThreshold:
+        """The threshold for this tool's results, given the run's `base` threshold."""
+        if self.boxing == "always":
+            return _ALWAYS
+        if self.boxing == "never":
+            return _NEVER
+        if self.max_tokens is not None:
+            return replace(base, max_tokens=self.max_tokens)
+        return base
+
+
+# Image descriptions are short answers the model needs verbatim; fetched pages are large and mostly
+# paged through or grepped. Transcripts keep the token threshold (short transcripts stay inline).
+DEFAULT_TOOL_POLICIES: Mapping[str, ToolPolicy] = {
+    "get_img_description": ToolPolicy(boxing="never"),
+    "get_page": ToolPolicy(boxing="always", indexes=("lines", "grep")),
+    "yt_transcribe": ToolPolicy(indexes=("lines",)),
+}
+
+
+def load_tool_policies(path: str | Path) -> dict[str, ToolPolicy]:
+    """Read a YAML mapping of tool name to `ToolPolicy` fields, e.g. `get_page: {boxing: always}`."""
+    try:
+        data = yaml.safe_load(Path(path).read_text(encoding="utf-8"))
+    except yaml.YAMLError as exc:
+        raise ValueError(f"invalid tool policies file {str(path)!r}: {exc}") from exc
+    if data is None:
+        return {}
+    if not isinstance(data, dict):
+        raise ValueError("tool policies must be a mapping of tool name to policy")
+    known = {item.name for item in fields(ToolPolicy)}
+    policies: dict[str, ToolPolicy] = {}
+    for tool, settings in data.items():
+        if not isinstance(settings, dict):
+            raise ValueError(f"policy of {tool!r} must be a mapping")
+        unknown = set(settings) - known
+        if unknown:
+            raise ValueError(f"unknown policy settings for {tool!r}: {', '.join(sorted(unknown))}")
+        if "indexes" in settings:
+            settings = {**settings, "indexes": tuple(settings["indexes"] or ())}
+        try:
+            policies[str(tool)] = ToolPolicy(**settings)
+        except (TypeError, ValueError) as exc:
+            raise ValueError(f"invalid policy for {tool!r}: {exc}") from exc
+    return policies
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Iterable, Sequence
+from concurrent.futures import Executor
+
+from tool_context_relay.boxing import BoxingMode
+from tool_context_relay.store import BinaryPayload, ResourceStore, SharedMemoryStore
+from tool_context_relay.tokens import BoxingThreshold
+from tool_context_relay.tools.policy import ToolPolicy
+from tool_context_relay.tools.tool_relay import _BOXABLE_TYPES, _unbox_args, box_value
+
+# Read-only stores attached by this (worker) process, by namespace.
+_attached: dict[str, SharedMemoryStore] = {}
+
+
+def shared_namespace(store: ResourceStore) -> str:
+    """Return the namespace of the `SharedMemoryStore` behind `store` (looking through wrappers)."""
+    while not isinstance(store, SharedMemoryStore):
+        inner = getattr(store, "inner", None)
+        if inner is None:
+            raise TypeError("process pool relay requires a SharedMemoryStore")
+        store = inner
+    return store.namespace
+
+
+def tool_relay_in_pool(
+    executor: Executor,
+    func: Callable[..., str | BinaryPayload | Iterable[str]],
+    args: Sequence[object],
+    *,
+    store: ResourceStore,
+    mode: BoxingMode = "opaque",
+    ttl: float | None = None,
+    tool: str | None = None,
+    lazy: bool = False,
+    interpolate: bool = False,
+    threshold: BoxingThreshold | None = None,
+    policy: ToolPolicy | None = None,
+    preview: bool = False,
+) -> str:
+    """Run a tool in a worker of `executor` (e.g. a `ProcessPoolExecutor`) and box its result.
+
+    Only the arguments as given (short `internal://` ids for boxed values) and the store namespace are
+    sent to the worker, which unboxes them in place from shared memory; `func` must be picklable.
+    The result is boxed here exactly as `tool_relay` boxes it, honouring `tool`, `threshold`, `policy`
+    and `preview`.
+    """
+    future = executor.submit(_call_in_worker, shared_namespace(store), func, list(args), lazy, interpolate)
+    return box_value(
+        future.result(), mode=mode, store=store, ttl=ttl, tool=tool, threshold=threshold, policy=policy, preview=preview
+    )
+
+
+async def tool_relay_in_pool_async(
+    executor: Executor,
+    func: Callable[..., str | BinaryPayload | Iterable[str]],
+    args: Sequence[object],
+    *,
+    store: ResourceStore,
+    mode: BoxingMode = "opaque",
+    ttl: float | None = None,
+    tool: str | None = None,
+    lazy: bool = False,
+    interpolate: bool = False,
+    threshold: BoxingThreshold | None = None,
+    policy: ToolPolicy | None = None,
+    preview: bool = False,
+) -> str:
+    """Async counterpart of `tool_relay_in_pool`: awaits the worker without blocking the event loop."""
+    future = executor.submit(_call_in_worker, shared_namespace(store), func, list(args), lazy, interpolate)
+    value = await asyncio.wrap_future(future)
+    return box_value(
+        value, mode=mode, store=store, ttl=ttl, tool=tool, threshold=threshold, policy=policy, preview=preview
+    )
+
+
+def _call_in_worker(
+    namespace: str,
+    func: Callable[..., str | BinaryPayload | Iterable[str]],
+    args: list[object],
+    lazy: bool,
+    interpolate: bool,
+) -> str | BinaryPayload:
+    store = _attached.get(namespace)
+    if store is None:
+        store = _attached[namespace] = SharedMemoryStore.attach(namespace)
+    value = func(*_unbox_args(func, args, store=store, lazy=lazy, interpolate=interpolate))
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return BinaryPayload(bytes(value))
+    if isinstance(value, BinaryPayload):
+        return BinaryPayload(bytes(value.data), value.mime_type)
+    if isinstance(value, _BOXABLE_TYPES):
+        return value
+    # Generators cannot cross the process boundary.
+    return "".join(value)
@@ -1,46 +1,745 @@
 from __future__ import annotations
 
-from collections.abc import Callable, Sequence
+import asyncio
+import hashlib
+import inspect
+from collections.abc import AsyncIterable, AsyncIterator, Awaitable, Callable, Iterable, Sequence
+from itertools import chain
+from typing import TypeVar
 
-from tool_context_relay.boxing import BoxingMode, extract_resource_uri, format_resource_link
+from tool_context_relay.boxing import (
+    MAX_RESOURCE_LINK_CHARS,
+    BoxingMode,
+    extract_resource_uri,
+    find_embedded_resource_uris,
+    format_resource_link,
+)
+from tool_context_relay.preview import (
+    PreviewBuilder,
+    ResourcePreview,
+    describe_binary,
+    describe_value,
+    format_resource_preview,
+)
+from tool_context_relay.store import BinaryPayload, MemoryStore, ResourceStore, open_writer
+from tool_context_relay.store.aio import (
+    AsyncResourceStore,
+    AsyncStoreAdapter,
+    as_async_store,
+    get_binary_async,
+    is_async_store,
+    open_async_writer,
+    put_binary_async,
+)
+from tool_context_relay.store.binary import base64_length, get_binary, put_binary
+from tool_context_relay.tokens import DEFAULT_MAX_RESULT_TOKENS, BoxingThreshold
+from tool_context_relay.tools.binary import supports_binary_values
+from tool_context_relay.tools.lazy import LazyValue, supports_lazy_values
+from tool_context_relay.tools.nested import supports_nested_values
+from tool_context_relay.tools.policy import ToolPolicy
 
-cache: dict[str, str] = {}
-MAX_RESULT_SIZE = 256
+# We store values in a byte-budgeted in-memory LRU store by default,
+# but any ResourceStore implementation (e.g. file based store) can be plugged in.
+store: ResourceStore = MemoryStore()
+# Results estimated above this many tokens are boxed; per-run thresholds are passed as `threshold=`.
+threshold: BoxingThreshold = BoxingThreshold()
+# Inline limit in characters of plain ASCII text under the default threshold.
+MAX_RESULT_SIZE = DEFAULT_MAX_RESULT_TOKENS * 4
+UNKNOWN_RESOURCE_ID = "Unknown resource ID"
+EXPIRED_RESOURCE_ID = "Expired resource ID"
+# Largest argument (in characters) that interpolating embedded references may produce.
+MAX_INTERPOLATED_CHARS = 16 * 1024 * 1024
+_DIGEST_SIZE = 16
+_DIGEST_CHUNK_CHARS = 1024 * 1024
+# Separate digest namespace, so raw bytes never collide with a text value.
+_BINARY_DIGEST_PERSON = b"binary"
+_BOXABLE_TYPES = (str, BinaryPayload, bytes, bytearray, memoryview)
+_V = TypeVar("_V")
 
 
-def _to_unsigned_64(value: int) -> int:
-    return value & ((1 << 64) - 1)
+def resource_id_for(value: str) -> str:
+    """Return the content-addressed resource URI of a value.
+
+    The id is a BLAKE2b digest of the UTF-8 payload, so it is identical in every process
+    and identical payloads share one stored copy.
+    """
+    digest = hashlib.blake2b(digest_size=_DIGEST_SIZE)
+    _update_digest(digest, value)
+    return f"internal://{digest.hexdigest()}"
+
+
+def resource_id_for_binary(payload: BinaryPayload) -> str:
+    """Return the content-addressed resource URI of a binary payload (bytes and MIME type)."""
+    digest = hashlib.blake2b(digest_size=_DIGEST_SIZE, person=_BINARY_DIGEST_PERSON)
+    digest.update(payload.mime_type.encode("utf-8") + b"\0")
+    digest.update(payload.data)
+    return f"internal://{digest.hexdigest()}"
+
+
+def _update_digest(digest: hashlib.blake2b, value: str) -> None:
+    # Encode piecewise so hashing never needs a full-size bytes copy of the value.
+    # UTF-8 encodes code point by code point, so hashing a value chunk by chunk yields the same id.
+    for index in range(0, len(value), _DIGEST_CHUNK_CHARS):
+        digest.update(value[index : index + _DIGEST_CHUNK_CHARS].encode("utf-8", "surrogatepass"))
+
+
+def _resolve_store(value: ResourceStore | None) -> ResourceStore:
+    return store if value is None else value
+
+
+def _resolve_threshold(value: BoxingThreshold | None) -> BoxingThreshold:
+    return threshold if value is None else value
+
+
+def _apply_policy(
+    policy: ToolPolicy | None, ttl: float | None, value: BoxingThreshold | None
+) -> tuple[float | None, BoxingThreshold]:
+    # An explicit per-call TTL (e.g. `--tool-ttl`) wins over the policy's.
+    limit = _resolve_threshold(value)
+    if policy is None:
+        return ttl, limit
+    return (policy.ttl if ttl is None else ttl), policy.threshold(limit)
+
+
+def _exceeds_binary(payload: BinaryPayload, limit: BoxingThreshold) -> bool:
+    # The threshold applies to the base64 text a model would see inline.
+    return base64_length(payload.size) > limit.max_chars or limit.exceeds(payload.to_base64())
+
+
+def _is_stored(target: ResourceStore, resource_id: str) -> bool:
+    # A re-boxed value is as fresh as a new one: stores with a recency order (`touch`) must not evict it next.
+    touch = getattr(target, "touch", None)
+    if touch is not None:
+        return touch(resource_id)
+    return resource_id in target
+
+
+async def _is_stored_async(target: AsyncResourceStore, resource_id: str) -> bool:
+    touch = getattr(target, "touch", None)
+    if touch is not None:
+        return await touch(resource_id)
+    return await target.contains(resource_id)
+
+
+def _resolve_async_store(value: ResourceStore | AsyncResourceStore | None) -> AsyncResourceStore:
+    return as_async_store(_resolve_store(value))
+
+
+def _sync_store(value: ResourceStore | AsyncResourceStore | None) -> ResourceStore | None:
+    """The synchronous store behind `value`, or None for natively asynchronous stores."""
+    if isinstance(value, AsyncStoreAdapter):
+        return value.inner
+    if is_async_store(value):
+        return None
+    return _resolve_store(value)
+
+
+def missing_resource_message(resource_uri: str, *, store: ResourceStore | None = None) -> str:
+    is_expired = getattr(_resolve_store(store), "is_expired", None)
+    if is_expired is not None and is_expired(resource_uri):
+        return EXPIRED_RESOURCE_ID
+    return UNKNOWN_RESOURCE_ID
+
+
+async def missing_resource_message_async(
+    resource_uri: str,
+    *,
+    store: ResourceStore | AsyncResourceStore | None = None,
+) -> str:
+    is_expired = getattr(_resolve_async_store(store), "is_expired", None)
+    if is_expired is not None and await is_expired(resource_uri):
+        return EXPIRED_RESOURCE_ID
+    return UNKNOWN_RESOURCE_ID
 
 
 def is_resource_id(value: str) -> bool:
-    if len(value) >= 512:
+    if len(value) >= MAX_RESOURCE_LINK_CHARS:
         return False
     return extract_resource_uri(value) is not None
 
 
-def unbox_value(value: str) -> str:
+def unbox_value(value: str, *, store: ResourceStore | None = None) -> str:
     resource_uri = extract_resource_uri(value)
     if resource_uri is None:
         return value
-    return cache.get(resource_uri, "Unknown resource ID")
+    resolved = _resolve_store(store).get(resource_uri)
+    if resolved is None:
+        return missing_resource_message(resource_uri, store=store)
+    return resolved
 
 
-def box_value(value: str, *, mode: BoxingMode = "opaque") -> str:
-    if len(value) > MAX_RESULT_SIZE:
-        resource_hash = _to_unsigned_64(hash(value))
-        resource_id = f"internal://{resource_hash:016x}"
-        # We store value in in-memory cache, but the client may have different implementation (e.g. file based store)
-        cache[resource_id] = value
-        if mode == "json":
-            return format_resource_link(resource_id)
-        return resource_id
+async def unbox_value_async(value: str, *, store: ResourceStore | AsyncResourceStore | None = None) -> str:
+    """`unbox_value` reading through the async store interface."""
+    resource_uri = extract_resource_uri(value)
+    if resource_uri is None:
+        return value
+    target = _resolve_async_store(store)
+    resolved = await target.get(resource_uri)
+    if resolved is None:
+        return await missing_resource_message_async(resource_uri, store=target)
+    return resolved
+
+
+def interpolate_references(value: str, *, store: ResourceStore | None = None) -> str:
+    """Replace every reference embedded in `value` (e.g. "Summary: internal://<id>") with its value.
+
+    The size of the result is computed from the stored lengths before any value is read, and a
+    result above `MAX_INTERPOLATED_CHARS` raises `ValueError`. Unresolvable references become the
+    usual missing-resource message.
+    """
+    references = find_embedded_resource_uris(value)
+    if not references:
+        return value
+    target = _resolve_store(store)
+    lengths = {uri: target.length(uri) for uri in dict.fromkeys(uri for _, _, uri in references)}
+    _check_interpolated_size(value, references, lengths)
+    texts: dict[str, str] = {}
+    for uri, length in lengths.items():
+        text = None if length is None else target.get(uri)
+        texts[uri] = missing_resource_message(uri, store=target) if text is None else text
+    return _splice(value, references, texts)
+
+
+async def interpolate_references_async(
+    value: str,
+    *,
+    store: ResourceStore | AsyncResourceStore | None = None,
+) -> str:
+    """`interpolate_references` reading through the async store interface."""
+    references = find_embedded_resource_uris(value)
+    if not references:
+        return value
+    target = _resolve_async_store(store)
+    lengths = {uri: await target.length(uri) for uri in dict.fromkeys(uri for _, _, uri in references)}
+    _check_interpolated_size(value, references, lengths)
+    texts: dict[str, str] = {}
+    for uri, length in lengths.items():
+        text = None if length is None else await target.get(uri)
+        texts[uri] = await missing_resource_message_async(uri, store=target) if text is None else text
+    return _splice(value, references, texts)
+
+
+def _check_interpolated_size(
+    value: str,
+    references: list[tuple[int, int, str]],
+    lengths: dict[str, int | None],
+) -> None:
+    # Missing references become a short message, which is negligible here.
+    size = len(value) + sum((lengths[uri] or 0) - (end - start) for start, end, uri in references)
+    if size > MAX_INTERPOLATED_CHARS:
+        raise ValueError(
+            f"Interpolating references would make an argument of {size} characters "
+            f"(limit {MAX_INTERPOLATED_CHARS}); pass the reference as a separate argument instead."
+        )
+
+
+def _splice(value: str, references: list[tuple[int, int, str]], texts: dict[str, str]) -> str:
+    # Collect the pieces and join once: repeated concatenation would copy the growing result per reference.
+    pieces: list[str] = []
+    position = 0
+    for start, end, uri in references:
+        pieces.append(value[position:start])
+        pieces.append(texts[uri])
+        position = end
+    pieces.append(value[position:])
+    return "".join(pieces)
+
+
+def unbox_lazy(value: str, *, store: ResourceStore | None = None) -> str | LazyValue:
+    """Like `unbox_value`, but resolve a reference to a `LazyValue` instead of reading the whole value."""
+    resource_uri = extract_resource_uri(value)
+    if resource_uri is None:
+        return value
+    target = _resolve_store(store)
+    length = target.length(resource_uri)
+    if length is None:
+        return missing_resource_message(resource_uri, store=store)
+    return LazyValue(target, resource_uri, length)
+
+
+def unbox_binary(value: str, *, store: ResourceStore | None = None) -> str | BinaryPayload:
+    """Like `unbox_value`, but resolve a binary reference to its raw bytes (a zero-copy view)."""
+    return _unbox_arg(value, store=store, lazy=False, binary=True)
+
+
+def _unbox_args(
+    func: Callable[..., object],
+    args: Sequence[object],
+    *,
+    store: ResourceStore | None,
+    lazy: bool,
+    interpolate: bool = False,
+) -> list[object]:
+    lazy = lazy and supports_lazy_values(func)
+    binary = supports_binary_values(func)
+    nested = supports_nested_values(func)
+    # A reference mentioned several times in one call is fetched once.
+    resolved: dict[str, str | LazyValue | BinaryPayload] = {}
+
+    def unbox(value: object) -> object:
+        if isinstance(value, str):
+            resource_uri = extract_resource_uri(value)
+            if resource_uri is None:
+                return interpolate_references(value, store=store) if interpolate else value
+            if resource_uri not in resolved:
+                resolved[resource_uri] = _unbox_arg(value, store=store, lazy=lazy, binary=binary)
+            return resolved[resource_uri]
+        if nested and isinstance(value, dict):
+            return {key: unbox(item) for key, item in value.items()}
+        if nested and isinstance(value, list):
+            return [unbox(item) for item in value]
+        if nested and isinstance(value, tuple):
+            return tuple(unbox(item) for item in value)
+        return value
+
+    return [unbox(arg) for arg in args]
+
+
+async def _unbox_args_async(
+    func: Callable[..., object],
+    args: Sequence[object],
+    *,
+    store: ResourceStore | AsyncResourceStore | None,
+    lazy: bool,
+    interpolate: bool = False,
+) -> list[object]:
+    lazy = lazy and supports_lazy_values(func)
+    binary = supports_binary_values(func)
+    sync_store = _sync_store(store)
+    if (lazy or binary) and sync_store is not None:
+        # Lazy values and zero-copy binary views read the synchronous store directly.
+        return await asyncio.to_thread(
+            _unbox_args, func, args, store=sync_store, lazy=lazy, interpolate=interpolate
+        )
+    nested = supports_nested_values(func)
+    resolved: dict[str, str | BinaryPayload] = {}
+
+    async def unbox(value: object) -> object:
+        if isinstance(value, str):
+            resource_uri = extract_resource_uri(value)
+            if resource_uri is None:
+                return await interpolate_references_async(value, store=store) if interpolate else value
+            if resource_uri not in resolved:
+                if binary:
+                    resolved[resource_uri] = await _unbox_binary_async(value, store=store)
+                else:
+                    resolved[resource_uri] = await unbox_value_async(value, store=store)
+            return resolved[resource_uri]
+        if nested and isinstance(value, dict):
+            return {key: await unbox(item) for key, item in value.items()}
+        if nested and isinstance(value, list):
+            return [await unbox(item) for item in value]
+        if nested and isinstance(value, tuple):
+            return tuple([await unbox(item) for item in value])
+        return value
+
+    return [await unbox(arg) for arg in args]
+
+
+async def _unbox_binary_async(
+    value: str,
+    *,
+    store: ResourceStore | AsyncResourceStore | None,
+) -> str | BinaryPayload:
+    resource_uri = extract_resource_uri(value)
+    if resource_uri is not None:
+        payload = await get_binary_async(_resolve_async_store(store), resource_uri)
+        if payload is not None:
+            return payload
+    return await unbox_value_async(value, store=store)
+
+
+def _unbox_arg(
+    value: str,
+    *,
+    store: ResourceStore | None,
+    lazy: bool,
+    binary: bool,
+) -> str | LazyValue | BinaryPayload:
+    if binary:
+        resource_uri = extract_resource_uri(value)
+        if resource_uri is not None:
+            payload = get_binary(_resolve_store(store), resource_uri)
+            if payload is not None:
+                return payload
+    if lazy:
+        return unbox_lazy(value, store=store)
+    return unbox_value(value, store=store)
+
+
+def box_value(
+    value: str | BinaryPayload | bytes | bytearray | memoryview,
+    *,
+    mode: BoxingMode = "opaque",
+    store: ResourceStore | None = None,
+    ttl: float | None = None,
+    tool: str | None = None,
+    threshold: BoxingThreshold | None = None,
+    policy: ToolPolicy | None = None,
+    preview: bool = False,
+) -> str:
+    ttl, limit = _apply_policy(policy, ttl, threshold)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        value = BinaryPayload(value)
+    if isinstance(value, BinaryPayload):
+        return _box_binary(
+            value, mode=mode, store=store, ttl=ttl, tool=tool, threshold=limit, policy=policy, preview=preview
+        )
+    if limit.exceeds(value):
+        resource_id = resource_id_for(value)
+        target = _resolve_store(store)
+        # Content-addressed ids: an identical payload is already stored, so keep the existing copy.
+        if not _is_stored(target, resource_id):
+            target.put(resource_id, value)
+        summary = describe_value(value, limit.counter) if preview else None
+        return _reference(resource_id, target, mode=mode, ttl=ttl, tool=tool, policy=policy, preview=summary)
     return value
 
 
+def _box_binary(
+    payload: BinaryPayload,
+    *,
+    mode: BoxingMode,
+    store: ResourceStore | None,
+    ttl: float | None,
+    tool: str | None,
+    threshold: BoxingThreshold,
+    policy: ToolPolicy | None,
+    preview: bool,
+) -> str:
+    if not _exceeds_binary(payload, threshold):
+        return payload.to_base64()
+    resource_id = resource_id_for_binary(payload)
+    target = _resolve_store(store)
+    if not _is_stored(target, resource_id):
+        put_binary(target, resource_id, payload)
+    summary = describe_binary(payload) if preview else None
+    return _reference(resource_id, target, mode=mode, ttl=ttl, tool=tool, policy=policy, preview=summary)
+
+
+async def box_value_async(
+    value: str | BinaryPayload | bytes | bytearray | memoryview,
+    *,
+    mode: BoxingMode = "opaque",
+    store: ResourceStore | AsyncResourceStore | None = None,
+    ttl: float | None = None,
+    tool: str | None = None,
+    threshold: BoxingThreshold | None = None,
+    policy: ToolPolicy | None = None,
+    preview: bool = False,
+) -> str:
+    """`box_value` writing through the async store interface."""
+    ttl, limit = _apply_policy(policy, ttl, threshold)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        value = BinaryPayload(value)
+    if isinstance(value, BinaryPayload):
+        if not _exceeds_binary(value, limit):
+            return value.to_base64()
+        resource_id = await _digest_async(resource_id_for_binary, value, value.size)
+        target = _resolve_async_store(store)
+        if not await _is_stored_async(target, resource_id):
+            await put_binary_async(target, resource_id, value)
+        summary = describe_binary(value) if preview else None
+        return await _reference_async(
+            resource_id, target, mode=mode, ttl=ttl, tool=tool, policy=policy, preview=summary
+        )
+    if limit.exceeds(value):
+        resource_id = await _digest_async(resource_id_for, value, len(value))
+        target = _resolve_async_store(store)
+        if not await _is_stored_async(target, resource_id):
+            await target.put(resource_id, value)
+        summary = describe_value(value, limit.counter) if preview else None
+        return await _reference_async(
+            resource_id, target, mode=mode, ttl=ttl, tool=tool, policy=policy, preview=summary
+        )
+    return value
+
+
+async def _digest_async(digest: Callable[[_V], str], value: _V, size: int) -> str:
+    # Hashing a multi-megabyte value would stall the event loop; hash it in a worker thread instead.
+    if size > _DIGEST_CHUNK_CHARS:
+        return await asyncio.to_thread(digest, value)
+    return digest(value)
+
+
+def box_stream(
+    chunks: Iterable[str],
+    *,
+    mode: BoxingMode = "opaque",
+    store: ResourceStore | None = None,
+    ttl: float | None = None,
+    tool: str | None = None,
+    threshold: BoxingThreshold | None = None,
+    policy: ToolPolicy | None = None,
+    preview: bool = False,
+) -> str:
+    """Box a value produced in chunks without materializing it.
+
+    Chunks are buffered only until they exceed the boxing threshold; from then on
+    they go straight into the store, so peak memory is bounded by the chunk size (for backends
+    that can stream). The result is the same as `box_value("".join(chunks))`.
+    """
+    ttl, limit = _apply_policy(policy, ttl, threshold)
+    iterator = iter(chunks)
+    head: list[str] = []
+    size = 0
+    for chunk in iterator:
+        head.append(chunk)
+        size += len(chunk)
+        if limit.exceeds_parts(head, size):
+            break
+    else:
+        return box_value(
+            "".join(head), mode=mode, store=store, ttl=ttl, tool=tool, threshold=limit, policy=policy, preview=preview
+        )
+    target = _resolve_store(store)
+    stream = _StreamingBox(target, PreviewBuilder(limit.counter) if preview else None)
+    try:
+        for chunk in chain(head, iterator):
+            stream.write(chunk)
+        resource_id = stream.commit()
+    except BaseException:
+        stream.abort()
+        raise
+    return _reference(resource_id, target, mode=mode, ttl=ttl, tool=tool, policy=policy, preview=stream.preview())
+
+
+async def box_stream_async(
+    chunks: AsyncIterable[str],
+    *,
+    mode: BoxingMode = "opaque",
+    store: ResourceStore | AsyncResourceStore | None = None,
+    ttl: float | None = None,
+    tool: str | None = None,
+    threshold: BoxingThreshold | None = None,
+    policy: ToolPolicy | None = None,
+    preview: bool = False,
+) -> str:
+    """Async-iterator counterpart of `box_stream`, writing through the async store interface."""
+    ttl, limit = _apply_policy(policy, ttl, threshold)
+    iterator = aiter(chunks)
+    head: list[str] = []
+    size = 0
+    async for chunk in iterator:
+        head.append(chunk)
+        size += len(chunk)
+        if limit.exceeds_parts(head, size):
+            break
+    else:
+        return await box_value_async(
+            "".join(head), mode=mode, store=store, ttl=ttl, tool=tool, threshold=limit, policy=policy, preview=preview
+        )
+    target = _resolve_async_store(store)
+    stream = _AsyncStreamingBox(target, PreviewBuilder(limit.counter) if preview else None)
+    try:
+        for chunk in head:
+            await stream.write(chunk)
+        async for chunk in iterator:
+            await stream.write(chunk)
+        resource_id = await stream.commit()
+    except BaseException:
+        await stream.abort()
+        raise
+    return await _reference_async(
+        resource_id, target, mode=mode, ttl=ttl, tool=tool, policy=policy, preview=stream.preview()
+    )
+
+
+async def _iterate_in_thread(chunks: Iterable[str]) -> AsyncIterator[str]:
+    # A sync generator may block between chunks, so each chunk is produced in a worker thread.
+    iterator = iter(chunks)
+    done = object()
+    while (chunk := await asyncio.to_thread(next, iterator, done)) is not done:
+        yield chunk
+
+
+class _StreamingBox:
+    """Hashes chunks for the content-addressed id (and collects their preview) while writing them to the store."""
+
+    def __init__(self, target: ResourceStore, preview: PreviewBuilder | None = None) -> None:
+        self._digest = hashlib.blake2b(digest_size=_DIGEST_SIZE)
+        self._writer = open_writer(target)
+        self._preview = preview
+
+    def write(self, chunk: str) -> None:
+        if chunk:
+            _update_digest(self._digest, chunk)
+            self._writer.write(chunk)
+            if self._preview is not None:
+                self._preview.feed(chunk)
+
+    def preview(self) -> ResourcePreview | None:
+        return None if self._preview is None else self._preview.build()
+
+    def commit(self) -> str:
+        resource_id = f"internal://{self._digest.hexdigest()}"
+        self._writer.commit(resource_id)
+        return resource_id
+
+    def abort(self) -> None:
+        self._writer.abort()
+
+
+class _AsyncStreamingBox:
+    def __init__(self, target: AsyncResourceStore, preview: PreviewBuilder | None = None) -> None:
+        self._digest = hashlib.blake2b(digest_size=_DIGEST_SIZE)
+        self._writer = open_async_writer(target)
+        self._preview = preview
+
+    async def write(self, chunk: str) -> None:
+        if chunk:
+            _update_digest(self._digest, chunk)
+            await self._writer.write(chunk)
+            if self._preview is not None:
+                self._preview.feed(chunk)
+
+    def preview(self) -> ResourcePreview | None:
+        return None if self._preview is None else self._preview.build()
+
+    async def commit(self) -> str:
+        resource_id = f"internal://{self._digest.hexdigest()}"
+        await self._writer.commit(resource_id)
+        return resource_id
+
+    async def abort(self) -> None:
+        await self._writer.abort()
+
+
+def _reference(
+    resource_id: str,
+    target: ResourceStore,
+    *,
+    mode: BoxingMode,
+    ttl: float | None,
+    tool: str | None,
+    policy: ToolPolicy | None,
+    preview: ResourcePreview | None,
+) -> str:
+    # Only expiring stores support TTLs; a per-call TTL overrides the store default.
+    set_ttl = getattr(target, "set_ttl", None)
+    if ttl is not None and set_ttl is not None:
+        set_ttl(resource_id, ttl)
+    # Accounting stores attribute the stored bytes to the tool that produced them.
+    record_producer = getattr(target, "record_producer", None)
+    if tool is not None and record_producer is not None:
+        record_producer(resource_id, tool)
+    if policy is not None:
+        # Storage hints only apply where the store has the matching capability.
+        set_compression = getattr(target, "set_compression", None)
+        if policy.compression is not None and set_compression is not None:
+            set_compression(resource_id, policy.compression)
+        build_indexes = getattr(target, "build_indexes", None)
+        if policy.indexes and build_indexes is not None:
+            build_indexes(resource_id, policy.indexes)
+    if preview is not None:
+        return format_resource_preview(resource_id, preview, mode)
+    if mode == "json":
+        return format_resource_link(resource_id)
+    return resource_id
+
+
+async def _reference_async(
+    resource_id: str,
+    target: AsyncResourceStore,
+    *,
+    mode: BoxingMode,
+    ttl: float | None,
+    tool: str | None,
+    policy: ToolPolicy | None,
+    preview: ResourcePreview | None,
+) -> str:
+    set_ttl = getattr(target, "set_ttl", None)
+    if ttl is not None and set_ttl is not None:
+        await set_ttl(resource_id, ttl)
+    record_producer = getattr(target, "record_producer", None)
+    if tool is not None and record_producer is not None:
+        await record_producer(resource_id, tool)
+    if policy is not None:
+        set_compression = getattr(target, "set_compression", None)
+        if policy.compression is not None and set_compression is not None:
+            await set_compression(resource_id, policy.compression)
+        build_indexes = getattr(target, "build_indexes", None)
+        if policy.indexes and build_indexes is not None:
+            await build_indexes(resource_id, policy.indexes)
+    if preview is not None:
+        return format_resource_preview(resource_id, preview, mode)
+    if mode == "json":
+        return format_resource_link(resource_id)
+    return resource_id
+
+
 # ==> This is the core of the Tool Context Relay <==
 # We are unboxing input arguments (resolving potential resource IDs to full text)
 # and boxing output values (storing large outputs and returning resource IDs instead)
-def tool_relay(func: Callable[..., str], args: Sequence[str], *, mode: BoxingMode = "opaque") -> str:
-    relayed_args = [unbox_value(arg) for arg in args]
+# Tools may return the whole value, a `BinaryPayload`, or yield text chunks (a generator) boxed as it streams.
+# With `lazy=True`, tools marked with `accepts_lazy_values` get store-backed `LazyValue` arguments;
+# tools marked with `accepts_binary_values` get binary references as raw bytes.
+def tool_relay(
+    func: Callable[..., str | BinaryPayload | Iterable[str]],
+    args: Sequence[object],
+    *,
+    mode: BoxingMode = "opaque",
+    store: ResourceStore | None = None,
+    ttl: float | None = None,
+    tool: str | None = None,
+    lazy: bool = False,
+    interpolate: bool = False,
+    threshold: BoxingThreshold | None = None,
+    policy: ToolPolicy | None = None,
+    preview: bool = False,
+) -> str:
+    """Unbox `args`, call `func` and box its result.
+
+    With `interpolate`, references embedded in larger string arguments are spliced in as well
+    (see `interpolate_references`). A `policy` decides how this tool's result is boxed and stored.
+    With `preview`, a boxed result comes with its length, line count, content type, head and tail
+    (see `tool_context_relay.preview`), so a model rarely needs to read it just to orient itself.
+    """
+    relayed_args = _unbox_args(func, args, store=store, lazy=lazy, interpolate=interpolate)
     value = func(*relayed_args)
-    return box_value(value, mode=mode)
+    if isinstance(value, _BOXABLE_TYPES):
+        return box_value(
+            value, mode=mode, store=store, ttl=ttl, tool=tool, threshold=threshold, policy=policy, preview=preview
+        )
+    if isinstance(value, AsyncIterable) or inspect.isawaitable(value):
+        raise TypeError(f"{getattr(func, '__name__', func)!r} is asynchronous; use tool_relay_async")
+    return box_stream(
+        value, mode=mode, store=store, ttl=ttl, tool=tool, threshold=threshold, policy=policy, preview=preview
+    )
+
+
+async def tool_relay_async(
+    func: Callable[..., str | BinaryPayload | Iterable[str] | AsyncIterable[str] | Awaitable[str | BinaryPayload]],
+    args: Sequence[object],
+    *,
+    mode: BoxingMode = "opaque",
+    store: ResourceStore | AsyncResourceStore | None = None,
+    ttl: float | None = None,
+    tool: str | None = None,
+    lazy: bool = False,
+    interpolate: bool = False,
+    threshold: BoxingThreshold | None = None,
+    policy: ToolPolicy | None = None,
+    preview: bool = False,
+) -> str:
+    """`tool_relay` for coroutine functions and async generators (sync tools are accepted too).
+
+    Store I/O goes through the async store interface and sync tools run in a worker thread,
+    so neither a slow backend nor a slow tool blocks the event loop.
+    """
+    relayed_args = await _unbox_args_async(func, args, store=store, lazy=lazy, interpolate=interpolate)
+    if inspect.iscoroutinefunction(func) or inspect.isasyncgenfunction(func):
+        value = func(*relayed_args)
+    else:
+        value = await asyncio.to_thread(func, *relayed_args)
+    if inspect.isawaitable(value):
+        value = await value
+    if isinstance(value, _BOXABLE_TYPES):
+        return await box_value_async(
+            value, mode=mode, store=store, ttl=ttl, tool=tool, threshold=threshold, policy=policy, preview=preview
+        )
+    if not isinstance(value, AsyncIterable):
+        value = _iterate_in_thread(value)
+    return await box_stream_async(
+        value, mode=mode, store=store, ttl=ttl, tool=tool, threshold=threshold, policy=policy, preview=preview
+    )
@@ -0,0 +1,174 @@
+import asyncio
+import io
+import json
+import re
+import sys
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from tool_context_relay.cli import main
+from tool_context_relay.store import (
+    AccountingStore,
+    BinaryPayload,
+    MemoryStore,
+    RemoteStore,
+    StoreConfig,
+    create_store,
+    format_report,
+)
+from tool_context_relay.store.server import StoreServer
+from tool_context_relay.tools.tool_relay import box_stream, box_value, tool_relay, tool_relay_async
+
+PAGE = "".join(f"line {index}\n" for index in range(100))
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class AccountingStoreTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = _Clock()
+        self.store = AccountingStore(MemoryStore(), clock=self.clock)
+
+    def test_bytes_are_attributed_to_the_producing_tool(self):
+        page_id = tool_relay(lambda: PAGE, [], store=self.store, tool="get_page")
+        tool_relay(lambda: "é" * 300, [], store=self.store, tool="get_name")
+        box_stream(iter([PAGE, PAGE]), store=self.store, tool="get_page")
+        box_value(BinaryPayload(b"\x00" * 400, "image/png"), store=self.store)
+
+        report = self.store.report()
+
+        self.assertEqual(report.resources, 4)
+        self.assertEqual(report.bytes_by_tool, {"get_page": 3 * len(PAGE), "get_name": 600, "(unknown)": 400})
+        self.assertEqual(report.resources_by_tool["get_page"], 2)
+        self.assertEqual(report.total_bytes, 3 * len(PAGE) + 1000)
+        self.assertEqual(report.max_bytes, 2 * len(PAGE))
+        self.assertEqual(report.largest[0].tool, "get_page")
+        self.assertEqual(self.store.usage(page_id).payload_bytes, len(PAGE))
+
+    def test_async_relay_records_the_producing_tool(self):
+        resource_id = asyncio.run(tool_relay_async(lambda: PAGE, [], store=self.store, tool="get_page"))
+        self.assertEqual(self.store.usage(resource_id).tool, "get_page")
+
+    def test_reads_are_counted(self):
+        resource_id = box_value(PAGE, store=self.store, tool="get_page")
+        self.store.read_lines(resource_id, 0, 5)
+        self.store.search_lines(resource_id, re.compile("line 7"))
+        self.store.get(resource_id)
+        self.store.length(resource_id)
+        self.store.get("internal://missing")
+
+        usage = self.store.usage(resource_id)
+        report = self.store.report()
+
+        self.assertEqual(usage.accesses, 3)
+        self.assertEqual(usage.last_access, self.clock.now)
+        self.assertEqual(report.accesses_by_tool, {"get_page": 3})
+        self.assertEqual(report.unread, 0)
+
+    def test_storing_the_same_value_again_keeps_its_history(self):
+        resource_id = box_value(PAGE, store=self.store, tool="get_page")
+        self.store.get(resource_id)
+        self.clock.now += 120
+        box_value(PAGE, store=self.store, tool="get_page")
+
+        usage = self.store.usage(resource_id)
+        self.assertEqual((usage.created_at, usage.accesses), (1000.0, 1))
+
+    def test_age_buckets(self):
+        box_value("a" * 300, store=self.store)
+        self.clock.now += 300
+        box_value("b" * 300, store=self.store)
+        self.clock.now += 7200
+
+        buckets = self.store.report().age_buckets
+
+        self.assertEqual(buckets, {"<1m": 0, "<10m": 0, "<1h": 0, "<1d": 2, ">=1d": 0})
+
+    def test_values_dropped_by_the_inner_store_leave_the_report(self):
+        store = AccountingStore(MemoryStore(max_bytes=700))
+        first = box_value("a" * 300, store=store)
+        second = box_value("b" * 300, store=store)
+        box_value("c" * 300, store=store)
+        store.delete(second)
+
+        report = store.report()
+
+        self.assertNotIn(first, store)
+        self.assertEqual(report.resources, 1)
+        self.assertIsNone(store.usage(first))
+
+    def test_records_of_evicted_values_are_pruned_without_a_report(self):
+        with patch("tool_context_relay.store.accounting._PRUNE_MIN_RECORDS", 8):
+            store = AccountingStore(MemoryStore(max_bytes=700))
+            for index in range(100):
+                box_value(f"{index:03d}" * 100, store=store)
+
+        self.assertLess(len(store._usage), 8)
+        self.assertIsNotNone(store.usage(box_value("099" * 100, store=store)))
+
+    def test_index_overhead_is_reported(self):
+        resource_id = box_value(PAGE, store=self.store)
+        self.assertEqual(self.store.report().index_bytes, 0)
+
+        self.store.read_lines(resource_id, 0, 1)
+
+        self.assertGreater(self.store.report().index_bytes, 0)
+        self.assertIn("index bytes:", format_report(self.store.report()))
+
+    def test_config_wraps_the_store(self):
+        store = create_store(StoreConfig(kind="memory", ttl=60, accounting=True))
+        try:
+            self.assertIsInstance(store, AccountingStore)
+            resource_id = box_value(PAGE, store=store, ttl=5)
+            self.assertFalse(store.is_expired(resource_id))
+        finally:
+            store.close()
+
+
+class RemoteReportTests(unittest.TestCase):
+    def test_report_round_trips_through_the_server(self):
+        backend = AccountingStore(MemoryStore())
+        server = StoreServer(backend, "127.0.0.1:0")
+        server.start_in_thread()
+        client = RemoteStore(server.address)
+        try:
+            tool_relay(lambda: PAGE, [], store=client, tool="get_page")
+
+            report = client.report()
+
+            self.assertEqual(report, backend.report())
+            self.assertEqual(report.bytes_by_tool, {"get_page": len(PAGE)})
+
+            stdout = io.StringIO()
+            with redirect_stdout(stdout):
+                code = main(["stats", server.address, "--json"])
+            self.assertEqual(code, 0)
+            self.assertEqual(json.loads(stdout.getvalue())["resources"], 1)
+        finally:
+            client.close()
+            server.stop()
+
+    def test_server_without_accounting_reports_an_error(self):
+        server = StoreServer(MemoryStore(), "127.0.0.1:0")
+        server.start_in_thread()
+        client = RemoteStore(server.address)
+        try:
+            with self.assertRaises(RuntimeError):
+                client.report()
+        finally:
+            client.close()
+            server.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
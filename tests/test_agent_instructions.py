@@ -1,3 +1,4 @@
+import asyncio
 import sys
 from pathlib import Path
 
@@ -81,10 +82,10 @@ def test_internal_resource_tools_resolve_boxed_values() -> None:
     resource_id = box_value(value)
     assert resource_id.startswith("internal://")
 
-    assert internal_resource_length(None, resource_id) == str(len(value))
-    assert internal_resource_read(None, resource_id) == value
-    assert internal_resource_read_slice(None, resource_id, 10, 5) == value[10:15]
-    assert internal_resource_read_slice(None, resource_id, -1, 1) == value[-1:]
+    assert asyncio.run(internal_resource_length(None, resource_id)) == str(len(value))
+    assert asyncio.run(internal_resource_read(None, resource_id)) == value
+    assert asyncio.run(internal_resource_read_slice(None, resource_id, 10, 5)) == value[10:15]
+    assert asyncio.run(internal_resource_read_slice(None, resource_id, -1, 1)) == value[-1:]
 
 
 def test_internal_resource_tools_accept_json_boxing() -> None:
@@ -98,7 +99,7 @@ def test_internal_resource_tools_accept_json_boxing() -> None:
     value = "x" * 2048
     boxed = box_value(value, mode="json")
 
-    assert internal_resource_length(None, boxed) == str(len(value))
-    assert internal_resource_read(None, boxed) == value
-    assert internal_resource_read_slice(None, boxed, 10, 5) == value[10:15]
-    assert internal_resource_read_slice(None, boxed, -1, 1) == value[-1:]
+    assert asyncio.run(internal_resource_length(None, boxed)) == str(len(value))
+    assert asyncio.run(internal_resource_read(None, boxed)) == value
+    assert asyncio.run(internal_resource_read_slice(None, boxed, 10, 5)) == value[10:15]
+    assert asyncio.run(internal_resource_read_slice(None, boxed, -1, 1)) == value[-1:]
@@ -0,0 +1,202 @@
+import asyncio
+import re
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from tool_context_relay.store import BinaryPayload, DiskSpillStore, ExpiringStore, MemoryStore
+from tool_context_relay.store.aio import AsyncStoreAdapter, as_async_store
+from tool_context_relay.tools.tool_relay import (
+    EXPIRED_RESOURCE_ID,
+    box_stream_async,
+    box_value_async,
+    resource_id_for,
+    tool_relay_async,
+    unbox_value_async,
+)
+
+
+class _DictAsyncStore:
+    """Minimal natively asynchronous store (no streaming writer, no binary support)."""
+
+    def __init__(self) -> None:
+        self.values: dict[str, str] = {}
+
+    async def contains(self, resource_id):
+        return resource_id in self.values
+
+    async def put(self, resource_id, value):
+        self.values[resource_id] = value
+
+    async def get(self, resource_id):
+        return self.values.get(resource_id)
+
+
+class AsyncStoreAdapterTests(unittest.TestCase):
+    def test_adapter_offloads_a_disk_store(self):
+        with tempfile.TemporaryDirectory() as directory:
+            disk = DiskSpillStore(directory, spill_threshold=16)
+            store = as_async_store(disk)
+            self.assertIsInstance(store, AsyncStoreAdapter)
+
+            async def scenario():
+                await store.put("internal://a", "first\nsecond needle\nthird")
+                return (
+                    await store.contains("internal://a"),
+                    await store.read_slice("internal://a", 6, 12),
+                    await store.read_lines("internal://a", 1, 3),
+                    await store.search_lines("internal://a", re.compile("needle")),
+                    await store.delete("internal://a"),
+                    await store.get("internal://a"),
+                )
+
+            self.assertEqual(
+                asyncio.run(scenario()),
+                (True, "second", ["second needle", "third"], [1], True, None),
+            )
+            disk.close()
+
+    def test_memory_store_runs_only_small_calls_on_the_event_loop(self):
+        threads: dict[str, bool] = {}
+
+        class RecordingStore(MemoryStore):
+            def _record(self, name):
+                threads[name] = threading.current_thread() is threading.main_thread()
+
+            def get(self, resource_id):
+                self._record(f"get {resource_id}")
+                return super().get(resource_id)
+
+            def read_slice(self, resource_id, start, end):
+                self._record(f"read_slice {end - start}")
+                return super().read_slice(resource_id, start, end)
+
+            def search_lines(self, resource_id, pattern):
+                self._record("search_lines")
+                return super().search_lines(resource_id, pattern)
+
+            def build_indexes(self, resource_id, kinds):
+                self._record("build_indexes")
+                super().build_indexes(resource_id, kinds)
+
+            def __contains__(self, resource_id):
+                self._record("contains")
+                return super().__contains__(resource_id)
+
+        store = as_async_store(RecordingStore())
+
+        async def scenario():
+            await store.put("internal://small", "small value")
+            await store.put("internal://large", "large line\n" * 100_000)
+            await store.contains("internal://small")
+            await store.get("internal://small")
+            await store.get("internal://large")
+            await store.read_slice("internal://large", 0, 100)
+            await store.read_slice("internal://large", 0, 1_000_000)
+            await store.search_lines("internal://small", re.compile("small"))
+            await store.build_indexes("internal://small", ("lines",))
+
+        asyncio.run(scenario())
+        self.assertEqual(
+            threads,
+            {
+                "contains": True,
+                "get internal://small": True,
+                "get internal://large": False,
+                "read_slice 100": True,
+                "read_slice 1000000": False,
+                "search_lines": False,
+                "build_indexes": False,
+            },
+        )
+
+    def test_async_stores_are_used_as_is(self):
+        store = _DictAsyncStore()
+        self.assertIs(as_async_store(store), store)
+
+        value = "x" * 1000
+        resource_id = asyncio.run(box_value_async(value, store=store))
+
+        self.assertEqual(store.values, {resource_id: value})
+        self.assertEqual(asyncio.run(unbox_value_async(resource_id, store=store)), value)
+
+    def test_stream_into_store_without_writer_is_buffered(self):
+        async def chunks():
+            for _ in range(100):
+                yield "abcdefgh"
+
+        store = _DictAsyncStore()
+        resource_id = asyncio.run(box_stream_async(chunks(), store=store))
+
+        self.assertEqual(resource_id, resource_id_for("abcdefgh" * 100))
+        self.assertEqual(store.values[resource_id], "abcdefgh" * 100)
+
+    def test_binary_payload_falls_back_to_base64_text(self):
+        payload = BinaryPayload(bytes(range(256)) * 4, "image/png")
+        store = _DictAsyncStore()
+
+        resource_id = asyncio.run(box_value_async(payload, store=store))
+
+        self.assertEqual(store.values[resource_id], payload.to_base64())
+
+    def test_ttl_and_expiry_go_through_the_adapter(self):
+        now = [0.0]
+        store = ExpiringStore(MemoryStore(), default_ttl=100, clock=lambda: now[0])
+
+        resource_id = asyncio.run(box_value_async("y" * 1000, store=store, ttl=5))
+        now[0] = 10.0
+
+        self.assertEqual(asyncio.run(unbox_value_async(resource_id, store=store)), EXPIRED_RESOURCE_ID)
+
+
+class AsyncToolRelayTests(unittest.TestCase):
+    def test_sync_tools_run_off_the_event_loop(self):
+        # Both tools wait for each other: they only finish if they run concurrently in worker threads.
+        barrier = threading.Barrier(2, timeout=5)
+
+        def slow_tool(text):
+            barrier.wait()
+            return text * 300
+
+        async def scenario():
+            return await asyncio.gather(
+                tool_relay_async(slow_tool, ["a"], store=store),
+                tool_relay_async(slow_tool, ["b"], store=store),
+            )
+
+        store = MemoryStore()
+        first, second = asyncio.run(scenario())
+
+        self.assertEqual(store.get(first), "a" * 300)
+        self.assertEqual(store.get(second), "b" * 300)
+
+    def test_sync_generators_are_streamed_from_a_worker_thread(self):
+        loop_thread = threading.get_ident()
+        producers: set[int] = set()
+
+        def produce(text):
+            for _ in range(100):
+                producers.add(threading.get_ident())
+                yield text
+
+        store = MemoryStore()
+        resource_id = asyncio.run(tool_relay_async(produce, ["abc"], store=store))
+
+        self.assertEqual(store.get(resource_id), "abc" * 100)
+        self.assertNotIn(loop_thread, producers)
+
+    def test_references_are_unboxed_from_an_async_store(self):
+        store = _DictAsyncStore()
+        resource_id = asyncio.run(box_value_async("z" * 500, store=store))
+
+        result = asyncio.run(tool_relay_async(lambda text: str(len(text)), [resource_id], store=store))
+
+        self.assertEqual(result, "500")
+
+
+if __name__ == "__main__":
+    unittest.main()
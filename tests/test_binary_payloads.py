@@ -0,0 +1,106 @@
+import asyncio
+import base64
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from tool_context_relay.agent.agent import get_web_screenshot, internal_resource_read, internal_resource_read_slice
+from tool_context_relay.agent.context import RelayContext
+from tool_context_relay.store import BinaryPayload, CompressedStore, ExpiringStore, MemoryStore
+from tool_context_relay.store.binary import base64_length, base64_slice
+from tool_context_relay.tools.binary import accepts_binary_values
+from tool_context_relay.tools.mcp_web_screenshot import _SCREENSHOT_BASE64
+from tool_context_relay.tools.tool_relay import box_value, resource_id_for, tool_relay, unbox_binary, unbox_value
+
+DATA = bytes(range(256)) * 8
+
+
+class Base64HelpersTests(unittest.TestCase):
+    def test_length_and_slices_match_full_encoding(self):
+        for size in (0, 1, 2, 3, 4, 5, 100):
+            data = DATA[:size]
+            encoded = base64.b64encode(data).decode("ascii")
+            with self.subTest(size=size):
+                self.assertEqual(base64_length(size), len(encoded))
+                for start in range(0, len(encoded) + 2, 3):
+                    for end in range(start, len(encoded) + 3, 5):
+                        self.assertEqual(base64_slice(data, start, end), encoded[start:end])
+
+
+class BinaryBoxingTests(unittest.TestCase):
+    def setUp(self):
+        self.store = MemoryStore()
+        self.payload = BinaryPayload(DATA, "image/png")
+        self.encoded = base64.b64encode(DATA).decode("ascii")
+
+    def test_stores_raw_bytes_and_serves_base64_text(self):
+        resource_id = box_value(self.payload, store=self.store)
+
+        self.assertLess(self.store.stats().total_bytes, len(self.encoded))
+        self.assertEqual(unbox_value(resource_id, store=self.store), self.encoded)
+        self.assertEqual(self.store.length(resource_id), len(self.encoded))
+        self.assertEqual(self.store.read_slice(resource_id, 10, 50), self.encoded[10:50])
+        self.assertEqual(self.store.read_lines(resource_id, 0, 5), [self.encoded])
+
+    def test_small_payloads_stay_inline_as_base64(self):
+        self.assertEqual(box_value(b"\x00\x01", store=self.store), "AAE=")
+        self.assertEqual(self.store.stats().entries, 0)
+
+    def test_binary_ids_are_content_addressed_per_mime_type(self):
+        resource_id = box_value(self.payload, store=self.store)
+
+        self.assertEqual(box_value(BinaryPayload(bytearray(DATA), "image/png"), store=self.store), resource_id)
+        self.assertNotEqual(box_value(BinaryPayload(DATA, "image/jpeg"), store=self.store), resource_id)
+        self.assertNotEqual(resource_id, resource_id_for(self.encoded))
+        self.assertEqual(self.store.stats().entries, 2)
+
+    def test_binary_tools_get_zero_copy_bytes(self):
+        resource_id = box_value(self.payload, store=self.store)
+        received = []
+
+        @accepts_binary_values
+        def consume(image):
+            received.append(image)
+            return "ok"
+
+        def consume_text(image):
+            received.append(image)
+            return "ok"
+
+        tool_relay(consume, [resource_id], store=self.store)
+        tool_relay(consume_text, [resource_id], store=self.store)
+
+        payload, text = received
+        self.assertIsInstance(payload.data, memoryview)
+        self.assertIs(payload.data.obj, self.store.get_binary(resource_id).data.obj)
+        self.assertEqual(payload.mime_type, "image/png")
+        self.assertEqual(text, self.encoded)
+
+    def test_stores_without_binary_support_fall_back_to_base64(self):
+        store = CompressedStore()
+        resource_id = box_value(self.payload, store=store)
+
+        self.assertEqual(store.get(resource_id), self.encoded)
+        self.assertEqual(unbox_binary(resource_id, store=store), self.encoded)
+
+    def test_expiring_store_forwards_binary_values(self):
+        store = ExpiringStore(MemoryStore(), default_ttl=60)
+        resource_id = box_value(self.payload, store=store)
+
+        self.assertEqual(bytes(unbox_binary(resource_id, store=store).data), DATA)
+        store.close()
+
+    def test_screenshot_tool_boxes_png_bytes(self):
+        ctx = SimpleNamespace(context=RelayContext())
+        resource_id = asyncio.run(get_web_screenshot(ctx))
+
+        self.assertTrue(resource_id.startswith("internal://"))
+        self.assertEqual(asyncio.run(internal_resource_read(ctx, resource_id)), _SCREENSHOT_BASE64)
+        self.assertEqual(asyncio.run(internal_resource_read_slice(ctx, resource_id, -10, 10)), _SCREENSHOT_BASE64[-10:])
+
+
+if __name__ == "__main__":
+    unittest.main()
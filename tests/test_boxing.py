@@ -0,0 +1,59 @@
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from tool_context_relay import boxing
+from tool_context_relay.boxing import extract_resource_uri, format_resource_link
+from tool_context_relay.store import MemoryStore
+from tool_context_relay.tools.tool_relay import box_value, is_resource_id, unbox_value
+
+
+class ExtractResourceUriTests(unittest.TestCase):
+    def setUp(self) -> None:
+        boxing._parse_resource_link_json.cache_clear()
+
+    def test_bare_and_canonical_links_are_detected_without_json(self):
+        link = format_resource_link("internal://abc123")
+        with patch.object(boxing.json, "loads", side_effect=AssertionError("parsed")):
+            self.assertEqual(extract_resource_uri("internal://abc123"), "internal://abc123")
+            self.assertEqual(extract_resource_uri(link), "internal://abc123")
+
+    def test_plain_values_are_rejected_without_json(self):
+        values = ["", "hello", "x" * 1_000_000, "{" + "x" * 1_000_000, '["internal://abc"]']
+        with patch.object(boxing.json, "loads", side_effect=AssertionError("parsed")):
+            for value in values:
+                with self.subTest(value=value[:20]):
+                    self.assertIsNone(extract_resource_uri(value))
+                    self.assertFalse(is_resource_id(value))
+
+    def test_other_json_spellings_are_still_accepted(self):
+        for value, expected in [
+            ('{"uri": "internal://abc", "type": "resource_link"}', "internal://abc"),
+            (' {"type":"resource_link","uri":"internal:\\/\\/abc"}', "internal://abc"),
+            ('{"type":"resource_link","uri":"internal://a\\"b"}', 'internal://a"b'),
+            ('{"type":"resource_link","uri":"https://abc"}', None),
+            ('{"type":"resource_link","uri":"internal://abc","x":1}', None),
+            ('{"type":"resource_link","uri":"internal://abc"', None),
+        ]:
+            with self.subTest(value=value):
+                self.assertEqual(extract_resource_uri(value), expected)
+
+    def test_a_value_is_parsed_once(self):
+        value = '{"uri": "internal://abc", "type": "resource_link"}'
+        with patch.object(boxing.json, "loads", wraps=boxing.json.loads) as loads:
+            for _ in range(3):
+                self.assertTrue(is_resource_id(value))
+                self.assertEqual(extract_resource_uri(value), "internal://abc")
+        self.assertEqual(loads.call_count, 1)
+
+    def test_unboxing_json_links(self):
+        store = MemoryStore()
+        link = box_value("v" * 300, mode="json", store=store)
+        self.assertEqual(unbox_value(link, store=store), "v" * 300)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -15,6 +15,7 @@ from tool_context_relay.cli import _normalize_model_for_agents
 from tool_context_relay.cli import _format_startup_config_line
 from tool_context_relay.testing.integration_hooks import CapturedToolCall
 from tool_context_relay.testing.prompt_cases import PromptCase, ToolCallExpectation
+from tool_context_relay.store import AccountingStore, MemoryStore
 from tool_context_relay.tools.tool_relay import box_value
 from tool_context_relay.openai_env import load_profile
 
@@ -230,6 +231,247 @@ class CliTests(unittest.TestCase):
         self.assertEqual(run_once.call_args.kwargs["boxing_mode"], "json")
         self.assertEqual(run_once.call_args.kwargs["profile"], "openai")
 
+    def test_main_passes_store_config_to_runner(self):
+        os.environ["OPENAI_API_KEY"] = "sk-compat"
+        stdout = io.StringIO()
+        stderr = io.StringIO()
+        with (
+            patch(
+                "tool_context_relay.main.run_once",
+                return_value=("ok", SimpleNamespace(kv={})),
+            ) as run_once,
+            redirect_stdout(stdout),
+            redirect_stderr(stderr),
+        ):
+            code = main(["--store", "disk", "--store-path", "/tmp/relay-store", "hi"])
+
+        self.assertEqual(code, 0)
+        store_config = run_once.call_args.kwargs["store_config"]
+        self.assertEqual(store_config.kind, "disk")
+        self.assertEqual(store_config.path, "/tmp/relay-store")
+        self.assertIn("store=disk", stdout.getvalue())
+
+    def test_main_rejects_store_path_without_disk_store(self):
+        stderr = io.StringIO()
+        with redirect_stderr(stderr), redirect_stdout(io.StringIO()):
+            code = main(["--store-path", "/tmp/relay-store", "hi"])
+
+        self.assertEqual(code, 2)
+        self.assertIn("--store-path requires --store disk, sqlite, tiered or remote", stderr.getvalue())
+
+    def test_main_rejects_remote_store_without_address(self):
+        os.environ["OPENAI_API_KEY"] = "sk-compat"
+        stderr = io.StringIO()
+        with redirect_stderr(stderr), redirect_stdout(io.StringIO()):
+            code = main(["--store", "remote", "hi"])
+
+        self.assertEqual(code, 2)
+        self.assertIn("--store remote requires --store-path", stderr.getvalue())
+
+    def test_main_passes_tier_sizes_to_runner(self):
+        os.environ["OPENAI_API_KEY"] = "sk-compat"
+        stdout = io.StringIO()
+        with (
+            patch(
+                "tool_context_relay.main.run_once",
+                return_value=("ok", SimpleNamespace(kv={})),
+            ) as run_once,
+            redirect_stdout(stdout),
+            redirect_stderr(io.StringIO()),
+        ):
+            code = main(["--store", "tiered", "--store-max-bytes", "1000", "--store-cold-max-bytes", "5000", "hi"])
+
+        self.assertEqual(code, 0)
+        store_config = run_once.call_args.kwargs["store_config"]
+        self.assertEqual(store_config.kind, "tiered")
+        self.assertEqual(store_config.max_bytes, 1000)
+        self.assertEqual(store_config.cold_max_bytes, 5000)
+        self.assertIn("store=tiered (cold_max_bytes=5000)", stdout.getvalue())
+
+    def test_main_passes_snapshot_path_to_runner(self):
+        os.environ["OPENAI_API_KEY"] = "sk-compat"
+        stdout = io.StringIO()
+        with (
+            patch(
+                "tool_context_relay.main.run_once",
+                return_value=("ok", SimpleNamespace(kv={})),
+            ) as run_once,
+            redirect_stdout(stdout),
+            redirect_stderr(io.StringIO()),
+        ):
+            code = main(["--store-snapshot", "/tmp/relay.snapshot", "hi"])
+
+        self.assertEqual(code, 0)
+        self.assertEqual(run_once.call_args.kwargs["store_config"].snapshot_path, "/tmp/relay.snapshot")
+        self.assertIn("(snapshot=/tmp/relay.snapshot)", stdout.getvalue())
+
+    def test_main_passes_reachability_gc_to_runner(self):
+        os.environ["OPENAI_API_KEY"] = "sk-compat"
+        with (
+            patch(
+                "tool_context_relay.main.run_once",
+                return_value=("ok", SimpleNamespace(kv={})),
+            ) as run_once,
+            redirect_stdout(io.StringIO()),
+            redirect_stderr(io.StringIO()),
+        ):
+            code = main(["--store-gc", "hi"])
+
+        self.assertEqual(code, 0)
+        self.assertTrue(run_once.call_args.kwargs["store_config"].reachability_gc)
+
+    def test_main_rejects_reachability_gc_for_stores_other_sessions_share(self):
+        os.environ["OPENAI_API_KEY"] = "sk-compat"
+        for argv in (
+            ["--store", "sqlite", "--store-path", "relay.sqlite3", "--store-gc", "hi"],
+            ["--store", "remote", "--store-path", "127.0.0.1:7070", "--store-gc", "hi"],
+            ["--store", "shared", "--store-gc", "hi"],
+            ["--store-snapshot", "/tmp/relay.snapshot", "--store-gc", "hi"],
+        ):
+            stderr = io.StringIO()
+            with (
+                self.subTest(argv=argv),
+                patch("tool_context_relay.main.run_once") as run_once,
+                redirect_stdout(io.StringIO()),
+                redirect_stderr(stderr),
+            ):
+                code = main(argv)
+
+                self.assertEqual(code, 2)
+                run_once.assert_not_called()
+                self.assertIn("--store-gc requires", stderr.getvalue())
+
+    def test_main_prints_store_report_when_stats_are_enabled(self):
+        os.environ["OPENAI_API_KEY"] = "sk-compat"
+        store = AccountingStore(MemoryStore())
+        box_value("x" * 500, store=store, tool="get_page")
+        stdout = io.StringIO()
+        with (
+            patch(
+                "tool_context_relay.main.run_once",
+                return_value=("ok", SimpleNamespace(kv={}, store_report=store.report())),
+            ) as run_once,
+            redirect_stdout(stdout),
+            redirect_stderr(io.StringIO()),
+        ):
+            code = main(["--store-stats", "hi"])
+
+        self.assertEqual(code, 0)
+        self.assertTrue(run_once.call_args.kwargs["store_config"].accounting)
+        self.assertIn("(stats)", stdout.getvalue())
+        self.assertIn("get_page: 500 bytes, 1 resources, 0 reads", stdout.getvalue())
+
+    def test_main_rejects_cold_budget_without_tiered_store(self):
+        stderr = io.StringIO()
+        with redirect_stderr(stderr), redirect_stdout(io.StringIO()):
+            code = main(["--store-cold-max-bytes", "5000", "hi"])
+
+        self.assertEqual(code, 2)
+        self.assertIn("--store-cold-max-bytes requires --store tiered", stderr.getvalue())
+
+    def test_main_passes_store_ttls_to_runner(self):
+        os.environ["OPENAI_API_KEY"] = "sk-compat"
+        with (
+            patch(
+                "tool_context_relay.main.run_once",
+                return_value=("ok", SimpleNamespace(kv={})),
+            ) as run_once,
+            redirect_stdout(io.StringIO()),
+            redirect_stderr(io.StringIO()),
+        ):
+            code = main(["--store-ttl", "300", "--tool-ttl", "get_page=60", "hi"])
+
+        self.assertEqual(code, 0)
+        store_config = run_once.call_args.kwargs["store_config"]
+        self.assertEqual(store_config.ttl, 300)
+        self.assertEqual(store_config.tool_ttls, {"get_page": 60})
+        self.assertFalse(store_config.lazy_unboxing)
+
+    def test_main_passes_lazy_unboxing_to_runner(self):
+        os.environ["OPENAI_API_KEY"] = "sk-compat"
+        with (
+            patch(
+                "tool_context_relay.main.run_once",
+                return_value=("ok", SimpleNamespace(kv={})),
+            ) as run_once,
+            redirect_stdout(io.StringIO()),
+            redirect_stderr(io.StringIO()),
+        ):
+            code = main(["--lazy-unboxing", "hi"])
+
+        self.assertEqual(code, 0)
+        self.assertTrue(run_once.call_args.kwargs["store_config"].lazy_unboxing)
+
+    def test_main_passes_reference_interpolation_to_runner(self):
+        os.environ["OPENAI_API_KEY"] = "sk-compat"
+        stdout = io.StringIO()
+        with (
+            patch(
+                "tool_context_relay.main.run_once",
+                return_value=("ok", SimpleNamespace(kv={})),
+            ) as run_once,
+            redirect_stdout(stdout),
+            redirect_stderr(io.StringIO()),
+        ):
+            code = main(["--interpolate-references", "hi"])
+
+        self.assertEqual(code, 0)
+        self.assertTrue(run_once.call_args.kwargs["store_config"].interpolate_references)
+        self.assertIn("(interpolation)", stdout.getvalue())
+
+    def test_main_passes_previews_to_runner(self):
+        os.environ["OPENAI_API_KEY"] = "sk-compat"
+        stdout = io.StringIO()
+        with (
+            patch(
+                "tool_context_relay.main.run_once",
+                return_value=("ok", SimpleNamespace(kv={})),
+            ) as run_once,
+            redirect_stdout(stdout),
+            redirect_stderr(io.StringIO()),
+        ):
+            code = main(["--previews", "hi"])
+
+        self.assertEqual(code, 0)
+        self.assertTrue(run_once.call_args.kwargs["store_config"].previews)
+        self.assertIn("(previews)", stdout.getvalue())
+
+    def test_main_loads_tool_policies(self):
+        os.environ["OPENAI_API_KEY"] = "sk-compat"
+        stdout = io.StringIO()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "policies.yaml"
+            path.write_text("deep_check:\n  boxing: always\n", encoding="utf-8")
+            with (
+                patch(
+                    "tool_context_relay.main.run_once",
+                    return_value=("ok", SimpleNamespace(kv={})),
+                ) as run_once,
+                redirect_stdout(stdout),
+                redirect_stderr(io.StringIO()),
+            ):
+                code = main(["--tool-policies", str(path), "hi"])
+
+            stderr = io.StringIO()
+            path.write_text("deep_check: {boxing: sometimes}\n", encoding="utf-8")
+            with redirect_stderr(stderr), redirect_stdout(io.StringIO()):
+                self.assertEqual(main(["--tool-policies", str(path), "hi"]), 2)
+
+        self.assertEqual(code, 0)
+        self.assertEqual(run_once.call_args.kwargs["store_config"].tool_policies["deep_check"].boxing, "always")
+        self.assertIn("(tool policies=deep_check)", stdout.getvalue())
+        self.assertIn("deep_check", stderr.getvalue())
+
+    def test_main_rejects_malformed_tool_ttl(self):
+        for value in ("get_page", "get_page=soon", "get_page=0"):
+            with self.subTest(value=value):
+                stderr = io.StringIO()
+                with redirect_stderr(stderr), redirect_stdout(io.StringIO()):
+                    code = main(["--tool-ttl", value, "hi"])
+
+                self.assertEqual(code, 2)
+                self.assertIn("--tool-ttl", stderr.getvalue())
+
     def test_main_ignores_temperature_for_reasoning_model(self):
         os.environ["OPENAI_API_KEY"] = "sk-compat"
         stdout = io.StringIO()
@@ -0,0 +1,74 @@
+import asyncio
+import re
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from tool_context_relay.agent.agent import internal_resource_grep, internal_resource_read_slice
+from tool_context_relay.agent.context import RelayContext
+from tool_context_relay.store import CompressedStore, StoreConfig, create_store
+from tool_context_relay.store import compressed
+from tool_context_relay.tools.tool_relay import box_value
+
+
+class CompressedStoreTests(unittest.TestCase):
+    def test_round_trip_for_both_codecs(self):
+        value = "zażółć gęślą jaźń\n" * 50
+        for codec in ("zlib", "lzma"):
+            with self.subTest(codec=codec):
+                store = CompressedStore(codec=codec, block_chars=64)
+                store.put("internal://a", value)
+                self.assertEqual(store.get("internal://a"), value)
+                self.assertEqual(store.length("internal://a"), len(value))
+                self.assertEqual(store.line_count("internal://a"), 50)
+
+    def test_compresses_repetitive_payloads(self):
+        store = CompressedStore()
+        value = "For a long time, YouTube has been a platform. " * 2000
+        store.put("internal://a", value)
+        self.assertLess(store.stats().total_bytes, len(value) // 5)
+
+    def test_slice_decompresses_only_overlapping_blocks(self):
+        store = CompressedStore(block_chars=10)
+        value = "".join(str(idx % 10) for idx in range(1000))
+        store.put("internal://a", value)
+
+        with patch.object(compressed, "_decompress", wraps=compressed._decompress) as decompress:
+            self.assertEqual(store.read_slice("internal://a", 25, 42), value[25:42])
+        self.assertEqual(decompress.call_count, 3)
+
+    def test_lines_and_search_stream_over_blocks(self):
+        store = CompressedStore(block_chars=7)
+        value = "alpha\r\nbeta\ngamma needle\rdelta\n\nneedle again"
+        store.put("internal://a", value)
+        lines = value.splitlines()
+
+        self.assertEqual(store.read_lines("internal://a", 1, 4), lines[1:4])
+        self.assertEqual(store.search_lines("internal://a", re.compile("needle")), [2, 5])
+
+    def test_budget_applies_to_compressed_size(self):
+        store = CompressedStore(block_chars=16, max_bytes=200)
+        store.put("internal://a", "".join(chr(0x4E00 + idx) for idx in range(200)))
+        store.put("internal://b", "".join(chr(0x5E00 + idx) for idx in range(200)))
+
+        self.assertNotIn("internal://a", store)
+        self.assertIn("internal://b", store)
+        self.assertEqual(store.stats().evictions, 1)
+
+    def test_internal_tools_work_on_compressed_store(self):
+        store = CompressedStore(block_chars=32)
+        ctx = SimpleNamespace(context=RelayContext(store=store))
+        text = "\n".join(f"line {idx}" for idx in range(1, 60))
+        resource_id = box_value(text, store=store)
+
+        self.assertEqual(asyncio.run(internal_resource_read_slice(ctx, resource_id, -2, 2)), "59")
+        result = asyncio.run(internal_resource_grep(ctx, resource_id, "^line 30$", 1))
+        self.assertEqual(result, "Lines 29-31:\n29: line 29\n30: line 30\n31: line 31")
+
+    def test_create_store_with_compression(self):
+        store = create_store(StoreConfig(compression="lzma"))
+        self.assertIsInstance(store, CompressedStore)
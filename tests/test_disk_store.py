@@ -0,0 +1,119 @@
+import asyncio
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from tool_context_relay.agent.agent import (
+    internal_resource_length,
+    internal_resource_read_lines,
+    internal_resource_read_slice,
+)
+from tool_context_relay.agent.context import RelayContext
+from tool_context_relay.store import DiskSpillStore, StoreConfig, create_store
+from tool_context_relay.tools.tool_relay import box_value, unbox_value
+
+
+class DiskSpillStoreTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.store = DiskSpillStore(self._tmp.name, spill_threshold=16, offset_stride=8)
+
+    def tearDown(self) -> None:
+        self.store.clear()
+        self._tmp.cleanup()
+
+    def test_small_values_stay_in_memory(self):
+        self.store.put("internal://small", "short")
+        self.assertEqual(self.store.get("internal://small"), "short")
+        self.assertEqual(self.store.stats().disk_bytes, 0)
+        self.assertEqual(list(Path(self._tmp.name).iterdir()), [])
+
+    def test_large_values_spill_to_files(self):
+        value = "x" * 100
+        self.store.put("internal://big", value)
+
+        self.assertEqual(self.store.get("internal://big"), value)
+        self.assertEqual(self.store.stats().disk_bytes, 100)
+        self.assertTrue(any(Path(self._tmp.name).iterdir()))
+
+    def test_slices_use_character_indices_for_multibyte_text(self):
+        value = "zażółć gęślą jaźń — ünïcödé ✓ " * 5
+        self.store.put("internal://utf8", value)
+
+        self.assertEqual(self.store.length("internal://utf8"), len(value))
+        for start, end in ((0, 5), (3, 21), (7, 8), (40, len(value)), (len(value) - 3, len(value) + 10)):
+            with self.subTest(start=start, end=end):
+                self.assertEqual(self.store.read_slice("internal://utf8", start, end), value[start:end])
+
+    def test_read_lines_match_splitlines(self):
+        value = "first\nsecond\r\nthird\rfourth\n\nsixth line that is longer"
+        self.store.put("internal://lines", value)
+        lines = value.splitlines()
+
+        self.assertEqual(self.store.line_count("internal://lines"), len(lines))
+        self.assertEqual(self.store.read_lines("internal://lines", 1, 4), lines[1:4])
+        self.assertEqual(self.store.read_lines("internal://lines", 4, 10), lines[4:])
+
+    def test_read_lines_after_index_with_multibyte_separators(self):
+        value = "zażółć\u2028gęślą\x85jaźń\r\n✓\n" * 4
+        self.store.put("internal://lines", value)
+        lines = value.splitlines()
+
+        self.assertEqual(self.store.line_count("internal://lines"), len(lines))
+        for start, end in ((0, 3), (5, 9), (10, 100)):
+            with self.subTest(start=start, end=end):
+                self.assertEqual(self.store.read_lines("internal://lines", start, end), lines[start:end])
+
+        self.store.put("internal://lines", "replaced\n" * 4)
+        self.assertEqual(self.store.line_count("internal://lines"), 4)
+
+    def test_delete_and_clear_remove_files(self):
+        self.store.put("internal://a", "a" * 100)
+        self.store.put("internal://b", "é" * 100)
+
+        self.assertTrue(self.store.delete("internal://a"))
+        self.assertIsNone(self.store.get("internal://a"))
+        self.store.clear()
+        self.assertEqual(list(Path(self._tmp.name).iterdir()), [])
+        self.assertEqual(self.store.stats().entries, 0)
+
+    def test_multibyte_values_leave_only_their_data_file(self):
+        self.store.put("internal://b", "é" * 100)
+        self.assertEqual([path.suffix for path in Path(self._tmp.name).iterdir()], [".txt"])
+
+    def test_close_removes_only_a_directory_it_created(self):
+        owned = DiskSpillStore(spill_threshold=0)
+        owned.put("internal://a", "a" * 100)
+        owned.close()
+        self.assertFalse(owned.directory.exists())
+
+        self.store.put("internal://a", "a" * 100)
+        self.store.close()
+        self.assertTrue(Path(self._tmp.name).is_dir())
+
+    def test_internal_tools_read_from_spilled_values(self):
+        store = DiskSpillStore(self._tmp.name, spill_threshold=16)
+        ctx = SimpleNamespace(context=RelayContext(store=store))
+        text = "\n".join(f"line {idx}" for idx in range(1, 101))
+        resource_id = box_value(text, store=store)
+
+        self.assertEqual(unbox_value(resource_id, store=store), text)
+        self.assertEqual(asyncio.run(internal_resource_length(ctx, resource_id)), str(len(text)))
+        self.assertEqual(asyncio.run(internal_resource_read_slice(ctx, resource_id, -3, 3)), "100")
+        self.assertEqual(asyncio.run(internal_resource_read_lines(ctx, resource_id, -2, 2)), "line 99\nline 100")
+        store.clear()
+
+
+class CreateStoreTests(unittest.TestCase):
+    def test_creates_memory_store_by_default(self):
+        self.assertEqual(type(create_store()).__name__, "MemoryStore")
+
+    def test_creates_disk_store(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = create_store(StoreConfig(kind="disk", path=tmp))
+            self.assertIsInstance(store, DiskSpillStore)
+            self.assertEqual(store.directory, Path(tmp))
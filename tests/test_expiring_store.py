@@ -0,0 +1,137 @@
+import asyncio
+import sys
+import time
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from tool_context_relay.agent.agent import internal_resource_length, yt_transcribe
+from tool_context_relay.agent.context import RelayContext
+from tool_context_relay.store import ExpiringStore, MemoryStore, StoreConfig, create_store
+from tool_context_relay.tools import tool_relay
+from tool_context_relay.tools.tool_relay import box_value, unbox_value
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class ExpiringStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.store = ExpiringStore(MemoryStore(), default_ttl=10, clock=self.clock)
+
+    def test_expires_after_ttl(self):
+        self.store.put("internal://a", "value")
+        self.clock.now = 9
+        self.assertEqual(self.store.get("internal://a"), "value")
+        self.clock.now = 20
+        self.assertIsNone(self.store.get("internal://a"))
+        self.assertTrue(self.store.is_expired("internal://a"))
+        self.assertEqual(self.store.inner.stats().entries, 0)
+        self.assertEqual(self.store.stats().expirations, 1)
+
+    def test_reads_refresh_ttl(self):
+        self.store.put("internal://a", "value")
+        for now in (8, 16, 24):
+            self.clock.now = now
+            self.assertEqual(self.store.length("internal://a"), 5)
+        self.assertIn("internal://a", self.store)
+        self.assertFalse(self.store.is_expired("internal://a"))
+
+    def test_set_ttl_overrides_default(self):
+        self.store.put("internal://a", "value")
+        self.store.set_ttl("internal://a", 100)
+        self.store.put("internal://b", "value")
+        self.store.set_ttl("internal://b", None)
+        self.clock.now = 50
+        self.assertEqual(self.store.get("internal://a"), "value")
+        self.assertEqual(self.store.get("internal://b"), "value")
+
+    def test_reboxing_restarts_default_ttl(self):
+        value = "x" * 1000
+        resource_id = box_value(value, store=self.store)
+        self.clock.now = 8
+        self.assertEqual(box_value(value, store=self.store), resource_id)
+        self.clock.now = 15
+        self.assertEqual(unbox_value(resource_id, store=self.store), value)
+        self.clock.now = 30
+        self.assertTrue(self.store.is_expired(resource_id))
+        self.assertEqual(box_value(value, store=self.store), resource_id)
+        self.assertEqual(unbox_value(resource_id, store=self.store), value)
+
+    def test_unknown_is_not_expired(self):
+        self.assertFalse(self.store.is_expired("internal://missing"))
+
+    def test_sweep_reclaims_without_access(self):
+        for idx in range(5):
+            self.store.put(f"internal://{idx}", "value")
+        self.clock.now = 5
+        self.store.get("internal://4")
+        self.clock.now = 11
+        self.assertEqual(self.store.sweep(max_entries=2), 2)
+        self.assertEqual(self.store.sweep(), 2)
+        self.assertEqual(self.store.inner.stats().entries, 1)
+        self.assertIn("internal://4", self.store)
+
+    def test_rescheduling_keeps_the_queue_bounded(self):
+        for step in range(1000):
+            self.clock.now = step / 100
+            self.store.put("internal://a", "value")
+            self.store.set_ttl("internal://b", 10 - step / 200)
+            self.store.delete("internal://c")
+            self.store.put("internal://c", "value")
+            self.store.sweep()
+        self.assertLessEqual(len(self.store._queue), 6)
+
+        self.clock.now = 16
+        self.assertEqual(self.store.sweep(), 1)
+        self.assertNotIn("internal://b", self.store._deadlines)
+        self.clock.now = 20
+        self.assertEqual(self.store.sweep(), 2)
+        self.assertEqual(self.store._queue, [])
+
+    def test_background_sweeper_starts_and_stops(self):
+        store = ExpiringStore(MemoryStore(), default_ttl=0.01)
+        store.put("internal://a", "value")
+        store.start_sweeper(interval=0.01)
+        try:
+            deadline = time.monotonic() + 2
+            while store.inner.stats().entries and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            store.close()
+        self.assertEqual(store.stats().expirations, 1)
+
+    def test_expired_reference_message(self):
+        resource_id = box_value("x" * 1000, mode="opaque", store=self.store)
+        self.clock.now = 11
+        self.assertEqual(unbox_value(resource_id, store=self.store), tool_relay.EXPIRED_RESOURCE_ID)
+        self.assertEqual(unbox_value("internal://missing", store=self.store), tool_relay.UNKNOWN_RESOURCE_ID)
+
+    def test_create_store_wraps_when_ttl_configured(self):
+        self.assertIsInstance(create_store(StoreConfig()), MemoryStore)
+        store = create_store(StoreConfig(ttl=5))
+        try:
+            self.assertIsInstance(store, ExpiringStore)
+        finally:
+            store.close()
+
+    def test_per_tool_ttl_applies_to_wrapper_results(self):
+        context = RelayContext(store=self.store, tool_ttls={"yt_transcribe": 1000})
+        ctx = SimpleNamespace(context=context)
+        resource_id = asyncio.run(yt_transcribe(ctx, "123"))
+        self.clock.now = 500
+        self.assertNotIn("Expired", asyncio.run(internal_resource_length(ctx, resource_id)))
+        self.clock.now = 2000
+        self.assertEqual(asyncio.run(internal_resource_length(ctx, resource_id)), tool_relay.EXPIRED_RESOURCE_ID)
+
+
+if __name__ == "__main__":
+    unittest.main()
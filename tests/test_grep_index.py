@@ -0,0 +1,140 @@
+import asyncio
+import random
+import re
+import sys
+import tempfile
+import unittest
+from array import array
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from tool_context_relay.agent.agent import internal_resource_grep
+from tool_context_relay.agent.context import RelayContext
+from tool_context_relay.store import DiskSpillStore, MemoryStore
+from tool_context_relay.store import trigram
+from tool_context_relay.store.trigram import TrigramIndex, required_literals
+from tool_context_relay.tools.tool_relay import box_value
+
+
+def _scan(value: str, pattern: re.Pattern[str]) -> list[int]:
+    return [index for index, line in enumerate(value.splitlines()) if pattern.search(line)]
+
+
+class RequiredLiteralsTests(unittest.TestCase):
+    def test_extracts_mandatory_literals(self):
+        cases = {
+            r"hello\s+world": ["hello", "world"],
+            r"(?i)Foo(bar)+baz": ["foo", "bar", "baz"],
+            r"^error:": ["error:"],
+            r"(?:abc)?def": ["def"],
+            r"[0-9]+ items": [" items"],
+        }
+        for pattern, expected in cases.items():
+            with self.subTest(pattern=pattern):
+                self.assertEqual(required_literals(re.compile(pattern)), expected)
+
+    def test_patterns_without_literals_need_a_scan(self):
+        for pattern in (r"\d+", r"foo|bar", r"ab", r"x*yz"):
+            with self.subTest(pattern=pattern):
+                self.assertIsNone(required_literals(re.compile(pattern)))
+                self.assertIsNone(TrigramIndex(["foo", "bar"]).candidates(re.compile(pattern)))
+
+
+class TrigramIndexTests(unittest.TestCase):
+    def test_candidates_are_lines_containing_all_literals(self):
+        index = TrigramIndex(["the quick fox", "a lazy dog", "quick dog", "nothing"])
+        self.assertEqual(index.candidates(re.compile(r"quick.*dog")), [2])
+        self.assertEqual(index.candidates(re.compile(r"zebra")), [])
+
+    def test_case_insensitive_patterns_match_unicode_case_variants(self):
+        lines = ["İstanbul", "ſtraße", "KELVIN", "nope"]
+        index = TrigramIndex(lines)
+        for pattern, expected in (("(?i)istanbul", [0]), ("(?i)straße", [1]), ("(?i)kelvin", [2])):
+            with self.subTest(pattern=pattern):
+                compiled = re.compile(pattern)
+                self.assertEqual(
+                    [line_no for line_no in index.candidates(compiled) if compiled.search(lines[line_no])],
+                    expected,
+                )
+
+    def test_size_counts_keys_and_posting_objects(self):
+        index = TrigramIndex(["abcd", "bcde"])
+        self.assertEqual(set(index._postings), {"abc", "bcd", "cde"})
+        per_gram = sys.getsizeof("abc") + sys.getsizeof(array("I"))
+        self.assertGreater(index.size, sys.getsizeof(index._postings) + 3 * per_gram)
+
+    def test_matches_full_scan_on_random_text(self):
+        rng = random.Random(7)
+        words = ["alpha", "Beta", "gamma", "DELTA", "épée", "ﬁle", "a-b", "x1", "\t", " "]
+        value = "\n".join(" ".join(rng.choice(words) for _ in range(rng.randint(0, 6))) for _ in range(400))
+        patterns = [
+            r"alpha", r"(?i)beta gamma", r"DELTA\s+x1", r"épée|x1", r"(?i)ÉPÉE", r"a-b$", r"^gamma",
+            r"(?:alpha )+beta", r"ﬁle", r"(?i)delta.*alpha", r"zzz", r"\d",
+        ]
+        index = TrigramIndex(value.splitlines())
+        lines = value.splitlines()
+        for raw in patterns:
+            with self.subTest(pattern=raw):
+                pattern = re.compile(raw)
+                expected = _scan(value, pattern)
+                found = trigram.search_indexed(index, pattern, lines.__getitem__)
+                self.assertEqual(expected if found is None else found, expected)
+
+
+class StoreGrepIndexTests(unittest.TestCase):
+    def test_memory_store_searches_only_candidate_lines(self):
+        store = MemoryStore(grep_index_min_chars=1)
+        value = "\n".join(f"line {index} {'needle' if index % 97 == 0 else 'hay'}" for index in range(2000))
+        store.put("internal://a", value)
+        pattern = re.compile(r"needle")
+
+        with patch("tool_context_relay.store.memory.TrigramIndex", side_effect=AssertionError("indexed on first search")):
+            self.assertEqual(store.search_lines("internal://a", pattern), _scan(value, pattern))
+        self.assertEqual(store.search_lines("internal://a", pattern), _scan(value, pattern))
+        with patch("tool_context_relay.store.memory.TrigramIndex", side_effect=AssertionError("index rebuilt")):
+            self.assertEqual(store.search_lines("internal://a", re.compile(r"(?i)LINE 5\b")), [5])
+            self.assertEqual(store.search_lines("internal://a", re.compile(r"\d{4}")), _scan(value, re.compile(r"\d{4}")))
+
+    def test_memory_store_skips_index_for_small_values(self):
+        store = MemoryStore()
+        store.put("internal://a", "small needle")
+        budget_before = store.stats().total_bytes
+        self.assertEqual(store.search_lines("internal://a", re.compile("needle")), [0])
+        self.assertLess(store.stats().total_bytes - budget_before, 64)
+
+    def test_index_is_dropped_with_the_value(self):
+        store = MemoryStore(grep_index_min_chars=1)
+        store.put("internal://a", "alpha\nbeta\n")
+        store.search_lines("internal://a", re.compile("beta"))
+        store.search_lines("internal://a", re.compile("beta"))
+        store.put("internal://a", "gamma\nbeta beta\n")
+        self.assertEqual(store.search_lines("internal://a", re.compile("gamma")), [0])
+        self.assertTrue(store.delete("internal://a"))
+        self.assertEqual(store.stats().total_bytes, 0)
+
+    def test_disk_store_uses_index_for_spilled_values(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store = DiskSpillStore(directory, spill_threshold=16, grep_index_min_chars=1)
+            value = "zażółć\nneedle ✓\r\nhay NEEDLE\n" * 20
+            store.put("internal://a", value)
+            for raw in ("needle", "needle", "(?i)needle ✓", "hay$", r"\w+"):
+                with self.subTest(pattern=raw):
+                    pattern = re.compile(raw)
+                    self.assertEqual(store.search_lines("internal://a", pattern), _scan(value, pattern))
+            store.clear()
+
+    def test_internal_grep_uses_indexed_store(self):
+        context = RelayContext(store=MemoryStore(grep_index_min_chars=1))
+        ctx = SimpleNamespace(context=context)
+        value = "\n".join(f"row {index}" for index in range(300)) + "\nthe answer is 42"
+        resource_id = box_value(value, mode="opaque", store=context.store)
+
+        result = asyncio.run(internal_resource_grep(ctx, resource_id, r"answer is \d+", 0))
+        self.assertEqual(result, "Lines 301-301:\n301: the answer is 42")
+
+
+if __name__ == "__main__":
+    unittest.main()
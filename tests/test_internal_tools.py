@@ -1,3 +1,4 @@
+import asyncio
 import sys
 import unittest
 from pathlib import Path
@@ -17,7 +18,7 @@ class InternalToolsTests(unittest.TestCase):
         text = "\n".join(lines) + "\n" + ("x" * 300)
 
         resource_id = box_value(text)
-        result = internal_resource_grep(None, resource_id, "needle", 1)
+        result = asyncio.run(internal_resource_grep(None, resource_id, "needle", 1))
 
         self.assertIn("Lines 9-11:", result)
         self.assertIn("9: before", result)
@@ -27,7 +28,7 @@ class InternalToolsTests(unittest.TestCase):
     def test_internal_resource_grep_returns_no_matches(self):
         text = "\n".join([f"line {idx}" for idx in range(1, 20)]) + ("x" * 300)
         resource_id = box_value(text)
-        result = internal_resource_grep(None, resource_id, "missing", 0)
+        result = asyncio.run(internal_resource_grep(None, resource_id, "missing", 0))
         self.assertEqual(result, "No matches found.")
 
     def test_internal_resource_read_lines_returns_expected_lines(self):
@@ -35,8 +36,8 @@ class InternalToolsTests(unittest.TestCase):
         text = "\n".join(lines)
         resource_id = box_value(text)
 
-        result = internal_resource_read_lines(None, resource_id, 1, 2)
+        result = asyncio.run(internal_resource_read_lines(None, resource_id, 1, 2))
         self.assertEqual(result, "line 2\nline 3")
 
-        tail = internal_resource_read_lines(None, resource_id, -2, 2)
+        tail = asyncio.run(internal_resource_read_lines(None, resource_id, -2, 2))
         self.assertEqual(tail, "line 49\nline 50")
@@ -0,0 +1,120 @@
+import asyncio
+import sys
+import time
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from tool_context_relay.agent.agent import send_email
+from tool_context_relay.agent.context import RelayContext
+from tool_context_relay.boxing import find_embedded_resource_uris
+from tool_context_relay.store import MemoryStore
+from tool_context_relay.tools import tool_relay as relay
+from tool_context_relay.tools.nested import accepts_nested_values
+from tool_context_relay.tools.tool_relay import (
+    box_value,
+    interpolate_references,
+    interpolate_references_async,
+    tool_relay,
+)
+
+SUMMARY = "the summary " * 40
+NOTES = "some notes " * 40
+
+
+def echo(text: str) -> str:
+    return text
+
+
+class InterpolationTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.store = MemoryStore()
+        self.summary = box_value(SUMMARY, store=self.store)
+        self.notes = box_value(NOTES, mode="json", store=self.store)
+
+    def test_embedded_references_are_spliced_in(self):
+        template = f"Summary:\n {self.summary}\n\nNotes: {self.notes}\n{self.summary}."
+        self.assertEqual(
+            interpolate_references(template, store=self.store),
+            f"Summary:\n {SUMMARY}\n\nNotes: {NOTES}\n{SUMMARY}.",
+        )
+
+    def test_references_with_previews_are_spliced_in_whole(self):
+        for mode in ("opaque", "json"):
+            with self.subTest(mode=mode):
+                reference = box_value(SUMMARY + "]}", mode=mode, store=self.store, preview=True)
+                self.assertIn("the summary", reference)
+                template = f"Summary: {reference}\nNotes: {self.notes}."
+                self.assertEqual(
+                    interpolate_references(template, store=self.store),
+                    f"Summary: {SUMMARY}]}}\nNotes: {NOTES}.",
+                )
+
+    def test_unterminated_previews_are_scanned_in_linear_time(self):
+        for prefix in ("internal://x [preview: ", 'internal://x [preview: "', '{"a": "internal://x [preview: '):
+            with self.subTest(prefix=prefix):
+                template = prefix * (500_000 // len(prefix)) + self.summary
+                started = time.perf_counter()
+                references = find_embedded_resource_uris(template)
+                self.assertLess(time.perf_counter() - started, 2.0)
+                self.assertEqual(references[-1], (len(template) - len(self.summary), len(template), self.summary))
+
+    def test_json_objects_that_are_not_links_keep_their_text(self):
+        template = f'{{"note": "see {self.summary}", "count": 2}}'
+        self.assertEqual(
+            interpolate_references(template, store=self.store),
+            f'{{"note": "see {SUMMARY}", "count": 2}}',
+        )
+
+    def test_each_reference_is_read_once(self):
+        template = f"{self.summary} and {self.summary}"
+        with patch.object(self.store, "get", wraps=self.store.get) as get:
+            self.assertEqual(interpolate_references(template, store=self.store), f"{SUMMARY} and {SUMMARY}")
+        self.assertEqual(get.call_count, 1)
+
+    def test_missing_references_become_the_missing_message(self):
+        self.assertEqual(
+            interpolate_references("see internal://gone!", store=self.store),
+            "see Unknown resource ID!",
+        )
+
+    def test_size_limit_is_checked_before_reading(self):
+        template = f"{self.summary} {self.summary}"
+        with (
+            patch.object(relay, "MAX_INTERPOLATED_CHARS", len(SUMMARY) * 2),
+            patch.object(self.store, "get", side_effect=AssertionError("materialized")),
+        ):
+            with self.assertRaisesRegex(ValueError, "pass the reference as a separate argument"):
+                interpolate_references(template, store=self.store)
+
+    def test_relay_interpolates_only_when_enabled(self):
+        template = f"Summary: {self.summary}"
+        self.assertEqual(tool_relay(echo, [template], store=self.store), template)
+        self.assertEqual(
+            self.store.get(tool_relay(echo, [template], store=self.store, interpolate=True)),
+            f"Summary: {SUMMARY}",
+        )
+
+    def test_nested_arguments_are_interpolated(self):
+        @accepts_nested_values
+        def join(parts: list[str]) -> str:
+            return "|".join(part[:11] for part in parts)
+
+        result = tool_relay(join, [[f"A: {self.summary}", self.notes]], store=self.store, interpolate=True)
+        self.assertEqual(result, "A: the summ|some notes ")
+
+    def test_async_interpolation(self):
+        template = f"Notes: {self.notes}"
+        self.assertEqual(asyncio.run(interpolate_references_async(template, store=self.store)), f"Notes: {NOTES}")
+
+    def test_agent_tools_follow_the_context_setting(self):
+        ctx = SimpleNamespace(context=RelayContext(store=self.store, interpolate_references=True))
+        result = asyncio.run(send_email(ctx, "a@example.com", f"Hi,\n{self.summary}"))
+        self.assertIn("Body length=" + str(len(SUMMARY) + 4), result)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from tool_context_relay.agent.agent import deep_check
+from tool_context_relay.agent.context import RelayContext
+from tool_context_relay.store import CompressedStore, MemoryStore
+from tool_context_relay.tools.lazy import LazyValue, accepts_lazy_values, supports_lazy_values
+from tool_context_relay.tools.tool_relay import UNKNOWN_RESOURCE_ID, box_value, tool_relay, unbox_lazy
+
+VALUE = "".join(chr(ord("a") + index % 26) for index in range(1000)) + "ż✓"
+
+
+class LazyValueTests(unittest.TestCase):
+    def setUp(self):
+        self.store = MemoryStore()
+        self.resource_id = box_value(VALUE, store=self.store)
+        self.lazy = unbox_lazy(self.resource_id, store=self.store)
+
+    def test_behaves_like_the_string(self):
+        self.assertIsInstance(self.lazy, LazyValue)
+        self.assertEqual(len(self.lazy), len(VALUE))
+        self.assertEqual(str(self.lazy), VALUE)
+        self.assertEqual(self.lazy, VALUE)
+        self.assertNotEqual(self.lazy, VALUE[:-1] + "x")
+        self.assertEqual("".join(self.lazy.chunks(100)), VALUE)
+        self.assertEqual("".join(self.lazy), VALUE)
+        self.assertEqual(hash(self.lazy), hash(VALUE))
+        self.assertEqual("<" + self.lazy + ">", f"<{VALUE}>")
+        self.assertTrue(self.lazy.startswith("abc"))
+        self.assertTrue(self.lazy.endswith("ż✓"))
+
+    def test_indexing_and_slicing_match_str(self):
+        keys = [0, 5, -1, -1002, slice(None, 50), slice(990, None), slice(-3, None), slice(10, 5),
+                slice(None, None, 7), slice(None, None, -1), slice(900, 100, -13), slice(5, 2, -1), slice(2, 5, -1)]
+        for key in keys:
+            with self.subTest(key=key):
+                self.assertEqual(self.lazy[key], VALUE[key])
+        with self.assertRaises(IndexError):
+            self.lazy[len(VALUE)]
+
+    def test_contains_finds_matches_across_chunks(self):
+        with patch("tool_context_relay.tools.lazy.DEFAULT_CHUNK_CHARS", 10):
+            self.assertIn("jklmnop", LazyValue(self.store, self.resource_id, len(VALUE)))
+        self.assertIn("lż✓", self.lazy)
+        self.assertNotIn("zz", self.lazy)
+
+    def test_reads_only_requested_slices(self):
+        store = CompressedStore(block_chars=100)
+        resource_id = box_value(VALUE, store=store)
+        lazy = unbox_lazy(resource_id, store=store)
+        with patch.object(store, "get", side_effect=AssertionError("materialized")):
+            self.assertEqual(lazy[:50], VALUE[:50])
+            self.assertEqual(len(lazy), len(VALUE))
+
+    def test_missing_references_resolve_to_message(self):
+        self.assertEqual(unbox_lazy("internal://0000", store=self.store), UNKNOWN_RESOURCE_ID)
+        self.assertEqual(unbox_lazy("plain text", store=self.store), "plain text")
+
+
+class LazyToolRelayTests(unittest.TestCase):
+    def test_only_declared_tools_receive_lazy_values(self):
+        store = MemoryStore()
+        resource_id = box_value(VALUE, store=store)
+        seen = []
+
+        def plain(text):
+            seen.append(type(text))
+            return "ok"
+
+        @accepts_lazy_values
+        def lazy(text):
+            seen.append(type(text))
+            return "ok"
+
+        self.assertFalse(supports_lazy_values(plain))
+        tool_relay(plain, [resource_id], store=store, lazy=True)
+        tool_relay(lazy, [resource_id], store=store, lazy=True)
+        tool_relay(lazy, [resource_id], store=store)
+
+        self.assertEqual(seen, [str, LazyValue, str])
+
+    def test_deep_check_skips_full_read_in_lazy_mode(self):
+        context = RelayContext(lazy_unboxing=True)
+        ctx = SimpleNamespace(context=context)
+        resource_id = box_value(VALUE, store=context.store)
+
+        with patch.object(context.store, "get", side_effect=AssertionError("materialized")):
+            result = asyncio.run(deep_check(ctx, resource_id))
+
+        self.assertIn(f"Analyzed text {len(VALUE)} characters long", result)
+        self.assertIn(f"##{VALUE[:50]}...##", result)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import ast
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from tool_context_relay.store import BinaryPayload, MemoryStore
+from tool_context_relay.tools.binary import accepts_binary_values
+from tool_context_relay.tools.lazy import LazyValue, accepts_lazy_values
+from tool_context_relay.tools.nested import accepts_nested_values
+from tool_context_relay.tools.tool_relay import box_value, tool_relay, tool_relay_async
+
+FIRST = "first document " * 30
+SECOND = "second document " * 30
+
+
+@accepts_nested_values
+def merge(documents: list[str], options: dict[str, object]) -> str:
+    return repr((documents, options))
+
+
+class NestedUnboxingTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.store = MemoryStore()
+        self.first = box_value(FIRST, store=self.store)
+        self.second = box_value(SECOND, mode="json", store=self.store)
+
+    def test_references_inside_lists_and_dicts_are_unboxed(self):
+        options = {"title": self.first, "internal://keys-are-kept": [("x", self.second)], "limit": 3}
+        result = tool_relay(merge, [[self.first, "plain"], options], store=self.store)
+
+        documents, relayed_options = ast.literal_eval(self.store.get(result))
+        self.assertEqual(documents, [FIRST, "plain"])
+        self.assertEqual(
+            relayed_options,
+            {"title": FIRST, "internal://keys-are-kept": [("x", SECOND)], "limit": 3},
+        )
+
+    def test_each_reference_is_fetched_once_per_call(self):
+        args = [[self.first, self.second, self.first], {"a": self.first, "b": [self.second]}]
+        with patch.object(self.store, "get", wraps=self.store.get) as get:
+            tool_relay(merge, args, store=self.store)
+
+        self.assertEqual(get.call_count, 2)
+
+    def test_undeclared_tools_get_structured_arguments_unchanged(self):
+        received = []
+        tool_relay(
+            lambda documents, text: received.append((documents, text)) or "ok",
+            [[self.first], self.first],
+            store=self.store,
+        )
+        self.assertEqual(received, [([self.first], FIRST)])
+
+    def test_missing_nested_reference_becomes_an_error_string(self):
+        result = tool_relay(merge, [["internal://missing"], {}], store=self.store)
+        self.assertEqual(result, repr((["Unknown resource ID"], {})))
+
+    def test_nested_lazy_and_binary_values(self):
+        payload = BinaryPayload(b"\x89PNG" * 200, "image/png")
+        image = box_value(payload, store=self.store)
+        received = []
+
+        @accepts_nested_values
+        @accepts_lazy_values
+        @accepts_binary_values
+        def inspect(items: list[str]) -> str:
+            received.extend(items)
+            return "ok"
+
+        tool_relay(inspect, [[self.first, image]], store=self.store, lazy=True)
+
+        self.assertIsInstance(received[0], LazyValue)
+        self.assertEqual(str(received[0]), FIRST)
+        self.assertEqual(received[1], payload)
+
+    def test_async_relay_unboxes_nested_references_once(self):
+        calls = []
+
+        @accepts_nested_values
+        async def merge_async(documents: list[str]) -> str:
+            return " | ".join(document[:5] for document in documents)
+
+        original_get = self.store.get
+
+        def counting_get(resource_id):
+            calls.append(resource_id)
+            return original_get(resource_id)
+
+        with patch.object(self.store, "get", side_effect=counting_get):
+            result = asyncio.run(
+                tool_relay_async(merge_async, [[self.first, self.second, self.first]], store=self.store)
+            )
+
+        self.assertEqual(result, "first | secon | first")
+        self.assertEqual(len(calls), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
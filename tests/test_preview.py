@@ -0,0 +1,133 @@
+import asyncio
+import json
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from tool_context_relay.agent.agent import build_agent, yt_transcribe
+from tool_context_relay.agent.context import RelayContext
+from tool_context_relay.boxing import extract_resource_uri
+from tool_context_relay.preview import (
+    PREVIEW_TOKENS,
+    PreviewBuilder,
+    describe_value,
+    detect_content_type,
+)
+from tool_context_relay.store import BinaryPayload, MemoryStore
+from tool_context_relay.tokens import BoxingThreshold, TokenCounter, estimate_tokens
+from tool_context_relay.tools.tool_relay import (
+    box_stream,
+    box_stream_async,
+    box_value,
+    is_resource_id,
+    resource_id_for,
+    tool_relay,
+    unbox_value,
+)
+
+TRANSCRIPT = "Some spoken words in the video.\n" * 100 + "The number at the end is 4711.\n"
+
+
+class PreviewTests(unittest.TestCase):
+    def test_counts_head_and_tail(self):
+        preview = describe_value(TRANSCRIPT, TokenCounter())
+
+        self.assertEqual((preview.length, preview.lines, preview.content_type), (len(TRANSCRIPT), 101, "text/plain"))
+        self.assertTrue(TRANSCRIPT.startswith(preview.head))
+        self.assertTrue(preview.tail.endswith("The number at the end is 4711.\n"))
+        self.assertLessEqual(estimate_tokens(preview.head) + estimate_tokens(preview.tail), PREVIEW_TOKENS)
+
+    def test_short_values_are_not_repeated_in_the_tail(self):
+        preview = describe_value("short value", TokenCounter())
+        self.assertEqual((preview.head, preview.tail), ("short value", ""))
+
+    def test_chunked_values_give_the_same_preview(self):
+        builder = PreviewBuilder(TokenCounter())
+        for index in range(0, len(TRANSCRIPT), 7):
+            builder.feed(TRANSCRIPT[index : index + 7])
+        self.assertEqual(builder.build(), describe_value(TRANSCRIPT, TokenCounter()))
+
+    def test_wide_text_is_trimmed_to_the_budget(self):
+        preview = describe_value("語" * 500, TokenCounter())
+        self.assertLessEqual(estimate_tokens(preview.head), PREVIEW_TOKENS // 2)
+        self.assertLessEqual(estimate_tokens(preview.tail), PREVIEW_TOKENS // 2)
+
+    def test_content_types(self):
+        for sample, expected in (
+            (' {"a": 1}', "application/json"),
+            ("<!DOCTYPE html><html>", "text/html"),
+            ('<?xml version="1.0"?><feed/>', "application/xml"),
+            ("# Title\n\ntext", "text/markdown"),
+            ("plain words", "text/plain"),
+        ):
+            with self.subTest(sample=sample):
+                self.assertEqual(detect_content_type(sample), expected)
+
+
+class BoxedPreviewTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.store = MemoryStore()
+
+    def test_opaque_preview_is_still_a_reference(self):
+        result = box_value(TRANSCRIPT, store=self.store, preview=True)
+
+        self.assertTrue(result.startswith(resource_id_for(TRANSCRIPT) + " [preview: 3231 chars, 101 lines, text/plain"))
+        self.assertIn("4711", result)
+        self.assertTrue(is_resource_id(result))
+        self.assertEqual(unbox_value(result, store=self.store), TRANSCRIPT)
+
+    def test_json_preview_is_still_a_resource_link(self):
+        result = box_value(TRANSCRIPT, mode="json", store=self.store, preview=True)
+        link = json.loads(result)
+
+        self.assertEqual(link["uri"], resource_id_for(TRANSCRIPT))
+        self.assertEqual((link["length"], link["lines"], link["mimeType"]), (len(TRANSCRIPT), 101, "text/plain"))
+        self.assertEqual(extract_resource_uri(result), link["uri"])
+        self.assertEqual(tool_relay(lambda text: str(len(text)), [result], store=self.store), str(len(TRANSCRIPT)))
+
+    def test_streamed_and_async_results_match(self):
+        chunks = [TRANSCRIPT[index : index + 100] for index in range(0, len(TRANSCRIPT), 100)]
+        expected = box_value(TRANSCRIPT, store=self.store, preview=True)
+
+        async def produce():
+            for chunk in chunks:
+                yield chunk
+
+        self.assertEqual(box_stream(iter(chunks), store=self.store, preview=True), expected)
+        self.assertEqual(asyncio.run(box_stream_async(produce(), store=self.store, preview=True)), expected)
+
+    def test_binary_preview_has_no_text(self):
+        payload = BinaryPayload(b"\x89PNG" * 200, "image/png")
+        result = box_value(payload, mode="json", store=self.store, preview=True)
+        self.assertEqual(
+            {key: value for key, value in json.loads(result).items() if key not in ("type", "uri")},
+            {"length": 1068, "lines": 1, "mimeType": "image/png"},
+        )
+
+    def test_inline_values_are_unchanged(self):
+        self.assertEqual(box_value("short", store=self.store, preview=True), "short")
+
+
+class AgentPreviewTests(unittest.TestCase):
+    def test_agent_tools_follow_the_context_setting(self):
+        ctx = SimpleNamespace(
+            context=RelayContext(store=MemoryStore(), boxing_threshold=BoxingThreshold(max_tokens=4), previews=True)
+        )
+        result = asyncio.run(yt_transcribe(ctx, "999"))
+        self.assertIn(" [preview: ", result)
+        self.assertTrue(is_resource_id(result))
+
+    def test_build_agent_describes_previews_only_when_enabled(self):
+        for mode in ("opaque", "json"):
+            with self.subTest(mode=mode):
+                plain = build_agent(model="gpt-4.1-mini", boxing_mode=mode)
+                with_previews = build_agent(model="gpt-4.1-mini", boxing_mode=mode, previews=True)
+                self.assertNotIn("preview", plain.instructions)
+                self.assertIn("preview", with_previews.instructions)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from tool_context_relay.agent.context import RelayContext
+from tool_context_relay.agent.handler import RunHookHandler
+from tool_context_relay.store import MemoryStore, ReachabilityTracker
+from tool_context_relay.store.reachability import find_references
+from tool_context_relay.tools.tool_relay import box_value
+
+
+class FindReferencesTests(unittest.TestCase):
+    def test_finds_references_in_nested_items(self):
+        items = [
+            {"role": "user", "content": "Summarize internal://aa11 please."},
+            {"type": "function_call_output", "output": '{"type":"resource_link","uri":"internal://bb22"}'},
+            {"type": "message", "content": [{"type": "output_text", "text": "see internal://cc33, internal://aa11"}]},
+        ]
+        self.assertEqual(find_references(items), {"internal://aa11", "internal://bb22", "internal://cc33"})
+
+
+class ReachabilityTrackerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.store = MemoryStore()
+        for name in ("a", "b", "c"):
+            self.store.put(f"internal://{name}", name * 10)
+        self.tracker = ReachabilityTracker(self.store)
+
+    def test_reference_dropped_from_the_conversation_is_reclaimed(self):
+        self.tracker.observe_conversation("s1", ["internal://a and internal://b"])
+        reclaimed = self.tracker.observe_conversation("s1", ["only internal://b is left"])
+
+        self.assertEqual(reclaimed, 1)
+        self.assertNotIn("internal://a", self.store)
+        self.assertIn("internal://b", self.store)
+
+    def test_reference_reachable_from_another_session_survives(self):
+        self.tracker.observe_conversation("s1", ["internal://a"])
+        self.tracker.observe("s2", "internal://a")
+
+        self.assertEqual(self.tracker.end_session("s1"), 0)
+        self.assertIn("internal://a", self.store)
+        self.assertEqual(self.tracker.end_session("s2"), 1)
+        self.assertNotIn("internal://a", self.store)
+        self.assertEqual(self.tracker.reclaimed, 1)
+
+    def test_references_never_observed_are_left_alone(self):
+        self.tracker.observe_conversation("s1", ["internal://a"])
+        self.tracker.end_session("s1")
+
+        self.assertIn("internal://c", self.store)
+        self.assertFalse(self.tracker.is_reachable("internal://c"))
+
+    def test_tool_results_are_rooted_until_the_next_model_call(self):
+        self.tracker.observe("s1", "internal://c")
+        self.assertTrue(self.tracker.is_reachable("internal://c"))
+
+        self.tracker.observe_conversation("s1", [{"output": "internal://c"}])
+        self.assertIn("internal://c", self.store)
+
+
+class HookTrackingTests(unittest.TestCase):
+    def test_hooks_feed_the_session_tracker(self):
+        relay_context = RelayContext()
+        relay_context.references = ReachabilityTracker(relay_context.store)
+        context = SimpleNamespace(context=relay_context, tool_arguments="{}")
+        handler = RunHookHandler(show_system_instruction=False)
+        tool = SimpleNamespace(name="get_page")
+
+        reference = box_value("page " * 200, store=relay_context.store)
+        asyncio.run(handler.on_tool_end(context, None, tool, reference))
+        asyncio.run(handler.on_llm_start(context, None, None, [{"role": "user", "content": "hi"}]))
+
+        self.assertNotIn(reference, relay_context.store)
+        self.assertEqual(relay_context.references.reclaimed, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,200 @@
+import asyncio
+import re
+import socket
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from tool_context_relay.store import (
+    BinaryPayload,
+    DiskSpillStore,
+    MemoryStore,
+    RemoteStore,
+    StoreConfig,
+    create_store,
+)
+from tool_context_relay.store.remote import FRAME_HEADER, MAX_FRAME_BYTES, OP_PUT, STATUS_ERROR, parse_address
+from tool_context_relay.store.server import StoreServer
+from tool_context_relay.tools.tool_relay import box_stream, box_value, tool_relay_async
+
+VALUE = "".join(f"line {index} {'needle' if index % 7 == 0 else 'hay'}\n" for index in range(500))
+
+
+class RemoteStoreTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.backend = DiskSpillStore(self._tmp.name, spill_threshold=64)
+        self.server = StoreServer(self.backend, "127.0.0.1:0")
+        self.server.start_in_thread()
+        self.client = RemoteStore(self.server.address, pool_size=2)
+
+    def tearDown(self) -> None:
+        self.client.close()
+        self.server.stop()
+        self.backend.close()
+        self._tmp.cleanup()
+
+    def test_reads_run_on_the_server(self):
+        self.client.put("internal://a", VALUE)
+
+        self.assertIn("internal://a", self.client)
+        self.assertEqual(self.client.length("internal://a"), len(VALUE))
+        self.assertEqual(self.client.read_slice("internal://a", 10, 30), VALUE[10:30])
+        self.assertEqual(self.client.line_count("internal://a"), 500)
+        self.assertEqual(self.client.read_lines("internal://a", 498, 500), VALUE.splitlines()[498:])
+        self.assertEqual(self.client.search_lines("internal://a", re.compile("NEEDLE", re.I)), list(range(0, 500, 7)))
+        self.assertEqual(self.client.get("internal://a"), VALUE)
+        self.assertTrue(self.client.delete("internal://a"))
+        self.assertIsNone(self.client.get("internal://a"))
+        self.assertIsNone(self.client.line_count("internal://a"))
+
+    def test_slices_do_not_transfer_the_whole_value(self):
+        self.client.put("internal://a", VALUE)
+        with patch.object(self.backend, "get", side_effect=AssertionError("materialized")):
+            self.assertEqual(self.client.read_slice("internal://a", 100, 105), VALUE[100:105])
+
+    def test_streamed_values_are_written_over_one_connection(self):
+        chunks = [VALUE[index : index + 100] for index in range(0, len(VALUE), 100)]
+        resource_id = box_stream(chunks, store=self.client)
+
+        self.assertEqual(resource_id, box_value(VALUE, store=MemoryStore()))
+        self.assertEqual(self.backend.get(resource_id), VALUE)
+
+    def test_binary_payloads_round_trip(self):
+        payload = BinaryPayload(bytes(range(256)) * 8, "image/png")
+        resource_id = box_value(payload, store=self.client)
+
+        self.assertEqual(self.client.get_binary(resource_id), payload)
+        self.assertEqual(self.client.read_slice(resource_id, 0, 8), payload.to_base64()[:8])
+
+    def test_processes_share_references_through_the_server(self):
+        other = RemoteStore(self.server.address)
+        try:
+            resource_id = box_value(VALUE, store=self.client)
+            self.assertEqual(other.get(resource_id), VALUE)
+            self.assertEqual(other.resource_ids(), [resource_id])
+            self.assertEqual(other.stats().entries, 1)
+        finally:
+            other.close()
+
+    def test_pool_serves_concurrent_callers(self):
+        self.client.put("internal://a", VALUE)
+        results: list[str | None] = []
+
+        def read(start: int) -> None:
+            results.append(self.client.read_slice("internal://a", start, start + 10))
+
+        threads = [threading.Thread(target=read, args=(start,)) for start in range(0, 200, 10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(results), sorted(VALUE[start : start + 10] for start in range(0, 200, 10)))
+
+    def test_async_relay_uses_the_remote_store(self):
+        resource_id = box_value(VALUE, store=self.client)
+        result = asyncio.run(tool_relay_async(lambda text: str(text.count("needle")), [resource_id], store=self.client))
+        self.assertEqual(result, str(VALUE.count("needle")))
+
+    def test_server_errors_are_raised_and_the_connection_stays_usable(self):
+        with self.assertRaises(RuntimeError):
+            self.client._request(99)
+        self.client.put("internal://a", "value")
+        self.assertEqual(self.client.get("internal://a"), "value")
+
+
+    def test_waiting_for_a_pooled_connection_times_out(self):
+        client = RemoteStore(self.server.address, pool_size=1, timeout=0.2)
+        try:
+            pinned = client._acquire()
+            with self.assertRaisesRegex(ConnectionError, "became free"):
+                client.get("internal://a")
+            client._release(pinned, reuse=True)
+            self.assertIsNone(client.get("internal://a"))
+        finally:
+            client.close()
+
+    def test_failed_streamed_write_releases_its_connection(self):
+        aborted = []
+
+        class FailingWriter:
+            def write(self, chunk):
+                raise OSError("disk full")
+
+            def commit(self, resource_id):
+                raise AssertionError("unreachable")
+
+            def abort(self):
+                aborted.append(True)
+
+        client = RemoteStore(self.server.address, pool_size=1, timeout=0.2)
+        try:
+            with patch.object(self.backend, "open_writer", return_value=FailingWriter()):
+                writer = client.open_writer()
+                with self.assertRaisesRegex(RuntimeError, "disk full"):
+                    writer.write("chunk")
+            self.assertEqual(aborted, [True])
+            client.put("internal://a", "value")
+            self.assertEqual(client.get("internal://a"), "value")
+        finally:
+            client.close()
+
+    def test_oversized_frames_are_rejected(self):
+        self.client.put("internal://a", VALUE)
+        with patch("tool_context_relay.store.remote.MAX_FRAME_BYTES", 1000):
+            with self.assertRaises(ConnectionError):
+                self.client.put("internal://b", VALUE)
+            with self.assertRaisesRegex(RuntimeError, "exceeds"):
+                self.client.get("internal://a")
+            self.assertEqual(self.client.read_slice("internal://a", 0, 6), "line 0")
+        self.assertNotIn("internal://b", self.client)
+
+    def test_server_closes_connections_announcing_oversized_frames(self):
+        host, port = parse_address(self.server.address)
+        with socket.create_connection((host, port), timeout=5) as connection:
+            connection.sendall(FRAME_HEADER.pack(OP_PUT, 0, MAX_FRAME_BYTES + 1))
+            response = b""
+            while chunk := connection.recv(4096):
+                response += chunk
+        status, meta_length, body_length = FRAME_HEADER.unpack_from(response)
+        self.assertEqual((status, body_length), (STATUS_ERROR, 0))
+        self.assertIn(b"exceeds", response[FRAME_HEADER.size :])
+        self.assertEqual(len(response), FRAME_HEADER.size + meta_length)
+
+
+class RemoteStoreConnectionTests(unittest.TestCase):
+    def test_unix_socket_server(self):
+        with tempfile.TemporaryDirectory() as directory:
+            address = str(Path(directory) / "store.sock")
+            server = StoreServer(MemoryStore(), address)
+            server.start_in_thread()
+            store = create_store(StoreConfig(kind="remote", path=address))
+            try:
+                self.assertIsInstance(store, RemoteStore)
+                store.put("internal://a", "value")
+                self.assertEqual(store.get("internal://a"), "value")
+            finally:
+                store.close()
+                server.stop()
+            self.assertFalse(Path(address).exists())
+
+    def test_unreachable_server_raises_connection_error(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store = RemoteStore(str(Path(directory) / "missing.sock"))
+            with self.assertRaises(ConnectionError):
+                store.get("internal://a")
+
+    def test_parse_address(self):
+        self.assertEqual(parse_address("localhost:7000"), ("localhost", 7000))
+        self.assertEqual(parse_address("[::1]:7000"), ("::1", 7000))
+        self.assertEqual(parse_address("/run/relay.sock"), "/run/relay.sock")
+
+
+if __name__ == "__main__":
+    unittest.main()
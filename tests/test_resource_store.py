@@ -0,0 +1,126 @@
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from tool_context_relay.agent.agent import internal_resource_length, internal_resource_read_slice
+from tool_context_relay.store import MemoryStore
+from tool_context_relay.store.aio import AsyncStoreAdapter
+from tool_context_relay.tools.tool_relay import UNKNOWN_RESOURCE_ID, box_value, box_value_async, unbox_value
+
+
+class MemoryStoreTests(unittest.TestCase):
+    def test_put_get_length_and_slice(self):
+        store = MemoryStore()
+        store.put("internal://a", "hello world")
+
+        self.assertEqual(store.get("internal://a"), "hello world")
+        self.assertEqual(store.length("internal://a"), 11)
+        self.assertEqual(store.read_slice("internal://a", 6, 11), "world")
+        self.assertIsNone(store.get("internal://missing"))
+
+    def test_evicts_least_recently_used_over_budget(self):
+        value_size = sys.getsizeof("a" * 1000)
+        store = MemoryStore(max_bytes=value_size * 2)
+        store.put("internal://a", "a" * 1000)
+        store.put("internal://b", "b" * 1000)
+        store.get("internal://a")
+        store.put("internal://c", "c" * 1000)
+
+        self.assertIsNone(store.get("internal://b"))
+        self.assertIsNotNone(store.get("internal://a"))
+        self.assertIsNotNone(store.get("internal://c"))
+        stats = store.stats()
+        self.assertEqual(stats.entries, 2)
+        self.assertEqual(stats.evictions, 1)
+        self.assertLessEqual(stats.total_bytes, value_size * 2)
+
+    def test_keeps_single_value_larger_than_budget(self):
+        store = MemoryStore(max_bytes=10)
+        store.put("internal://big", "x" * 1000)
+        self.assertEqual(store.length("internal://big"), 1000)
+
+    def test_stats_count_hits_and_misses(self):
+        store = MemoryStore()
+        store.put("internal://a", "value")
+        store.get("internal://a")
+        store.length("internal://a")
+        store.get("internal://missing")
+
+        stats = store.stats()
+        self.assertEqual(stats.hits, 2)
+        self.assertEqual(stats.misses, 1)
+
+    def test_delete_and_clear_release_bytes(self):
+        store = MemoryStore()
+        store.put("internal://a", "a" * 100)
+        store.put("internal://b", "b" * 100)
+
+        self.assertTrue(store.delete("internal://a"))
+        self.assertFalse(store.delete("internal://a"))
+        store.clear()
+        self.assertEqual(store.stats().entries, 0)
+        self.assertEqual(store.stats().total_bytes, 0)
+
+    def test_read_lines_use_line_index(self):
+        store = MemoryStore()
+        value = "first\nsecond\r\nthird\rfourth\n\nsixth\u2028seventh\n"
+        store.put("internal://a", value)
+        lines = value.splitlines()
+        bytes_without_index = store.stats().total_bytes
+
+        self.assertEqual(store.line_count("internal://a"), len(lines))
+        self.assertEqual(store.read_lines("internal://a", 2, 5), lines[2:5])
+        self.assertEqual(store.read_lines("internal://a", 5, 50), lines[5:])
+        self.assertGreater(store.stats().total_bytes, bytes_without_index)
+
+        store.put("internal://a", "replaced")
+        self.assertEqual(store.read_lines("internal://a", 0, 10), ["replaced"])
+        self.assertTrue(store.delete("internal://a"))
+        self.assertEqual(store.stats().total_bytes, 0)
+
+    def test_rejects_non_positive_budget(self):
+        with self.assertRaises(ValueError):
+            MemoryStore(max_bytes=0)
+
+
+class BoxingWithStoreTests(unittest.TestCase):
+    def test_box_and_unbox_use_given_store(self):
+        store = MemoryStore()
+        value = "y" * 1000
+        resource_id = box_value(value, store=store)
+
+        self.assertEqual(store.stats().entries, 1)
+        self.assertEqual(unbox_value(resource_id, store=store), value)
+        self.assertEqual(unbox_value(resource_id, store=MemoryStore()), UNKNOWN_RESOURCE_ID)
+
+    def test_reboxing_refreshes_recency(self):
+        value_size = sys.getsizeof("a" * 1000)
+        for asynchronous in (False, True):
+            with self.subTest(asynchronous=asynchronous):
+                store = MemoryStore(max_bytes=value_size * 2)
+
+                def box(value: str) -> str:
+                    if asynchronous:
+                        return asyncio.run(box_value_async(value, store=AsyncStoreAdapter(store, offload=False)))
+                    return box_value(value, store=store)
+
+                first = box("a" * 1000)
+                second = box("b" * 1000)
+                box("a" * 1000)
+                box("c" * 1000)
+
+                self.assertIsNone(store.get(second))
+                self.assertIsNotNone(store.get(first))
+
+    def test_internal_tools_report_unknown_resource(self):
+        self.assertEqual(asyncio.run(internal_resource_length(None, "internal://0000")), UNKNOWN_RESOURCE_ID)
+        self.assertEqual(asyncio.run(internal_resource_read_slice(None, "internal://0000", 0, 5)), UNKNOWN_RESOURCE_ID)
+
+    def test_internal_read_slice_supports_negative_start(self):
+        resource_id = box_value("0123456789" * 40)
+        self.assertEqual(asyncio.run(internal_resource_read_slice(None, resource_id, -4, 10)), "6789")
+        self.assertEqual(asyncio.run(internal_resource_read_slice(None, resource_id, 5, 3)), "567")
+        self.assertEqual(asyncio.run(internal_resource_length(None, resource_id)), "400")
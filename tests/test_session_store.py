@@ -0,0 +1,153 @@
+import asyncio
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from tool_context_relay.agent.agent import deep_check, internal_resource_read, yt_transcribe
+from tool_context_relay.agent.context import RelayContext
+from tool_context_relay.main import run_once
+from tool_context_relay.openai_env import ProfileConfig
+from tool_context_relay.store import StoreConfig
+from tool_context_relay.tools import tool_relay
+
+
+class SessionStoreTests(unittest.TestCase):
+    def test_each_context_gets_its_own_store(self):
+        first = RelayContext()
+        second = RelayContext()
+        self.assertIsNot(first.store, second.store)
+
+    def test_tool_wrappers_box_into_context_store(self):
+        context = RelayContext()
+        ctx = SimpleNamespace(context=context)
+        global_entries = tool_relay.store.stats().entries
+
+        resource_id = asyncio.run(yt_transcribe(ctx, "123"))
+
+        self.assertTrue(resource_id.startswith("internal://"))
+        self.assertEqual(context.store.stats().entries, 1)
+        self.assertEqual(tool_relay.store.stats().entries, global_entries)
+        self.assertIn("Analyzed text", asyncio.run(deep_check(ctx, resource_id)))
+        self.assertNotEqual(asyncio.run(internal_resource_read(ctx, resource_id)), tool_relay.UNKNOWN_RESOURCE_ID)
+
+        other_ctx = SimpleNamespace(context=RelayContext())
+        self.assertEqual(asyncio.run(internal_resource_read(other_ctx, resource_id)), tool_relay.UNKNOWN_RESOURCE_ID)
+
+    def test_run_once_releases_session_store(self):
+        def fake_run_sync(agent, prompt, *, max_turns, hooks, context):
+            asyncio.run(yt_transcribe(SimpleNamespace(context=context), "123"))
+            self.assertEqual(context.store.stats().entries, 1)
+            return SimpleNamespace(final_output="done")
+
+        profile_config = ProfileConfig(
+            name="openai",
+            prefix="OPENAI",
+            provider="openai",
+            endpoint=None,
+            api_key="sk-test",
+            default_model=None,
+            backend_provider=None,
+            temperature=None,
+        )
+        with (
+            patch("tool_context_relay.main.load_dotenv"),
+            patch("tool_context_relay.main.apply_profile"),
+            patch("agents.Runner.run_sync", side_effect=fake_run_sync),
+        ):
+            output, context = run_once(prompt="hi", model="test", profile_config=profile_config)
+
+        self.assertEqual(output, "done")
+        self.assertEqual(context.store.stats().entries, 0)
+
+    def test_run_once_restores_references_from_snapshot(self):
+        profile_config = ProfileConfig(
+            name="openai",
+            prefix="OPENAI",
+            provider="openai",
+            endpoint=None,
+            api_key="sk-test",
+            default_model=None,
+            backend_provider=None,
+            temperature=None,
+        )
+        boxed: list[str] = []
+
+        def fake_run_sync(agent, prompt, *, max_turns, hooks, context):
+            ctx = SimpleNamespace(context=context)
+            if not boxed:
+                boxed.append(asyncio.run(yt_transcribe(ctx, "123")))
+                return SimpleNamespace(final_output="done")
+            # A fresh session store: the reference can only come from the snapshot.
+            self.assertNotEqual(asyncio.run(internal_resource_read(ctx, boxed[0])), tool_relay.UNKNOWN_RESOURCE_ID)
+            return SimpleNamespace(final_output="restored")
+
+        with tempfile.TemporaryDirectory() as directory:
+            store_config = StoreConfig(snapshot_path=str(Path(directory) / "store.snapshot"))
+            with (
+                patch("tool_context_relay.main.load_dotenv"),
+                patch("tool_context_relay.main.apply_profile"),
+                patch("agents.Runner.run_sync", side_effect=fake_run_sync),
+            ):
+                run_once(prompt="hi", model="test", profile_config=profile_config, store_config=store_config)
+                output, _ = run_once(
+                    prompt="hi", model="test", profile_config=profile_config, store_config=store_config
+                )
+
+        self.assertEqual(output, "restored")
+
+    def test_two_sessions_on_one_sqlite_store_keep_each_others_references(self):
+        profile_config = ProfileConfig(
+            name="openai",
+            prefix="OPENAI",
+            provider="openai",
+            endpoint=None,
+            api_key="sk-test",
+            default_model=None,
+            backend_provider=None,
+            temperature=None,
+        )
+        boxed: list[str] = []
+
+        def fake_run_sync(agent, prompt, *, max_turns, hooks, context):
+            ctx = SimpleNamespace(context=context)
+            boxed.append(asyncio.run(yt_transcribe(ctx, "123")))
+            if prompt == "first":
+                # A second session boxes the same content-addressed value and ends while this one still cites it.
+                run_once(prompt="second", model="test", profile_config=profile_config, store_config=store_config)
+            self.assertNotEqual(asyncio.run(internal_resource_read(ctx, boxed[0])), tool_relay.UNKNOWN_RESOURCE_ID)
+            return SimpleNamespace(final_output=prompt)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = str(Path(directory) / "store.sqlite3")
+            with self.assertRaises(ValueError):
+                StoreConfig(kind="sqlite", path=path, reachability_gc=True)
+            store_config = StoreConfig(kind="sqlite", path=path)
+            with (
+                patch("tool_context_relay.main.load_dotenv"),
+                patch("tool_context_relay.main.apply_profile"),
+                patch("agents.Runner.run_sync", side_effect=fake_run_sync),
+            ):
+                output, _ = run_once(
+                    prompt="first", model="test", profile_config=profile_config, store_config=store_config
+                )
+
+        self.assertEqual(output, "first")
+        self.assertEqual(boxed[0], boxed[1])
+
+    def test_reachability_gc_requires_a_session_local_store(self):
+        for config in (
+            {"kind": "sqlite", "path": "store.sqlite3"},
+            {"kind": "shared"},
+            {"kind": "remote", "path": "127.0.0.1:7070"},
+            {"kind": "memory", "snapshot_path": "store.snapshot"},
+        ):
+            with self.subTest(**config), self.assertRaises(ValueError):
+                StoreConfig(reachability_gc=True, **config)
+        for kind in ("memory", "disk", "tiered"):
+            with self.subTest(kind=kind):
+                self.assertTrue(StoreConfig(kind=kind, reachability_gc=True).reachability_gc)
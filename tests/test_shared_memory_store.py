@@ -0,0 +1,114 @@
+import asyncio
+import re
+import sys
+import unittest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from tool_context_relay.store import BinaryPayload, ExpiringStore, MemoryStore, SharedMemoryStore
+from tool_context_relay.tools.mcp_deepcheck import fun_deep_check
+from tool_context_relay.tools.policy import ToolPolicy
+from tool_context_relay.tools.pool import tool_relay_in_pool, tool_relay_in_pool_async
+from tool_context_relay.tools.tool_relay import box_value
+
+
+class SharedMemoryStoreTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.store = SharedMemoryStore(offset_stride=4)
+        self.reader = SharedMemoryStore.attach(self.store.namespace)
+
+    def tearDown(self) -> None:
+        self.reader.close()
+        self.store.close()
+
+    def test_attached_store_reads_values_by_id(self):
+        value = "zażółć\ngęślą\r\njaźń\n" * 5
+        self.store.put("internal://a", value)
+
+        for store in (self.store, self.reader):
+            with self.subTest(owner=store is self.store):
+                self.assertIn("internal://a", store)
+                self.assertEqual(store.get("internal://a"), value)
+                self.assertEqual(store.length("internal://a"), len(value))
+                self.assertEqual(store.read_slice("internal://a", 3, 17), value[3:17])
+                self.assertEqual(store.line_count("internal://a"), 15)
+                self.assertEqual(store.read_lines("internal://a", 1, 3), value.splitlines()[1:3])
+                self.assertEqual(store.search_lines("internal://a", re.compile("jaźń")), [2, 5, 8, 11, 14])
+
+    def test_attached_store_sees_replaced_and_deleted_values(self):
+        self.store.put("internal://a", "first")
+        self.assertEqual(self.reader.get("internal://a"), "first")
+
+        self.store.put("internal://a", "second")
+        self.assertEqual(self.reader.get("internal://a"), "second")
+
+        self.store.delete("internal://a")
+        self.assertIsNone(self.reader.get("internal://a"))
+        self.assertNotIn("internal://a", self.reader)
+
+    def test_attached_store_is_read_only(self):
+        with self.assertRaises(PermissionError):
+            self.reader.put("internal://a", "value")
+
+    def test_binary_payloads_are_shared_raw(self):
+        payload = BinaryPayload(bytes(range(256)), "image/png")
+        self.store.put_binary("internal://png", payload)
+
+        self.assertEqual(self.reader.get_binary("internal://png"), payload)
+        self.assertEqual(self.reader.read_slice("internal://png", 4, 20), payload.to_base64()[4:20])
+
+
+class ProcessPoolRelayTests(unittest.TestCase):
+    def test_workers_unbox_references_from_shared_memory(self):
+        store = SharedMemoryStore()
+        try:
+            text = "shared " * 1000
+            reference = box_value(text, store=store)
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                result = tool_relay_in_pool(executor, fun_deep_check, [reference], store=store)
+                lazy_result = tool_relay_in_pool(executor, fun_deep_check, [reference], store=store, lazy=True)
+            self.assertIn(f"Analyzed text {len(text)} characters long", result)
+            self.assertEqual(lazy_result, result)
+        finally:
+            store.close()
+
+    def test_async_relay_looks_through_store_wrappers(self):
+        store = ExpiringStore(SharedMemoryStore(), default_ttl=60)
+        try:
+            reference = box_value("x" * 1000, store=store)
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                result = asyncio.run(tool_relay_in_pool_async(executor, fun_deep_check, [reference], store=store))
+            self.assertIn("Analyzed text 1000 characters long", result)
+        finally:
+            store.close()
+
+    def test_results_are_boxed_like_the_in_process_relay(self):
+        store = ExpiringStore(SharedMemoryStore(), default_ttl=60)
+        try:
+            reference = box_value("x" * 1000, store=store)
+            policy = ToolPolicy(boxing="always", ttl=5)
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                result = tool_relay_in_pool(
+                    executor, fun_deep_check, [reference], store=store, tool="deep_check", policy=policy, preview=True
+                )
+                interpolated = asyncio.run(
+                    tool_relay_in_pool_async(
+                        executor, fun_deep_check, [f"text: {reference}"], store=store, interpolate=True
+                    )
+                )
+            resource_id = result.split(" ", 1)[0]
+            self.assertIn(" [preview: ", result)
+            self.assertEqual(store.expiry(resource_id)[0], 5)
+            self.assertIn("Analyzed text 1006 characters long", interpolated)
+        finally:
+            store.close()
+
+    def test_requires_a_shared_memory_store(self):
+        with ThreadPoolExecutor(max_workers=1) as executor, self.assertRaises(TypeError):
+            tool_relay_in_pool(executor, fun_deep_check, ["hi"], store=MemoryStore())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,193 @@
+import re
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from tool_context_relay.store import (
+    BinaryPayload,
+    DiskSpillStore,
+    ExpiringStore,
+    MemoryStore,
+    RestoredStore,
+    SnapshotStore,
+    StoreConfig,
+    create_store,
+    write_snapshot,
+)
+from tool_context_relay.tools.tool_relay import box_value
+
+VALUES = {
+    "internal://utf8": "zażółć\ngęślą\r\njaźń\n" * 7,
+    "internal://ascii": "first\r\nsecond\rthird",
+    "internal://empty": "",
+    "internal://breaks": "x\r" + "\n" * 3 + "\r",
+}
+
+
+class SnapshotTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "store.snapshot"
+        self.source = MemoryStore()
+        for resource_id, value in VALUES.items():
+            self.source.put(resource_id, value)
+        self.payload = BinaryPayload(bytes(range(200)), "image/png")
+        self.source.put_binary("internal://png", self.payload)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_snapshot_round_trips_values_and_indexes(self):
+        # Small read chunks and strides put piece boundaries inside "\r\n" and multi-byte characters.
+        with patch("tool_context_relay.store.snapshot._READ_CHUNK_CHARS", 8):
+            self.assertEqual(write_snapshot(self.source, self.path, offset_stride=4), 5)
+
+        snapshot = SnapshotStore(self.path)
+        try:
+            for resource_id, value in VALUES.items():
+                with self.subTest(resource_id=resource_id):
+                    self.assertEqual(snapshot.get(resource_id), value)
+                    self.assertEqual(snapshot.length(resource_id), len(value))
+                    for start in range(len(value)):
+                        self.assertEqual(snapshot.read_slice(resource_id, start, start + 5), value[start : start + 5])
+                    self.assertEqual(snapshot.line_count(resource_id), len(value.splitlines()))
+                    self.assertEqual(snapshot.read_lines(resource_id, 0, 100), value.splitlines())
+                    expected = [line_no for line_no, line in enumerate(value.splitlines()) if "ś" in line]
+                    self.assertEqual(snapshot.search_lines(resource_id, re.compile("ś")), expected)
+            self.assertEqual(snapshot.get_binary("internal://png"), self.payload)
+            self.assertEqual(snapshot.read_slice("internal://png", 5, 30), self.payload.to_base64()[5:30])
+        finally:
+            snapshot.close()
+
+    def test_restored_store_layers_new_values_over_the_snapshot(self):
+        write_snapshot(self.source, self.path)
+        store = RestoredStore(MemoryStore(), SnapshotStore(self.path))
+        try:
+            self.assertEqual(store.get("internal://ascii"), VALUES["internal://ascii"])
+            store.put("internal://new", "fresh")
+            self.assertEqual(store.get("internal://new"), "fresh")
+            self.assertTrue(store.delete("internal://ascii"))
+            self.assertNotIn("internal://ascii", store)
+            self.assertEqual(store.stats().entries, 5)
+        finally:
+            store.close()
+
+    def test_snapshot_of_restored_store_keeps_both_layers(self):
+        write_snapshot(self.source, self.path)
+        store = RestoredStore(MemoryStore(), SnapshotStore(self.path))
+        store.put("internal://new", "fresh")
+        write_snapshot(store, self.path)
+        store.close()
+
+        snapshot = SnapshotStore(self.path)
+        try:
+            self.assertEqual(sorted(snapshot.resource_ids()), sorted([*VALUES, "internal://png", "internal://new"]))
+        finally:
+            snapshot.close()
+
+    def test_snapshot_skips_expired_references(self):
+        now = [0.0]
+        store = ExpiringStore(MemoryStore(), default_ttl=10, clock=lambda: now[0])
+        store.put("internal://old", "old")
+        now[0] = 5.0
+        store.put("internal://new", "new")
+        now[0] = 12.0
+
+        self.assertEqual(write_snapshot(store, self.path), 1)
+
+    def test_restored_references_keep_their_ttl(self):
+        now = [0.0]
+        store = ExpiringStore(MemoryStore(), default_ttl=10, clock=lambda: now[0])
+        store.put("internal://short", "short")
+        store.put("internal://long", "long")
+        store.set_ttl("internal://long", 100)
+        now[0] = 4.0
+        self.assertEqual(write_snapshot(store, self.path), 2)
+
+        now[0] = 1000.0
+        snapshot = SnapshotStore(self.path)
+        ttl, left = snapshot.expiries()["internal://short"]
+        # Snapshotting reads every value; the saved time left is the one before those reads.
+        self.assertEqual(ttl, 10)
+        self.assertAlmostEqual(left, 6.0, delta=1)
+        restored = ExpiringStore(RestoredStore(MemoryStore(), snapshot), default_ttl=10, clock=lambda: now[0])
+        restored.restore_ttls(snapshot.expiries())
+        try:
+            self.assertEqual(restored.expiry("internal://long")[0], 100)
+            now[0] = 1005.0
+            self.assertEqual(restored.get("internal://short"), "short")
+            now[0] = 1020.0
+            self.assertIsNone(restored.get("internal://short"))
+            self.assertTrue(restored.is_expired("internal://short"))
+            self.assertEqual(restored.get("internal://long"), "long")
+            self.assertEqual(write_snapshot(restored, self.path), 1)
+        finally:
+            restored.close()
+
+    def test_expired_entries_are_not_restored(self):
+        now = [0.0]
+        store = ExpiringStore(MemoryStore(), default_ttl=10, clock=lambda: now[0])
+        store.put("internal://a", "a")
+        store.put("internal://b", "b")
+        store.set_ttl("internal://b", None)
+        write_snapshot(store, self.path)
+
+        with patch("tool_context_relay.store.snapshot.time.time", return_value=time.time() + 60):
+            snapshot = SnapshotStore(self.path)
+        try:
+            self.assertEqual(snapshot.resource_ids(), ["internal://b"])
+            self.assertEqual(snapshot.expiries(), {"internal://b": None})
+        finally:
+            snapshot.close()
+
+    def test_create_store_gives_restored_references_the_default_ttl(self):
+        write_snapshot(self.source, self.path)
+        store = create_store(StoreConfig(snapshot_path=str(self.path), ttl=30))
+        try:
+            self.assertIsInstance(store, ExpiringStore)
+            ttl, left = store.expiry("internal://ascii")
+            self.assertEqual(ttl, 30)
+            self.assertGreater(left, 29)
+        finally:
+            store.close()
+
+    def test_snapshot_includes_spilled_values(self):
+        disk = DiskSpillStore(Path(self._tmp.name) / "spill", spill_threshold=16)
+        disk.put("internal://big", "ł" * 100)
+        write_snapshot(disk, self.path)
+        disk.close()
+
+        snapshot = SnapshotStore(self.path)
+        try:
+            self.assertEqual(snapshot.get("internal://big"), "ł" * 100)
+        finally:
+            snapshot.close()
+
+    def test_create_store_restores_an_existing_snapshot(self):
+        config = StoreConfig(snapshot_path=str(self.path))
+        store = create_store(config)
+        self.assertIsInstance(store, MemoryStore)
+        resource_id = box_value("payload " * 100, store=store)
+        write_snapshot(store, self.path)
+        store.close()
+
+        restored = create_store(config)
+        try:
+            self.assertIsInstance(restored, RestoredStore)
+            self.assertEqual(restored.get(resource_id), "payload " * 100)
+        finally:
+            restored.close()
+
+    def test_rejects_files_that_are_not_snapshots(self):
+        self.path.write_bytes(b"not a snapshot at all")
+        with self.assertRaises(ValueError):
+            SnapshotStore(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
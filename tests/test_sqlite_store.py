@@ -0,0 +1,141 @@
+import sqlite3
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from tool_context_relay.store import SqliteStore, StoreConfig, create_store
+from tool_context_relay.tools.tool_relay import box_value, unbox_value
+
+
+class SqliteStoreTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "store.sqlite3"
+        self.store = SqliteStore(self.path, chunk_chars=8)
+
+    def tearDown(self) -> None:
+        self.store.close()
+        self._tmp.cleanup()
+
+    def test_uses_wal_journal_mode(self):
+        with sqlite3.connect(self.path) as connection:
+            mode = connection.execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode, "wal")
+
+    def test_round_trip_and_chunked_slices(self):
+        value = "zażółć gęślą jaźń — ünïcödé ✓ " * 4
+        self.store.put("internal://a", value)
+
+        self.assertEqual(self.store.get("internal://a"), value)
+        self.assertEqual(self.store.length("internal://a"), len(value))
+        for start, end in ((0, 8), (5, 30), (7, 9), (len(value) - 3, len(value) + 5)):
+            with self.subTest(start=start, end=end):
+                self.assertEqual(self.store.read_slice("internal://a", start, end), value[start:end])
+
+    def test_lines_match_splitlines_across_chunk_boundaries(self):
+        value = "one\r\ntwo\nthree\rfour\n\nsix and a much longer seventh\r\n"
+        self.store.put("internal://lines", value)
+        lines = value.splitlines()
+
+        self.assertEqual(self.store.line_count("internal://lines"), len(lines))
+        self.assertEqual(self.store.read_lines("internal://lines", 0, len(lines)), lines)
+        self.assertEqual(self.store.read_lines("internal://lines", 2, 4), lines[2:4])
+
+    def test_references_survive_reopen_and_are_shared_between_handles(self):
+        resource_id = box_value("shared " * 100, store=self.store)
+        other = SqliteStore(self.path)
+        try:
+            self.assertEqual(unbox_value(resource_id, store=other), "shared " * 100)
+        finally:
+            other.close()
+
+        self.store.close()
+        self.store = SqliteStore(self.path)
+        self.assertEqual(self.store.length(resource_id), 700)
+
+    def test_delete_clear_and_stats(self):
+        self.store.put("internal://a", "a" * 20)
+        self.store.put("internal://b", "é" * 20)
+        self.assertEqual(self.store.stats().entries, 2)
+        self.assertEqual(self.store.stats().disk_bytes, 60)
+
+        self.assertTrue(self.store.delete("internal://a"))
+        self.assertFalse(self.store.delete("internal://a"))
+        self.assertIsNone(self.store.get("internal://a"))
+        self.store.clear()
+        self.assertEqual(self.store.stats().entries, 0)
+
+    def test_failed_delete_and_clear_roll_back(self):
+        self.store.put("internal://a", "value " * 10)
+        connection = self.store._connection
+
+        class FailingConnection:
+            def execute(self, sql, *args):
+                if sql.startswith("DELETE FROM resources"):
+                    raise sqlite3.OperationalError("disk I/O error")
+                return connection.execute(sql, *args)
+
+        self.store._connection = FailingConnection()
+        try:
+            for operation in (lambda: self.store.delete("internal://a"), self.store.clear):
+                with self.assertRaises(sqlite3.OperationalError):
+                    operation()
+                self.assertFalse(connection.in_transaction)
+        finally:
+            self.store._connection = connection
+        self.assertEqual(self.store.get("internal://a"), "value " * 10)
+
+    def test_reads_see_one_snapshot_of_a_value_replaced_concurrently(self):
+        self.store.put("internal://a", "old " * 10)
+        other = SqliteStore(self.path, chunk_chars=8)
+        connection = self.store._connection
+
+        class InterleavingConnection:
+            replaced = False
+
+            def execute(self, sql, *args):
+                cursor = connection.execute(sql, *args)
+                if sql.lstrip().startswith("SELECT char_length") and not self.replaced:
+                    self.replaced = True
+                    other.put("internal://a", "new value")
+                return cursor
+
+        try:
+            self.store._connection = InterleavingConnection()
+            self.assertEqual(self.store.get("internal://a"), "old " * 10)
+            self.assertFalse(connection.in_transaction)
+        finally:
+            self.store._connection = connection
+            other.close()
+        self.assertEqual(self.store.get("internal://a"), "new value")
+
+    def test_reopening_reclaims_staging_chunks_of_dead_writers(self):
+        stale = self.store.open_writer()
+        stale._staging_id = "staging://0000000000000001-dead"
+        stale.write("x" * 20)
+        live = self.store.open_writer()
+        live.write("y" * 20)
+        self.store.close()
+
+        self.store = SqliteStore(self.path, chunk_chars=8)
+        with sqlite3.connect(self.path) as connection:
+            staged = {row[0] for row in connection.execute("SELECT DISTINCT resource_id FROM chunks")}
+        self.assertEqual(staged, {live._staging_id})
+
+        live._store = self.store
+        live.commit("internal://live")
+        self.assertEqual(self.store.get("internal://live"), "y" * 20)
+        stale._store = self.store
+        with self.assertRaises(RuntimeError):
+            stale.commit("internal://stale")
+        self.assertNotIn("internal://stale", self.store)
+
+    def test_create_store_requires_path(self):
+        with self.assertRaises(ValueError):
+            create_store(StoreConfig(kind="sqlite"))
+        store = create_store(StoreConfig(kind="sqlite", path=str(self.path)))
+        self.assertIsInstance(store, SqliteStore)
+        store.close()
@@ -0,0 +1,176 @@
+import asyncio
+import sqlite3
+import sys
+import tempfile
+import tracemalloc
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from tool_context_relay.store import CompressedStore, DiskSpillStore, ExpiringStore, MemoryStore, SqliteStore
+from tool_context_relay.store.writer import BufferedWriter
+from tool_context_relay.tools.tool_relay import (
+    MAX_RESULT_SIZE,
+    box_stream,
+    box_value,
+    resource_id_for,
+    tool_relay,
+    tool_relay_async,
+)
+
+
+def _chunked(value: str, size: int):
+    for index in range(0, len(value), size):
+        yield value[index : index + size]
+
+
+class _SpyStore(MemoryStore):
+    def __init__(self, log: list[str]) -> None:
+        super().__init__()
+        self._log = log
+
+    def open_writer(self):
+        store, log = self, self._log
+
+        class Writer(BufferedWriter):
+            def write(self, chunk: str) -> None:
+                log.append(f"write {chunk}")
+                super().write(chunk)
+
+        return Writer(store)
+
+
+VALUE = "zażółć gęślą jaźń ✓\r\nline two\n" * 40
+
+
+class BoxStreamTests(unittest.TestCase):
+    def test_small_streams_stay_inline(self):
+        self.assertEqual(box_stream(iter(["short", " value"]), store=MemoryStore()), "short value")
+
+    def test_streamed_id_matches_boxed_value(self):
+        store = MemoryStore()
+        resource_id = box_stream(_chunked(VALUE, 7), store=store)
+
+        self.assertEqual(resource_id, resource_id_for(VALUE))
+        self.assertEqual(resource_id, box_value(VALUE, store=MemoryStore()))
+        self.assertEqual(store.get(resource_id), VALUE)
+        self.assertEqual(box_stream(_chunked(VALUE, 7), mode="json", store=store), box_value(VALUE, mode="json"))
+
+    def test_chunks_are_written_as_they_arrive(self):
+        log: list[str] = []
+
+        def produce():
+            for index in range(4):
+                log.append(f"yield {index}")
+                yield str(index) * MAX_RESULT_SIZE
+
+        box_stream(produce(), store=_SpyStore(log))
+
+        self.assertEqual(
+            log,
+            [
+                "yield 0",
+                "yield 1",
+                f"write {'0' * MAX_RESULT_SIZE}",
+                f"write {'1' * MAX_RESULT_SIZE}",
+                "yield 2",
+                f"write {'2' * MAX_RESULT_SIZE}",
+                "yield 3",
+                f"write {'3' * MAX_RESULT_SIZE}",
+            ],
+        )
+
+    def test_streaming_backends_round_trip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            stores = {
+                "disk": DiskSpillStore(directory, spill_threshold=100, offset_stride=16),
+                "sqlite": SqliteStore(Path(directory) / "store.db", chunk_chars=50),
+                "compressed": CompressedStore(block_chars=50),
+                "expiring": ExpiringStore(CompressedStore(block_chars=50), default_ttl=60),
+            }
+            lines = VALUE.splitlines()
+            for name, store in stores.items():
+                with self.subTest(store=name):
+                    resource_id = box_stream(_chunked(VALUE, 13), store=store)
+                    self.assertEqual(store.get(resource_id), VALUE)
+                    self.assertEqual(store.length(resource_id), len(VALUE))
+                    self.assertEqual(store.read_slice(resource_id, 33, 99), VALUE[33:99])
+                    self.assertEqual(store.line_count(resource_id), len(lines))
+                    self.assertEqual(store.read_lines(resource_id, 3, 6), lines[3:6])
+                    # Streaming the same payload again keeps the single stored copy.
+                    self.assertEqual(box_stream(_chunked(VALUE, 29), store=store), resource_id)
+                    self.assertEqual(store.stats().entries, 1)
+                    store.close()
+
+    def test_streaming_backends_bound_memory(self):
+        chunk_size, chunks = 64 * 1024, 64
+
+        def produce():
+            for index in range(chunks):
+                yield chr(ord("a") + index % 26) * chunk_size
+
+        with tempfile.TemporaryDirectory() as directory:
+            for store in (DiskSpillStore(directory, spill_threshold=chunk_size), SqliteStore(Path(directory) / "store.db")):
+                with self.subTest(store=type(store).__name__):
+                    tracemalloc.start()
+                    try:
+                        box_stream(produce(), store=store)
+                        _, peak = tracemalloc.get_traced_memory()
+                    finally:
+                        tracemalloc.stop()
+                        store.close()
+                    self.assertLess(peak, chunk_size * chunks // 8)
+
+    def test_failed_stream_leaves_nothing_behind(self):
+        def produce():
+            yield "x" * 1000
+            raise RuntimeError("upstream failed")
+
+        with tempfile.TemporaryDirectory() as directory:
+            disk = DiskSpillStore(Path(directory) / "spill", spill_threshold=100)
+            sqlite = SqliteStore(Path(directory) / "store.db", chunk_chars=100)
+            for store in (disk, sqlite):
+                with self.subTest(store=type(store).__name__):
+                    with self.assertRaises(RuntimeError):
+                        box_stream(produce(), store=store)
+                    self.assertEqual(store.stats().entries, 0)
+            self.assertEqual(list(disk.directory.iterdir()), [])
+            sqlite.close()
+            with sqlite3.connect(Path(directory) / "store.db") as connection:
+                self.assertEqual(connection.execute("SELECT COUNT(*) FROM chunks").fetchone(), (0,))
+
+
+class ToolRelayStreamingTests(unittest.TestCase):
+    def test_tool_relay_boxes_generator_results(self):
+        store = MemoryStore()
+        resource_id = tool_relay(lambda text: _chunked(text * 100, 10), ["abc"], store=store)
+        self.assertEqual(store.get(resource_id), "abc" * 100)
+
+    def test_tool_relay_rejects_async_tools(self):
+        async def produce(text):
+            yield text
+
+        with self.assertRaises(TypeError):
+            tool_relay(produce, ["abc"], store=MemoryStore())
+
+    def test_tool_relay_async_accepts_async_generators_and_coroutines(self):
+        async def produce(text):
+            for chunk in _chunked(text * 100, 8):
+                await asyncio.sleep(0)
+                yield chunk
+
+        async def fetch(text):
+            return text * 100
+
+        store = MemoryStore()
+        streamed = asyncio.run(tool_relay_async(produce, ["abc"], store=store))
+        awaited = asyncio.run(tool_relay_async(fetch, ["abc"], store=store))
+
+        self.assertEqual(streamed, awaited)
+        self.assertEqual(store.get(streamed), "abc" * 100)
+        self.assertEqual(asyncio.run(tool_relay_async(fetch, ["a"], store=store)), "a" * 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
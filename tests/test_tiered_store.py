@@ -0,0 +1,154 @@
+import re
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from tool_context_relay.store import BinaryPayload, DiskSpillStore, StoreConfig, TieredStore, create_store, open_writer
+from tool_context_relay.tools.tool_relay import box_value
+
+
+class TieredStoreTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        # Roughly two 1000-character values fit in the hot tier.
+        self.store = TieredStore(self._tmp.name, hot_max_bytes=2200, cold_threshold=5000)
+
+    def tearDown(self) -> None:
+        self.store.close()
+        self._tmp.cleanup()
+
+    def test_new_values_are_served_from_the_hot_tier(self):
+        self.store.put("internal://a", "a" * 1000)
+
+        self.assertEqual(self.store.length("internal://a"), 1000)
+        self.assertEqual(self.store.read_slice("internal://a", 0, 3), "aaa")
+        hot, cold = self.store.tier_stats()
+        self.assertEqual((hot.hits, cold.hits, cold.entries), (2, 0, 0))
+        self.assertEqual(hot.hit_rate, 1.0)
+
+    def test_hot_evictions_are_demoted_instead_of_dropped(self):
+        for name in "abc":
+            self.store.put(f"internal://{name}", name * 1000)
+
+        self.assertEqual(self.store.demotions, 1)
+        self.assertIn("internal://a", self.store)
+        self.assertNotIn("internal://a", self.store.hot)
+        self.assertEqual(self.store.stats().entries, 3)
+        self.assertEqual(self.store.stats().evictions, 0)
+
+    def test_cold_hits_promote_values_back_to_the_hot_tier(self):
+        for name in "abc":
+            self.store.put(f"internal://{name}", name * 1000)
+
+        self.assertEqual(self.store.get("internal://a"), "a" * 1000)
+        self.assertIn("internal://a", self.store.hot)
+        self.assertEqual(self.store.promotions, 1)
+        # Promoting "a" demoted the least recently used hot value.
+        self.assertNotIn("internal://b", self.store.hot)
+        self.assertEqual(self.store.get("internal://b"), "b" * 1000)
+
+        hot, cold = self.store.tier_stats()
+        self.assertEqual((hot.hits, hot.misses), (0, 2))
+        self.assertEqual((cold.hits, cold.misses), (2, 0))
+
+    def test_large_values_go_straight_to_the_cold_tier(self):
+        value = "line\n" * 2000
+        self.store.put("internal://big", value)
+
+        self.assertNotIn("internal://big", self.store.hot)
+        self.assertEqual(self.store.read_slice("internal://big", 5, 9), "line")
+        self.assertEqual(self.store.line_count("internal://big"), 2000)
+        self.assertEqual(self.store.search_lines("internal://big", re.compile("nomatch")), [])
+        self.assertEqual(self.store.promotions, 0)
+        self.assertGreater(self.store.stats().disk_bytes, 0)
+
+    def test_cold_budget_evicts_least_recently_used(self):
+        store = TieredStore(self._tmp.name, hot_max_bytes=1200, cold_max_bytes=2500, cold_threshold=5000)
+        try:
+            for name in "abcd":
+                store.put(f"internal://{name}", name * 1000)
+            self.assertNotIn("internal://a", store)
+            self.assertIsNone(store.get("internal://a"))
+            self.assertEqual(store.stats().evictions, 1)
+            self.assertEqual(store.tier_stats()[1].misses, 1)
+        finally:
+            store.close()
+
+    def test_cold_tier_charges_utf8_bytes(self):
+        value = "ü" * 1000
+        self.store.put("internal://big", value * 6)
+        for name in "abc":
+            self.store.put(f"internal://{name}", value)
+        writer = open_writer(self.store)
+        for _ in range(6):
+            writer.write(value)
+        writer.commit("internal://stream")
+
+        cold = self.store.tier_stats()[1]
+        self.assertEqual(cold.entries, 3)
+        self.assertEqual(cold.total_bytes, 2 * 6000 * 2 + 2000)
+
+    def test_binary_payloads_keep_their_type_across_tiers(self):
+        payload = BinaryPayload(bytes(range(256)) * 3, "image/png")
+        self.store.put_binary("internal://png", payload)
+        self.store.put("internal://b", "b" * 1000)
+        self.store.put("internal://c", "c" * 1000)
+        self.assertNotIn("internal://png", self.store.hot)
+
+        self.assertEqual(self.store.read_slice("internal://png", 0, 8), payload.to_base64()[:8])
+        restored = self.store.get_binary("internal://png")
+        self.assertEqual(bytes(restored.data), bytes(payload.data))
+        self.assertEqual(restored.mime_type, "image/png")
+
+    def test_streamed_large_values_are_written_to_the_cold_tier(self):
+        writer = open_writer(self.store)
+        for _ in range(10):
+            writer.write("x" * 1000)
+        writer.commit("internal://stream")
+
+        self.assertNotIn("internal://stream", self.store.hot)
+        self.assertEqual(self.store.length("internal://stream"), 10000)
+
+    def test_delete_and_put_replace_values_in_either_tier(self):
+        for name in "abc":
+            self.store.put(f"internal://{name}", name * 1000)
+
+        self.store.put("internal://a", "new")
+        self.assertEqual(self.store.get("internal://a"), "new")
+        self.assertTrue(self.store.delete("internal://b"))
+        self.assertNotIn("internal://b", self.store)
+        self.assertEqual(self.store.tier_stats()[1].total_bytes, 0)
+
+    def test_create_store_builds_tiered_store(self):
+        store = create_store(StoreConfig(kind="tiered", path=self._tmp.name, max_bytes=4096, cold_max_bytes=8192))
+        try:
+            self.assertIsInstance(store, TieredStore)
+            resource_id = box_value("z" * 5000, store=store)
+            self.assertEqual(store.length(resource_id), 5000)
+        finally:
+            store.close()
+
+
+class DiskBinarySpillTests(unittest.TestCase):
+    def test_large_binary_payloads_spill_raw(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store = DiskSpillStore(directory, spill_threshold=16)
+            payload = BinaryPayload(bytes(range(200)), "image/png")
+            store.put_binary("internal://png", payload)
+
+            self.assertEqual(store.stats().disk_bytes, 200)
+            self.assertEqual(store.get("internal://png"), payload.to_base64())
+            self.assertEqual(store.read_slice("internal://png", 10, 30), payload.to_base64()[10:30])
+            self.assertEqual(store.get_binary("internal://png"), payload)
+
+            store.put("internal://png", "text" * 10)
+            self.assertIsNone(store.get_binary("internal://png"))
+            self.assertEqual([path.suffix for path in Path(directory).iterdir()], [".txt"])
+            store.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
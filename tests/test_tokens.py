@@ -0,0 +1,98 @@
+import asyncio
+import os
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from tool_context_relay.agent.agent import yt_transcribe
+from tool_context_relay.agent.context import RelayContext
+from tool_context_relay.openai_env import load_profile
+from tool_context_relay.store import BinaryPayload, MemoryStore
+from tool_context_relay.tokens import BoxingThreshold, TokenCounter, estimate_tokens, resolve_estimator
+from tool_context_relay.tools.tool_relay import box_stream, box_value, is_resource_id, tool_relay
+
+
+class EstimateTokensTests(unittest.TestCase):
+    def test_heuristic_weights_scripts(self):
+        self.assertEqual(estimate_tokens(""), 0)
+        self.assertEqual(estimate_tokens("a" * 256), 64)
+        self.assertEqual(estimate_tokens("ж" * 128), 64)
+        self.assertEqual(estimate_tokens("語" * 64), 64)
+        self.assertEqual(estimate_tokens("ab語"), 2)
+
+    def test_counts_are_memoized_per_content(self):
+        calls = []
+
+        def estimator(value: str) -> int:
+            calls.append(value)
+            return len(value)
+
+        counter = TokenCounter(estimator, cache_size=2)
+        for value in ["one", "two", "one", "two"]:
+            counter.count(value)
+        self.assertEqual(calls, ["one", "two"])
+
+        counter.count("three")
+        counter.count("one")
+        self.assertEqual(calls, ["one", "two", "three", "one"])
+
+    def test_exact_tokenizer_needs_tiktoken(self):
+        self.assertIs(resolve_estimator(None), estimate_tokens)
+        self.assertIs(resolve_estimator("heuristic"), estimate_tokens)
+        with patch.dict(sys.modules, {"tiktoken": None}):
+            with self.assertRaisesRegex(RuntimeError, "tiktoken"):
+                resolve_estimator("o200k_base")
+
+
+class TokenThresholdTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.store = MemoryStore()
+
+    def test_ascii_threshold_is_unchanged(self):
+        self.assertEqual(box_value("a" * 256, store=self.store), "a" * 256)
+        self.assertTrue(is_resource_id(box_value("a" * 257, store=self.store)))
+
+    def test_cjk_text_is_boxed_by_token_cost(self):
+        self.assertEqual(box_value("語" * 64, store=self.store), "語" * 64)
+        self.assertTrue(is_resource_id(box_value("語" * 65, store=self.store)))
+
+    def test_thresholds_are_configurable(self):
+        small = BoxingThreshold(max_tokens=8)
+        self.assertTrue(is_resource_id(box_value("a" * 40, store=self.store, threshold=small)))
+        self.assertEqual(box_stream(iter(["a" * 16, "b" * 16]), store=self.store, threshold=small), "a" * 16 + "b" * 16)
+        self.assertTrue(is_resource_id(tool_relay(lambda: "x" * 40, [], store=self.store, threshold=small)))
+
+        payload = BinaryPayload(b"\x00" * 18)
+        self.assertEqual(box_value(payload, store=self.store, threshold=small), payload.to_base64())
+        self.assertTrue(is_resource_id(box_value(BinaryPayload(b"\x00" * 60), store=self.store, threshold=small)))
+
+    def test_long_values_are_not_counted(self):
+        counter = TokenCounter(lambda value: self.fail("counted"))
+        threshold = BoxingThreshold(max_tokens=8, counter=counter)
+        self.assertTrue(threshold.exceeds("a" * 65))
+
+    def test_agent_uses_the_context_threshold(self):
+        ctx = SimpleNamespace(context=RelayContext(store=self.store, boxing_threshold=BoxingThreshold(max_tokens=4)))
+        self.assertTrue(is_resource_id(asyncio.run(yt_transcribe(ctx, "999"))))
+
+
+class ProfileThresholdTests(unittest.TestCase):
+    def test_profile_sets_threshold_and_tokenizer(self):
+        env = {"QWEN_PROVIDER": "openai", "QWEN_MAX_RESULT_TOKENS": "32", "QWEN_TOKENIZER": "o200k_base"}
+        with patch.dict(os.environ, env):
+            profile = load_profile("qwen")
+        self.assertEqual((profile.max_result_tokens, profile.tokenizer), (32, "o200k_base"))
+
+    def test_invalid_threshold_is_rejected(self):
+        for value in ("lots", "0"):
+            with self.subTest(value=value), patch.dict(os.environ, {"QWEN_MAX_RESULT_TOKENS": value}):
+                with self.assertRaises(ValueError):
+                    load_profile("qwen")
+
+
+if __name__ == "__main__":
+    unittest.main()
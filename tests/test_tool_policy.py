@@ -0,0 +1,142 @@
+import asyncio
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from tool_context_relay.agent.agent import get_img_description, get_page
+from tool_context_relay.agent.context import RelayContext
+from tool_context_relay.main import run_once
+from tool_context_relay.openai_env import ProfileConfig
+from tool_context_relay.store import CompressedStore, ExpiringStore, MemoryStore, StoreConfig, create_store
+from tool_context_relay.tokens import BoxingThreshold
+from tool_context_relay.tools.mcp_page import SMALL_PAGE_URL
+from tool_context_relay.tools.policy import DEFAULT_TOOL_POLICIES, ToolPolicy, load_tool_policies
+from tool_context_relay.tools.tool_relay import box_stream, box_value, is_resource_id, tool_relay
+
+TEXT = "line of text\n" * 200
+
+
+class ToolPolicyTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.store = MemoryStore()
+
+    def test_boxing_rules_override_the_threshold(self):
+        self.assertTrue(is_resource_id(box_value("short", store=self.store, policy=ToolPolicy(boxing="always"))))
+        self.assertEqual(box_value(TEXT, store=self.store, policy=ToolPolicy(boxing="never")), TEXT)
+        self.assertEqual(box_value("", store=self.store, policy=ToolPolicy(boxing="always")), "")
+
+        chunks = ["chunk " * 100] * 50
+        self.assertEqual(box_stream(iter(chunks), store=self.store, policy=ToolPolicy(boxing="never")), "".join(chunks))
+
+    def test_max_tokens_keeps_the_run_tokenizer(self):
+        base = BoxingThreshold(max_tokens=1000)
+        policy = ToolPolicy(max_tokens=2)
+        self.assertIs(policy.threshold(base).counter, base.counter)
+        self.assertTrue(is_resource_id(box_value("a" * 12, store=self.store, threshold=base, policy=policy)))
+
+    def test_storage_hints_apply_to_boxed_results(self):
+        store = ExpiringStore(CompressedStore(codec="zlib"), clock=lambda: 0.0)
+        policy = ToolPolicy(boxing="always", ttl=5, compression="lzma", indexes=("lines",))
+        with (
+            patch.object(store, "set_ttl", wraps=store.set_ttl) as set_ttl,
+            patch.object(store.inner, "set_compression", wraps=store.inner.set_compression) as set_compression,
+        ):
+            resource_id = tool_relay(lambda: TEXT, [], store=store, policy=policy)
+
+        set_ttl.assert_called_once_with(resource_id, 5)
+        set_compression.assert_called_once_with(resource_id, "lzma")
+        self.assertEqual(store.inner._entries[resource_id].codec, "lzma")
+        self.assertEqual(store.get(resource_id), TEXT)
+
+        with patch.object(store, "set_ttl", wraps=store.set_ttl) as set_ttl:
+            tool_relay(lambda: TEXT, [], store=store, ttl=9, policy=policy)
+        set_ttl.assert_called_once_with(resource_id, 9)
+
+    def test_indexes_are_built_when_stored(self):
+        store = MemoryStore(grep_index_min_chars=1)
+        resource_id = box_value(TEXT, store=store, policy=ToolPolicy(indexes=("lines", "grep")))
+        self.assertIn(resource_id, store._line_offsets)
+        self.assertIn(resource_id, store._grep_indexes)
+
+    def test_invalid_policies_are_rejected(self):
+        for kwargs in (
+            {"boxing": "sometimes"},
+            {"boxing": "never", "max_tokens": 10},
+            {"ttl": 0},
+            {"compression": "brotli"},
+            {"indexes": ("lines", "words")},
+        ):
+            with self.subTest(kwargs=kwargs), self.assertRaises(ValueError):
+                ToolPolicy(**kwargs)
+
+
+class PolicyFileTests(unittest.TestCase):
+    def _load(self, text: str) -> dict[str, ToolPolicy]:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "policies.yaml"
+            path.write_text(text, encoding="utf-8")
+            return load_tool_policies(path)
+
+    def test_yaml_policies(self):
+        policies = self._load("get_page:\n  boxing: auto\n  max_tokens: 500\n  indexes: [grep]\ndeep_check: {ttl: 30}\n")
+        self.assertEqual(policies["get_page"], ToolPolicy(max_tokens=500, indexes=("grep",)))
+        self.assertEqual(policies["deep_check"], ToolPolicy(ttl=30))
+
+    def test_invalid_yaml_policies(self):
+        for text in ("- get_page", "get_page: always", "get_page: {box: never}", "get_page: {ttl: soon}", "a: [b"):
+            with self.subTest(text=text), self.assertRaises(ValueError):
+                self._load(text)
+
+    def test_policy_ttls_enable_expiry(self):
+        store = create_store(StoreConfig(tool_policies={"get_page": ToolPolicy(ttl=60)}))
+        try:
+            self.assertIsInstance(store, ExpiringStore)
+        finally:
+            store.close()
+
+
+class AgentPolicyTests(unittest.TestCase):
+    def test_default_policies(self):
+        ctx = SimpleNamespace(context=RelayContext(store=MemoryStore(), boxing_threshold=BoxingThreshold(max_tokens=1)))
+        self.assertEqual(ctx.context.tool_policies, DEFAULT_TOOL_POLICIES)
+        self.assertTrue(is_resource_id(asyncio.run(get_page(ctx, SMALL_PAGE_URL))))
+        self.assertFalse(is_resource_id(asyncio.run(get_img_description(ctx, "https://demo.local/cat.png"))))
+
+    def test_policies_come_from_the_run_context(self):
+        policies = {**DEFAULT_TOOL_POLICIES, "get_page": ToolPolicy()}
+        overridden = SimpleNamespace(context=RelayContext(store=MemoryStore(), tool_policies=policies))
+        default = SimpleNamespace(context=RelayContext(store=MemoryStore()))
+
+        self.assertFalse(is_resource_id(asyncio.run(get_page(overridden, SMALL_PAGE_URL))))
+        self.assertTrue(is_resource_id(asyncio.run(get_page(default, SMALL_PAGE_URL))))
+
+    def test_run_once_layers_configured_policies_over_the_defaults(self):
+        profile_config = ProfileConfig(
+            name="openai",
+            prefix="OPENAI",
+            provider="openai",
+            endpoint=None,
+            api_key="sk-test",
+            default_model=None,
+            backend_provider=None,
+            temperature=None,
+        )
+        store_config = StoreConfig(tool_policies={"get_page": ToolPolicy()})
+        with (
+            patch("tool_context_relay.main.load_dotenv"),
+            patch("tool_context_relay.main.apply_profile"),
+            patch("agents.Runner.run_sync", return_value=SimpleNamespace(final_output="done")),
+        ):
+            _, context = run_once(prompt="hi", model="test", profile_config=profile_config, store_config=store_config)
+
+        self.assertEqual(context.tool_policies["get_page"], ToolPolicy())
+        self.assertEqual(context.tool_policies["get_img_description"], ToolPolicy(boxing="never"))
+
+
+if __name__ == "__main__":
+    unittest.main()
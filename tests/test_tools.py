@@ -1,3 +1,4 @@
+import subprocess
 import sys
 import unittest
 from unittest.mock import patch
@@ -5,7 +6,8 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
 
-from tool_context_relay.tools.tool_relay import tool_relay, unbox_value, box_value, is_resource_id
+from tool_context_relay.store import MemoryStore
+from tool_context_relay.tools.tool_relay import tool_relay, unbox_value, box_value, is_resource_id, resource_id_for
 from tool_context_relay.tools.mcp_yt import fun_get_transcript
 from tool_context_relay.tools.mcp_page import fun_get_page, SMALL_PAGE_URL, LARGE_PAGE_URL
 from tool_context_relay.tools.mcp_email import fun_send_email
@@ -44,6 +46,32 @@ class ToolsTests(unittest.TestCase):
         self.assertNotIn("-", resource_id)
         self.assertEqual(unbox_value(resource_id), "x" * 2048)
 
+    def test_resource_id_is_content_digest(self):
+        resource_id = box_value("x" * 2048)
+        self.assertEqual(resource_id, resource_id_for("x" * 2048))
+        self.assertRegex(resource_id, r"^internal://[0-9a-f]{32}$")
+        self.assertNotEqual(resource_id_for("x" * 2048), resource_id_for("x" * 2047 + "y"))
+
+    def test_resource_id_is_stable_across_processes(self):
+        src_path = str(Path(__file__).resolve().parents[1] / "src")
+        script = (
+            "import sys; sys.path.insert(0, sys.argv[1]);"
+            "from tool_context_relay.tools.tool_relay import resource_id_for;"
+            "print(resource_id_for('payload ' * 100))"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", script, src_path], check=True, capture_output=True, text=True
+        ).stdout.strip()
+        self.assertEqual(output, resource_id_for("payload " * 100))
+
+    def test_box_value_deduplicates_identical_payloads(self):
+        store = MemoryStore()
+        first = box_value("same " * 100, store=store)
+        second = box_value("same " * 100, store=store)
+
+        self.assertEqual(first, second)
+        self.assertEqual(store.stats().entries, 1)
+
     def test_fun_get_transcript_returns_short_value_for_special_id(self):
         self.assertEqual(fun_get_transcript("999"), "Welcome in a new episode and good bye")
 
@@ -71,10 +99,17 @@ class ToolsTests(unittest.TestCase):
         self.assertIn("Email sent to 'hello@example.com'", result)
         self.assertIn("Body length=9", result)
 
-    def test_fun_get_web_screenshot_returns_base64(self):
+    def test_fun_get_web_screenshot_returns_png_payload(self):
         result = fun_get_web_screenshot()
-        self.assertTrue(result)
-        self.assertLessEqual(len(result), 2000)
+        self.assertEqual(result.mime_type, "image/png")
+        self.assertTrue(bytes(result.data).startswith(b"\x89PNG"))
+        self.assertLessEqual(len(result.to_base64()), 2000)
+
+    def test_fun_get_web_screenshot_docstring_describes_what_the_model_reads(self):
+        doc = fun_get_web_screenshot.__doc__
+        self.assertIn("PNG screenshot of the page, base64-encoded", doc)
+        self.assertNotIn("BinaryPayload", doc)
+        self.assertNotIn("relay", doc)
 
     def test_fun_get_img_description_returns_two_sentences(self):
         for url in (IMAGE_URL_CAT, IMAGE_URL_DESK, IMAGE_URL_MOUNTAIN):